@@ -4,12 +4,14 @@ load("@aspect_bazel_lib//lib:write_source_files.bzl", "write_source_file")
 load("@aspect_rules_py//py:defs.bzl", "py_library")
 load("@rules_cc//cc:defs.bzl", "cc_library")
 
-def _buffham_impl(name, visibility, src, deps, py, cc, tags):
+def _buffham_impl(name, visibility, src, deps, py, cc, numpy, slots, frame_budget, tags):
     basename = name.replace("_bh", "")
 
     cmd = "$(execpath //nlb/buffham) -l binary -i $(location {0}) -o $(RULEDIR)/{1}.bhb".format(src, basename)
     for dep in deps:
         cmd += " --dep $(location {0})".format(dep)
+    if frame_budget:
+        cmd += " --frame-budget {0}".format(frame_budget)
     output_bhb = basename + ".bhb"
     native.genrule(
         name = name,
@@ -24,8 +26,14 @@ def _buffham_impl(name, visibility, src, deps, py, cc, tags):
         cmd = "$(execpath //nlb/buffham) -l python -i $(location {0}) -o $(RULEDIR)/{1}_bh.py -s $(RULEDIR)/{1}_bh.pyi.intermediate".format(name, basename)
         for dep in deps:
             cmd += " --dep $(location {0})".format(dep)
+        if numpy:
+            cmd += " --numpy"
+        if slots:
+            cmd += " --slots"
 
         py_deps = [str(dep) + "_py" for dep in deps]
+        if numpy:
+            py_deps.append("@pip//numpy")
 
         native.genrule(
             name = name + "_py_gen",
@@ -43,6 +51,7 @@ def _buffham_impl(name, visibility, src, deps, py, cc, tags):
                 "//emb/network/serialize:bh_cobs",
                 "//emb/network/transport:transporter",
                 "//nlb/buffham:bh",
+                "//nlb/buffham:rle",
             ],
             tags = tags,
             visibility = visibility,
@@ -72,6 +81,8 @@ def _buffham_impl(name, visibility, src, deps, py, cc, tags):
                 "//emb/network/node:node_cc",
                 "//emb/network/serialize:serializer_cc",
                 "//emb/network/transport:transporter_cc",
+                "//nlb/buffham:rle_cc",
+                "//nlb/buffham:varint_cc",
             ],
             tags = tags,
             visibility = visibility,
@@ -134,6 +145,24 @@ buffham = macro(
             # Prevent receiving a `select` object on the input
             configurable = False,
         ),
+        "numpy": attr.bool(
+            default = False,
+            doc = "Whether generated Python uses NumPy arrays for numeric list fields.",
+            # Prevent receiving a `select` object on the input
+            configurable = False,
+        ),
+        "slots": attr.bool(
+            default = False,
+            doc = "Whether generated Python dataclasses define `__slots__`.",
+            # Prevent receiving a `select` object on the input
+            configurable = False,
+        ),
+        "frame_budget": attr.int(
+            default = 0,
+            doc = "Largest frame (bytes) a node can receive; warns about messages that may not fit.",
+            # Prevent receiving a `select` object on the input
+            configurable = False,
+        ),
         "tags": attr.string_list(
             default = [],
             doc = "Tags to apply to the generated targets.",
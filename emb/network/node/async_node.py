@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from concurrent import futures
+from typing import Any, AsyncGenerator, Self
+
+from emb.network.node import node
+from emb.network.transport import transporter
+
+
+class AsyncNlbNode[Node: node.NlbNode]:
+    """Drive a node from an event loop, with awaitable transactions
+
+    Wraps any node (e.g. a generated `*_bh` one) so its transactions can be
+    awaited with `Transaction.transact_async`; one loop can then fan out over
+    many nodes with `asyncio.gather`. Transports that are
+    `transporter.AsyncTransporterLike` are awaited directly; others run in a
+    worker thread.
+    """
+
+    def __init__(self, node: Node):
+        self.node = node
+
+        # Keeps async requests queueing in wire order without blocking the
+        # loop on the node's `_send_lock`
+        self._send_lock = asyncio.Lock()
+
+    @property
+    def _transporters(self) -> list[transporter.TransporterLike]:
+        transporters = [self.node._comms_transporter, self.node._log_transporter]
+        # Comms and logs often share a transport
+        return list({id(t): t for t in transporters}.values())
+
+    async def start(self) -> None:
+        self.node._dispatcher.start()
+        for t in self._transporters:
+            t.register_read_callback(self.node._on_receive)
+            if isinstance(t, transporter.AsyncTransporterLike):
+                await t.start_async()
+            else:
+                await asyncio.to_thread(t.start)
+
+    async def stop(self) -> None:
+        for t in self._transporters:
+            if isinstance(t, transporter.AsyncTransporterLike):
+                await t.stop_async()
+            else:
+                await asyncio.to_thread(t.stop)
+        await asyncio.to_thread(self.node._dispatcher.stop)
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.stop()
+
+    async def command(self, message: Any, request_id: int) -> None:
+        """Send a one-way command with no response"""
+        data = self.node._serializer.serialize(message, request_id)
+        comms = self.node._comms_transporter
+        if isinstance(comms, transporter.AsyncTransporterLike):
+            await comms.send_async(data)
+        else:
+            await asyncio.to_thread(comms.send, data)
+
+    async def _submit(self, message: Any, request_id: int) -> futures.Future:
+        """Send a transaction request without waiting for its response"""
+        comms = self.node._comms_transporter
+        if not isinstance(comms, transporter.AsyncTransporterLike):
+            return await asyncio.to_thread(self.node._submit, message, request_id)
+
+        async with self._send_lock:
+            await self._acquire(self.node._send_lock)
+            try:
+                future, frame = self.node._register(message, request_id)
+                try:
+                    await comms.send_async(frame)
+                except BaseException:
+                    self.node._abandon(future)
+                    raise
+            finally:
+                self.node._send_lock.release()
+        return future
+
+    @staticmethod
+    async def _acquire(lock: threading.Lock) -> None:
+        """Acquire a `threading.Lock` (held by other threads) without blocking"""
+        if lock.acquire(blocking=False):
+            return
+        acquire = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The thread takes the lock regardless; hand it straight back
+            acquire.add_done_callback(lambda _: lock.release())
+            raise
+
+    async def result[Response](self, future: futures.Future[Response]) -> Response:
+        """Wait for the response to a submitted transaction
+
+        Raises:
+            TimeoutError: If no response arrives within the node's
+                `TRANSACT_TIMEOUT_S`; see `NlbNode.result`.
+            RuntimeError: If the node failed to handle the request.
+        """
+        # Shielded, so a timeout or cancellation leaves the future for the IO
+        # thread to resolve until it's abandoned
+        response = asyncio.shield(asyncio.wrap_future(future))
+        try:
+            return await asyncio.wait_for(response, self.node.TRANSACT_TIMEOUT_S)
+        except TimeoutError:
+            return self.node._timed_out(future)
+        except asyncio.CancelledError:
+            try:
+                self.node._abandon(future)
+            except ValueError:
+                pass
+            raise
+
+    async def _transact(self, message: Any, request_id: int) -> Any:
+        return await self.result(await self._submit(message, request_id))
+
+    def publishes(self, request_id: int) -> AsyncGenerator[Any, None]:
+        """Iterate over the messages published with a request ID as they arrive
+
+        Messages are queued from the call on (call it from the event loop), in
+        place of a callback registered for the request ID, until the iterator
+        is closed.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        self.node.register_publish_callback(
+            request_id, lambda msg: loop.call_soon_threadsafe(queue.put_nowait, msg)
+        )
+
+        async def iterate() -> AsyncGenerator[Any, None]:
+            try:
+                while True:
+                    yield await queue.get()
+            finally:
+                self.node.unregister_publish_callback(request_id)
+
+        return iterate()
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import unittest
+from typing import Callable, ClassVar
+
+from emb.network.node import async_node
+from emb.network.node import node
+from emb.network.serialize import bh_cobs
+from emb.network.serialize.testdata import test_bh
+from nlb.buffham import bh
+
+ECHO = bh.Transaction[test_bh.Point, test_bh.Point](1)
+
+
+class EchoTransporter:
+    """Echo requests back from another thread, like a transport's read thread."""
+
+    MAX_PAYLOAD_SIZE: ClassVar[int] = 1024
+
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+        self.echo = True
+        self.read_callback: Callable[[bytes], None] = lambda _: None
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def send(self, data: bytes) -> None:
+        self.sent.append(data)
+        if self.echo:
+            threading.Thread(target=self.read_callback, args=(data,)).start()
+
+    def register_read_callback(self, callback: Callable[[bytes], None]) -> None:
+        self.read_callback = callback
+
+
+class AsyncEchoTransporter(EchoTransporter):
+    """Echo requests back on the event loop, like a transport sharing it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = False
+
+    async def start_async(self) -> None:
+        self.started = True
+
+    async def stop_async(self) -> None:
+        self.started = False
+
+    async def send_async(self, data: bytes) -> None:
+        self.sent.append(data)
+        if self.echo:
+            asyncio.get_running_loop().call_soon(self.read_callback, data)
+
+
+class TestAsyncNlbNode(unittest.IsolatedAsyncioTestCase):
+    def make_node(self, transporter: EchoTransporter) -> async_node.AsyncNlbNode:
+        serializer = bh_cobs.BhCobs({1: test_bh.Point})
+        return async_node.AsyncNlbNode(
+            node.NlbNode(serializer, transporter, transporter)
+        )
+
+    async def test_transact(self):
+        for transporter in (EchoTransporter(), AsyncEchoTransporter()):
+            async with self.make_node(transporter) as nlb_node:
+                self.assertEqual(
+                    await ECHO.transact_async(nlb_node, test_bh.Point(1, 2)),
+                    test_bh.Point(1, 2),
+                )
+
+    async def test_gather(self):
+        transporters = [AsyncEchoTransporter() for _ in range(4)]
+        nodes = [self.make_node(transporter) for transporter in transporters]
+        for nlb_node in nodes:
+            await nlb_node.start()
+        self.assertTrue(all(transporter.started for transporter in transporters))
+
+        # Fan out over every node (and pipeline within each) from one loop
+        responses = await asyncio.gather(
+            *(
+                ECHO.transact_async(nlb_node, test_bh.Point(i, j))
+                for i, nlb_node in enumerate(nodes)
+                for j in range(3)
+            )
+        )
+        self.assertEqual(
+            responses, [test_bh.Point(i, j) for i in range(4) for j in range(3)]
+        )
+        self.assertEqual([len(t.sent) for t in transporters], [3] * 4)
+
+    async def test_timeout(self):
+        transporter = AsyncEchoTransporter()
+        transporter.echo = False
+        nlb_node = self.make_node(transporter)
+        nlb_node.node.TRANSACT_TIMEOUT_S = 0.01
+
+        with self.assertRaisesRegex(TimeoutError, 'No response to request 1'):
+            await ECHO.transact_async(nlb_node, test_bh.Point(0, 0))
+        self.assertFalse(nlb_node.node._pending[1])
+
+        # Cancelled transactions are abandoned too
+        task = asyncio.ensure_future(ECHO.transact_async(nlb_node, test_bh.Point(0, 0)))
+        await asyncio.sleep(0)
+        self.assertTrue(nlb_node.node._pending[1])
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertFalse(nlb_node.node._pending[1])
+
+    async def test_publishes(self):
+        transporter = AsyncEchoTransporter()
+        nlb_node = self.make_node(transporter)
+        serializer = nlb_node.node._serializer
+
+        def publish() -> None:
+            for i in range(3):
+                transporter.read_callback(serializer.serialize(test_bh.Point(i, i), 1))
+
+        received: list[test_bh.Point] = []
+        async with nlb_node:
+            publishes = nlb_node.publishes(1)
+            threading.Thread(target=publish).start()
+            async for msg in publishes:
+                received.append(msg)
+                if len(received) == 3:
+                    break
+            await publishes.aclose()
+
+        self.assertEqual(received, [test_bh.Point(i, i) for i in range(3)])
+        self.assertNotIn(1, nlb_node.node._dispatcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
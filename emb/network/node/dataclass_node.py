@@ -1,6 +1,8 @@
 import dataclasses
+from concurrent import futures
 from typing import cast
 
+from emb.network.node import async_node
 from emb.network.node import node
 from emb.network.serialize import serializer
 from emb.network.transport import transporter
@@ -27,3 +29,10 @@ class Transaction[S: dataclass.DataclassLike, R: dataclass.DataclassLike]:
 
     def transact(self, node: DataclassNode, msg: S) -> R:
         return cast(R, node._transact(msg, self.request_id))
+
+    def submit(self, node: DataclassNode, msg: S) -> futures.Future[R]:
+        """Send the request without waiting; get the response with `node.result`."""
+        return cast(futures.Future[R], node._submit(msg, self.request_id))
+
+    async def transact_async(self, node: async_node.AsyncNlbNode, msg: S) -> R:
+        return cast(R, await node._transact(msg, self.request_id))
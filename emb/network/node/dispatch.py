@@ -0,0 +1,148 @@
+import collections
+import dataclasses
+import enum
+import logging
+import threading
+from typing import Any, Callable
+
+
+class Overflow(enum.Enum):
+    """What to do with a publish when its topic's queue is full"""
+
+    # Drop the oldest queued message for the new one
+    DROP_OLDEST = enum.auto()
+    # Drop the new message
+    DROP_NEWEST = enum.auto()
+    # Only keep the newest message, e.g. for state that supersedes itself
+    COALESCE = enum.auto()
+
+
+@dataclasses.dataclass
+class _Topic:
+    callback: Callable[[Any], None]
+    overflow: Overflow
+    queue_size: int
+    queue: collections.deque[Any] = dataclasses.field(default_factory=collections.deque)
+
+
+class PublishDispatcher:
+    """Run publish callbacks on a worker thread, off the transport's read thread
+
+    Each request ID (topic) gets a bounded queue, so a burst of one topic's
+    messages or a slow callback backs up that queue rather than the read
+    thread, and with it every transaction. Topics are served round-robin.
+    """
+
+    # Default number of messages a topic can have waiting
+    QUEUE_SIZE = 64
+
+    def __init__(self) -> None:
+        self._cv = threading.Condition()
+        self._topics: dict[int, _Topic] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        # Number of callbacks being run
+        self._busy = 0
+
+        # Messages dropped from full queues, by request ID
+        self.dropped: collections.Counter[int] = collections.Counter()
+
+    def start(self) -> None:
+        with self._cv:
+            self._stopping = False
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker once it has run the callbacks already queued"""
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def register(
+        self,
+        request_id: int,
+        callback: Callable[[Any], None],
+        overflow: Overflow = Overflow.DROP_OLDEST,
+        queue_size: int | None = None,
+    ) -> None:
+        with self._cv:
+            self._topics[request_id] = _Topic(
+                callback, overflow, queue_size or self.QUEUE_SIZE
+            )
+
+    def unregister(self, request_id: int) -> None:
+        """Stop dispatching a topic, dropping anything it has queued"""
+        with self._cv:
+            self._topics.pop(request_id, None)
+
+    def __contains__(self, request_id: int) -> bool:
+        return request_id in self._topics
+
+    def publish(self, request_id: int, msg: Any) -> bool:
+        """Queue a message for its topic's callback
+
+        Returns:
+            Whether the topic is registered
+        """
+        with self._cv:
+            topic = self._topics.get(request_id)
+            if topic is None:
+                return False
+
+            if topic.overflow is Overflow.COALESCE:
+                self.dropped[request_id] += len(topic.queue)
+                topic.queue.clear()
+            elif len(topic.queue) >= topic.queue_size:
+                self.dropped[request_id] += 1
+                if topic.overflow is Overflow.DROP_NEWEST:
+                    return True
+                topic.queue.popleft()
+
+            topic.queue.append(msg)
+            self._cv.notify_all()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for the queued messages to be dispatched
+
+        Returns:
+            Whether they were, within the timeout
+        """
+        with self._cv:
+            return self._cv.wait_for(
+                lambda: not self._busy and not self._queued(), timeout
+            )
+
+    def _queued(self) -> bool:
+        return any(topic.queue for topic in self._topics.values())
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                self._cv.wait_for(lambda: self._stopping or self._queued())
+                # Take a message from each topic in turn
+                batch = [
+                    (request_id, topic.callback, topic.queue.popleft())
+                    for request_id, topic in self._topics.items()
+                    if topic.queue
+                ]
+                if not batch:
+                    self._thread = None
+                    return
+                self._busy += 1
+
+            for request_id, callback, msg in batch:
+                try:
+                    callback(msg)
+                except Exception:
+                    logging.exception(f'Publish callback for {request_id} failed')
+
+            with self._cv:
+                self._busy -= 1
+                self._cv.notify_all()
@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+from emb.network.node import dispatch
+
+
+class TestPublishDispatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dispatcher = dispatch.PublishDispatcher()
+        self.received: dict[int, list[int]] = {1: [], 2: [], 3: []}
+
+    def tearDown(self) -> None:
+        self.dispatcher.stop()
+
+    def test_dispatch(self):
+        self.dispatcher.register(1, self.received[1].append)
+        self.dispatcher.start()
+        for i in range(3):
+            self.assertTrue(self.dispatcher.publish(1, i))
+        self.assertFalse(self.dispatcher.publish(2, 0))
+
+        self.assertTrue(self.dispatcher.flush(timeout=1.0))
+        self.assertEqual(self.received[1], [0, 1, 2])
+        self.assertEqual(self.dispatcher.dropped, {})
+
+    def test_overflow(self):
+        self.dispatcher.register(
+            1, self.received[1].append, dispatch.Overflow.DROP_OLDEST, queue_size=2
+        )
+        self.dispatcher.register(
+            2, self.received[2].append, dispatch.Overflow.DROP_NEWEST, queue_size=2
+        )
+        self.dispatcher.register(3, self.received[3].append, dispatch.Overflow.COALESCE)
+
+        # Fill the queues before the worker can drain them
+        for request_id in self.received:
+            for i in range(5):
+                self.dispatcher.publish(request_id, i)
+        self.dispatcher.start()
+        self.assertTrue(self.dispatcher.flush(timeout=1.0))
+
+        self.assertEqual(self.received, {1: [3, 4], 2: [0, 1], 3: [4]})
+        self.assertEqual(self.dispatcher.dropped, {1: 3, 2: 3, 3: 4})
+
+    def test_slow_callback(self):
+        release = threading.Event()
+
+        def slow(msg: int) -> None:
+            release.wait()
+            self.received[1].append(msg)
+
+        self.dispatcher.register(1, slow, queue_size=4)
+        self.dispatcher.register(2, self.received[2].append)
+        self.dispatcher.start()
+
+        # Publishing doesn't wait on the callback; its queue absorbs the burst
+        for i in range(10):
+            self.dispatcher.publish(1, i)
+        self.dispatcher.publish(2, 0)
+        self.assertFalse(self.dispatcher.flush(timeout=0.01))
+
+        release.set()
+        self.assertTrue(self.dispatcher.flush(timeout=1.0))
+        self.assertEqual(self.received[1][-4:], [6, 7, 8, 9])
+        self.assertEqual(self.received[2], [0])
+        self.assertEqual(len(self.received[1]) + self.dispatcher.dropped[1], 10)
+
+    def test_callback_error(self):
+        def fail(msg: int) -> None:
+            raise ValueError(msg)
+
+        self.dispatcher.register(1, fail)
+        self.dispatcher.register(2, self.received[2].append)
+        self.dispatcher.start()
+
+        with self.assertLogs(level='ERROR'):
+            self.dispatcher.publish(1, 0)
+            self.dispatcher.publish(2, 0)
+            self.assertTrue(self.dispatcher.flush(timeout=1.0))
+        self.assertEqual(self.received[2], [0])
+
+    def test_stop(self):
+        self.dispatcher.register(1, self.received[1].append)
+        self.dispatcher.start()
+        self.dispatcher.publish(1, 0)
+
+        # Stopping runs what's queued, and the worker can be started again
+        self.dispatcher.stop()
+        self.assertEqual(self.received[1], [0])
+        self.dispatcher.start()
+        self.dispatcher.publish(1, 1)
+        self.assertTrue(self.dispatcher.flush(timeout=1.0))
+        self.assertEqual(self.received[1], [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
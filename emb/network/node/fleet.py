@@ -0,0 +1,187 @@
+import dataclasses
+import enum
+import logging
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable, Protocol, Self
+
+from emb.network.node import node
+from emb.network.transport import usb
+
+
+class FleetEvent(enum.Enum):
+    # A device was found and its node started
+    ADDED = enum.auto()
+    # A device was gone for longer than `REMOVAL_GRACE_S` and its node stopped
+    REMOVED = enum.auto()
+
+
+@dataclasses.dataclass(frozen=True)
+class FleetChange:
+    event: FleetEvent
+    port: str
+
+
+class _TransactionLike[S, R](Protocol):
+    def transact(self, node: Any, msg: S) -> R: ...
+
+
+class NodeFleet[Node: node.NlbNode]:
+    """One node per connected USB device with a matching ID
+
+    Devices are found with `usb.find_ports`, and watched for being plugged in
+    and removed while the fleet runs. Work is run on every node at once, so a
+    fleet takes about as long as its slowest device.
+    """
+
+    # How often to look for devices being added or removed
+    POLL_INTERVAL_S = 1.0
+    # How long a device may be gone (e.g. resetting) before its node is
+    # removed; until then, its transport reconnects on its own
+    REMOVAL_GRACE_S = 5.0
+
+    def __init__(
+        self,
+        vendor_product_id: str,
+        make_node: Callable[[str], Node],
+        on_change: Callable[[FleetChange], None] = lambda _: None,
+    ):
+        """Create a fleet
+
+        Args:
+            vendor_product_id: The devices' USB ID, e.g.
+                `usb.PicoSerial.VENDOR_PRODUCT_ID`
+            make_node: Create a node for the device at a port
+            on_change: Called when a device is added or removed; called on
+                the fleet's watch thread, so don't waste time
+        """
+        self._vendor_product_id = vendor_product_id
+        self._make_node = make_node
+        self._on_change = on_change
+
+        self._lock = threading.Lock()
+        # Scans run on the watch thread, but may also be run by hand
+        self._scan_lock = threading.Lock()
+        self._nodes: dict[str, Node] = {}
+        # When each missing device was last seen, by port
+        self._missing_since: dict[str, float] = {}
+
+        self._stop = threading.Event()
+        self._watch_thread: threading.Thread | None = None
+
+    @property
+    def nodes(self) -> dict[str, Node]:
+        """The fleet's nodes, by port"""
+        with self._lock:
+            return dict(self._nodes)
+
+    def start(self) -> None:
+        if self._watch_thread is not None:
+            return
+        self.scan()
+        self._stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch, daemon=True)
+        self._watch_thread.start()
+
+    def stop(self) -> None:
+        if self._watch_thread is not None:
+            self._stop.set()
+            self._watch_thread.join()
+            self._watch_thread = None
+
+        with self._lock:
+            nodes, self._nodes = self._nodes, {}
+            self._missing_since.clear()
+        for n in nodes.values():
+            n.stop()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _find_ports(self) -> list[str]:
+        return usb.find_ports(self._vendor_product_id)
+
+    def scan(self) -> list[FleetChange]:
+        """Add nodes for new devices, and remove those gone for too long"""
+        with self._scan_lock:
+            changes = self._scan()
+        for change in changes:
+            logging.info(f'{change.port} {change.event.name.lower()}')
+            self._on_change(change)
+        return changes
+
+    def _scan(self) -> list[FleetChange]:
+        ports = set(self._find_ports())
+        now = time.monotonic()
+        changes: list[FleetChange] = []
+
+        with self._lock:
+            known = set(self._nodes)
+            for port in known & ports:
+                self._missing_since.pop(port, None)
+            for port in known - ports:
+                self._missing_since.setdefault(port, now)
+            removed = {
+                port: self._nodes.pop(port)
+                for port, since in list(self._missing_since.items())
+                if now - since >= self.REMOVAL_GRACE_S
+            }
+            for port in removed:
+                del self._missing_since[port]
+
+        for port, n in removed.items():
+            n.stop()
+            changes.append(FleetChange(FleetEvent.REMOVED, port))
+
+        for port in sorted(ports - known):
+            n = self._make_node(port)
+            try:
+                n.start()
+            except (RuntimeError, OSError) as e:
+                # Busy or still enumerating; try again on the next scan
+                logging.warning(f'Failed to start a node at {port}: {e}')
+                n.stop()
+                continue
+            with self._lock:
+                self._nodes[port] = n
+            changes.append(FleetChange(FleetEvent.ADDED, port))
+        return changes
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.POLL_INTERVAL_S):
+            try:
+                self.scan()
+            except Exception:
+                logging.exception('Failed to scan for devices')
+
+    def run[R](self, fn: Callable[[Node], R]) -> dict[str, R | Exception]:
+        """Run `fn` on every node at once
+
+        Returns:
+            Each device's result, or the exception `fn` raised for it, by port
+        """
+        nodes = self.nodes
+        if not nodes:
+            return {}
+
+        with futures.ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            pending = {port: executor.submit(fn, n) for port, n in nodes.items()}
+
+        results: dict[str, R | Exception] = {}
+        for port, future in pending.items():
+            try:
+                results[port] = future.result()
+            except Exception as e:
+                results[port] = e
+        return results
+
+    def transact[S, R](
+        self, transaction: _TransactionLike[S, R], msg: S
+    ) -> dict[str, R | Exception]:
+        """Run the same transaction on every node at once; see `run`"""
+        return self.run(lambda n: transaction.transact(n, msg))
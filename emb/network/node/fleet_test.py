@@ -0,0 +1,140 @@
+import threading
+import time
+import unittest
+from typing import Callable, ClassVar
+
+from emb.network.node import fleet
+from emb.network.node import node
+from emb.network.serialize import bh_cobs
+from emb.network.serialize.testdata import test_bh
+from nlb.buffham import bh
+
+ECHO = bh.Transaction[test_bh.Point, test_bh.Point](1)
+
+
+class SlowEchoTransporter:
+    """Echo requests back after a delay, like a device at the end of a link."""
+
+    MAX_PAYLOAD_SIZE: ClassVar[int] = 1024
+    DELAY_S = 0.1
+
+    def __init__(self, port: str) -> None:
+        self.port = port
+        self.started = False
+        self.read_callback: Callable[[bytes], None] = lambda _: None
+
+    def start(self) -> None:
+        if self.port == 'busy':
+            raise OSError('Port is busy')
+        self.started = True
+
+    def stop(self) -> None:
+        self.started = False
+
+    def send(self, data: bytes) -> None:
+        threading.Timer(self.DELAY_S, self.read_callback, args=(data,)).start()
+
+    def register_read_callback(self, callback: Callable[[bytes], None]) -> None:
+        self.read_callback = callback
+
+
+def make_node(port: str) -> node.NlbNode:
+    transporter = SlowEchoTransporter(port)
+    return node.NlbNode(bh_cobs.BhCobs({1: test_bh.Point}), transporter, transporter)
+
+
+class FakeFleet(fleet.NodeFleet[node.NlbNode]):
+    POLL_INTERVAL_S = 0.01
+    REMOVAL_GRACE_S = 0.0
+
+    def __init__(self) -> None:
+        self.ports: list[str] = []
+        self.changes: list[fleet.FleetChange] = []
+        super().__init__('2e8a:000a', make_node, self.changes.append)
+
+    def _find_ports(self) -> list[str]:
+        return list(self.ports)
+
+
+class TestNodeFleet(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fleet = FakeFleet()
+
+    def tearDown(self) -> None:
+        self.fleet.stop()
+
+    def test_scan(self):
+        self.fleet.ports = ['a', 'b', 'busy']
+        with self.assertLogs(level='WARNING'):
+            self.fleet.scan()
+        self.assertEqual(
+            self.fleet.changes,
+            [
+                fleet.FleetChange(fleet.FleetEvent.ADDED, 'a'),
+                fleet.FleetChange(fleet.FleetEvent.ADDED, 'b'),
+            ],
+        )
+        nodes = self.fleet.nodes
+        self.assertEqual(list(nodes), ['a', 'b'])
+
+        self.fleet.ports = ['a']
+        self.fleet.scan()
+        self.assertEqual(
+            self.fleet.changes[-1], fleet.FleetChange(fleet.FleetEvent.REMOVED, 'b')
+        )
+        self.assertEqual(list(self.fleet.nodes), ['a'])
+        self.assertFalse(nodes['b']._comms_transporter.started)
+
+    def test_removal_grace(self):
+        self.fleet.REMOVAL_GRACE_S = 60.0
+        self.fleet.ports = ['a']
+        self.fleet.scan()
+
+        # A device that's briefly gone (e.g. resetting) keeps its node
+        self.fleet.ports = []
+        self.assertEqual(self.fleet.scan(), [])
+        self.fleet.ports = ['a']
+        self.assertEqual(self.fleet.scan(), [])
+        self.assertEqual(list(self.fleet.nodes), ['a'])
+
+    def test_watch(self):
+        added = threading.Event()
+        self.fleet._on_change = lambda _: added.set()
+        self.fleet.start()
+        self.assertEqual(self.fleet.nodes, {})
+
+        self.fleet.ports = ['a']
+        self.assertTrue(added.wait(timeout=1.0))
+        self.assertEqual(list(self.fleet.nodes), ['a'])
+
+        self.fleet.stop()
+        self.assertEqual(self.fleet.nodes, {})
+
+    def test_transact(self):
+        self.fleet.ports = [f'port{i}' for i in range(20)]
+        self.fleet.scan()
+
+        # Devices are transacted with at once, not one after another
+        start = time.monotonic()
+        results = self.fleet.transact(ECHO, test_bh.Point(1, 2))
+        self.assertLess(time.monotonic() - start, 10 * SlowEchoTransporter.DELAY_S)
+        self.assertEqual(
+            results, {port: test_bh.Point(1, 2) for port in self.fleet.ports}
+        )
+
+    def test_run_errors(self):
+        self.fleet.ports = ['a', 'b']
+        self.fleet.scan()
+
+        def ping(n: node.NlbNode) -> test_bh.Point:
+            if n._comms_transporter.port == 'b':
+                raise TimeoutError('No response')
+            return ECHO.transact(n, test_bh.Point(0, 0))
+
+        results = self.fleet.run(ping)
+        self.assertEqual(results['a'], test_bh.Point(0, 0))
+        self.assertIsInstance(results['b'], TimeoutError)
+
+
+if __name__ == '__main__':
+    unittest.main()
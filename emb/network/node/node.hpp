@@ -4,6 +4,7 @@
 #include <cinttypes>
 #include <concepts>
 #include <functional>
+#include <optional>
 #include <span>
 #include <string.h>
 
@@ -22,6 +23,8 @@ template <serialize::SerializerLike S, transport::TransporterLike C,
 class Node {
   protected:
     constexpr static size_t kFrameHeader = 1;
+    // Room left before outgoing messages for either kind of header
+    constexpr static size_t kMaxFrameHeader = serialize::FrameHeader::kSize;
 
   public:
     Node(S &&serializer, C &comms, L &logging, Project &&...projects)
@@ -50,7 +53,7 @@ class Node {
     }
 
     template <typename Recv, typename Send>
-    void register_handler(uint8_t request_id,
+    void register_handler(uint16_t request_id,
                           std::function<Send(const Recv &)> handler) {
         message_handlers_[request_id] = [this, request_id,
                                          handler](std::span<uint8_t> buffer) {
@@ -58,18 +61,15 @@ class Node {
 
             Send resp = handler(msg);
 
-            // Encode the outgoing message;
-            // offset by one to leave room for the message ID
+            // Encode the outgoing message, leaving room for the header
             auto [serialized, frame_padding] = serializer_.serialize(
-                resp, std::span(tx_buffer_.data() + 1, tx_buffer_.size() - 1));
+                resp, std::span(tx_buffer_.data() + kMaxFrameHeader,
+                                tx_buffer_.size() - kMaxFrameHeader));
 
-            // Add the message ID
-            tx_buffer_[frame_padding] = request_id;
-
-            // Add back our + 1 offset
-            auto framed = serializer_.frame(
-                std::span(tx_buffer_.data(), serialized.size() + 1));
-            comms_transporter_.send(framed);
+            // Echo the request's header, if it had one
+            comms_transporter_.send(frame(tx_buffer_, serialized.size(),
+                                          frame_padding, request_id,
+                                          response_header(rx_header_)));
 
             // // Debug logic to echo the deframed message back
             // // Write `request_id` and `buffer` back into `tx_buffer_`
@@ -92,18 +92,44 @@ class Node {
 
         // Deframe the incoming message
         auto deframed_data = serializer_.deframe(data);
+        if (deframed_data.empty()) {
+            return;
+        }
 
-        auto msg_size = deframed_data.size() - kFrameHeader;
+        // Frames start with either a versioned header or a message ID
+        uint16_t request_id = deframed_data[0];
+        size_t header_size = kFrameHeader;
+        rx_header_ = std::nullopt;
+        if (deframed_data[0] == serialize::kHeaderMarker) {
+            rx_header_ = serialize::FrameHeader::read(deframed_data);
+            if (!rx_header_) {
+                return;
+            }
+            request_id = rx_header_->request_id;
+            header_size = serialize::FrameHeader::kSize;
+        }
 
-        // Check if the first byte is a valid message ID
-        if (msg_size == 0 || message_handlers_.find(deframed_data[0]) ==
-                                 message_handlers_.end()) {
+        auto msg_size = deframed_data.size() - header_size;
+
+        // Check if the request ID is a valid message ID
+        auto handler = message_handlers_.find(request_id);
+        if (handler == message_handlers_.end()) {
+            // Without a header, there's nowhere to say so
+            if (rx_header_) {
+                auto header = response_header(rx_header_);
+                header->flags |= serialize::kFlagError;
+                comms_transporter_.send(frame(tx_buffer_, S::kMaxOverhead,
+                                              S::kMaxOverhead, request_id,
+                                              header));
+            }
+            return;
+        }
+        if (msg_size == 0) {
             return;
         }
 
         // Call the appropriate message handler
-        message_handlers_.at(deframed_data[0])(
-            deframed_data.subspan(kFrameHeader, msg_size));
+        handler->second(deframed_data.subspan(header_size, msg_size));
 
         // // Debug logic to echo the framed message back
         // rx_buffer_[data.size()] = 0;
@@ -115,17 +141,13 @@ class Node {
         auto &buffer =
             type == TransportType::COMMS ? tx_buffer_ : log_tx_buffer_;
 
-        // Encode the outgoing message;
-        // offset by one to leave room for the message ID
+        // Encode the outgoing message, leaving room for the header
         auto [serialized, frame_padding] = serializer_.serialize(
-            msg, std::span(buffer.data() + 1, buffer.size() - 1));
+            msg, std::span(buffer.data() + kMaxFrameHeader,
+                           buffer.size() - kMaxFrameHeader));
 
-        // Add the message ID
-        buffer[frame_padding] = request_id;
-
-        // Add back our + 1 offset
-        auto framed =
-            serializer_.frame(std::span(buffer.data(), serialized.size() + 1));
+        auto framed = frame(buffer, serialized.size(), frame_padding,
+                            request_id, std::nullopt);
         if (type == TransportType::COMMS) {
             comms_transporter_.send(framed);
         } else {
@@ -134,6 +156,37 @@ class Node {
     }
 
   private:
+    static std::optional<serialize::FrameHeader>
+    response_header(const std::optional<serialize::FrameHeader> &request) {
+        if (!request) {
+            return std::nullopt;
+        }
+        return serialize::FrameHeader{
+            .flags = serialize::kFlagResponse,
+            .request_id = request->request_id,
+            .sequence = request->sequence,
+        };
+    }
+
+    // Frame a message serialized `kMaxFrameHeader` bytes into `buffer`,
+    // writing its header (or message ID) just before it
+    template <size_t N>
+    std::span<uint8_t>
+    frame(std::array<uint8_t, N> &buffer, size_t serialized_size,
+          size_t frame_padding, uint16_t request_id,
+          const std::optional<serialize::FrameHeader> &header) {
+        size_t header_size =
+            header ? serialize::FrameHeader::kSize : kFrameHeader;
+        uint8_t *start = buffer.data() + kMaxFrameHeader - header_size;
+        if (header) {
+            header->write(start + frame_padding);
+        } else {
+            start[frame_padding] = request_id;
+        }
+        return serializer_.frame(
+            std::span(start, serialized_size + header_size));
+    }
+
     S serializer_;
     C &comms_transporter_;
     L &log_transporter_;
@@ -141,13 +194,17 @@ class Node {
     std::tuple<Project...> projects_;
 
     // Map message IDs to function pointers
-    std::unordered_map<uint8_t, std::function<void(std::span<uint8_t>)>>
+    std::unordered_map<uint16_t, std::function<void(std::span<uint8_t>)>>
         message_handlers_;
 
+    // The header of the request being handled, if it had one
+    std::optional<serialize::FrameHeader> rx_header_;
+
     // A neat trick with COBS encoding is that we can write the encoded
     // message in-place, provided that our data is <overhead_bytes> bytes
     // into the buffer; we'll manipulate the buffer to make this true
-    std::array<uint8_t, S::kBufSize + S::kMaxOverhead> tx_buffer_;
+    std::array<uint8_t, S::kBufSize + S::kMaxOverhead + kMaxFrameHeader>
+        tx_buffer_;
 
     // Create a separate buffer for logging
     //
@@ -155,7 +212,8 @@ class Node {
     // method for the BLE transport, after the tx buffer for transmission has
     // been set. It's a simple code space optimization to remove this and
     // disallow logging in that one function.
-    std::array<uint8_t, S::kBufSize + S::kMaxOverhead> log_tx_buffer_;
+    std::array<uint8_t, S::kBufSize + S::kMaxOverhead + kMaxFrameHeader>
+        log_tx_buffer_;
 
     // We can write the decoded message in-place as well
     std::array<uint8_t, S::kBufSize> rx_buffer_;
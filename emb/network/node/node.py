@@ -1,7 +1,10 @@
+import collections
 import logging
 import threading
-from typing import Any, Callable, Self, get_args
+from concurrent import futures
+from typing import Any, Callable, Self, cast, get_args
 
+from emb.network.node import dispatch
 from emb.network.serialize import serializer
 from emb.network.transport import transporter
 
@@ -16,6 +19,15 @@ class NlbNode[
     # How long to wait for a transaction response before giving up
     TRANSACT_TIMEOUT_S = 5.0
 
+    # Send transactions with a frame header, so their responses are matched
+    # by sequence number rather than by order. Needs a
+    # `serializer.FrameSerializerLike` serializer and a node that echoes
+    # headers; older firmware drops them.
+    FRAME_HEADER = False
+
+    # Sequence numbers are a `uint16_t` in frame headers
+    SEQUENCE_LIMIT = 0x10000
+
     def __init__(
         self,
         serializer: Serializer | None = None,
@@ -26,11 +38,25 @@ class NlbNode[
         self.__comms_transporter = comms_transporter
         self.__log_transporter = log_transporter
 
-        self._cv = threading.Condition()
-        self._request_id: int | None = None
-        self._msg: Any | None = None
-
-        self._publish_callbacks: dict[int, Callable[[Any], None]] = {}
+        # Futures for the responses to in-flight transactions, by request ID.
+        # Nodes handle requests one at a time, so the responses to a request
+        # ID come back in the order the requests were sent.
+        self._lock = threading.Lock()
+        # Held across queueing a future and sending its request, so futures
+        # queue in wire order. Separate from `_lock`, so a send blocked on a
+        # backed-up link doesn't block the read thread from draining it.
+        self._send_lock = threading.Lock()
+        self._pending: collections.defaultdict[
+            int, collections.deque[futures.Future]
+        ] = collections.defaultdict(collections.deque)
+        # Request IDs and futures for in-flight transactions sent with a frame
+        # header, by sequence number
+        self._sequence = 0
+        self._sequenced: dict[int, tuple[int, futures.Future]] = {}
+
+        # Publish callbacks run on a worker thread, so they can't hold up
+        # responses to transactions
+        self._dispatcher = dispatch.PublishDispatcher()
 
     @property
     def _serializer(self) -> Serializer:
@@ -57,6 +83,7 @@ class NlbNode[
         return self.__log_transporter  # type: ignore
 
     def start(self) -> None:
+        self._dispatcher.start()
         self._comms_transporter.register_read_callback(self._on_receive)
         self._comms_transporter.start()
         self._log_transporter.register_read_callback(self._on_receive)
@@ -65,6 +92,7 @@ class NlbNode[
     def stop(self) -> None:
         self._comms_transporter.stop()
         self._log_transporter.stop()
+        self._dispatcher.stop()
 
     def __enter__(self) -> Self:
         self.start()
@@ -74,28 +102,68 @@ class NlbNode[
         self.stop()
 
     def register_publish_callback[Send](
-        self, request_id: int, callback: Callable[[Send], None]
+        self,
+        request_id: int,
+        callback: Callable[[Send], None],
+        overflow: dispatch.Overflow = dispatch.Overflow.DROP_OLDEST,
+        queue_size: int | None = None,
     ) -> None:
         """Register a callback on receipt of a published message
 
-        NOTE: This callback will occur in the IO thread; don't waste time
+        Messages queue up for the callback, which runs on a worker thread
+        shared by all publishes. If more than `queue_size` (by default
+        `PublishDispatcher.QUEUE_SIZE`) are waiting, `overflow` decides which
+        to drop; see `dropped_publishes`.
         """
-        self._publish_callbacks[request_id] = callback
+        self._dispatcher.register(request_id, callback, overflow, queue_size)
+
+    def unregister_publish_callback(self, request_id: int) -> None:
+        self._dispatcher.unregister(request_id)
+
+    @property
+    def dropped_publishes(self) -> collections.Counter[int]:
+        """Published messages dropped from full queues, by request ID"""
+        return self._dispatcher.dropped
 
     def _on_receive(self, data: bytes) -> None:
         """Callback from the transport layer upon receiving a frame
 
         NOTE: This callback will occur in the IO thread; don't waste time
         """
-        with self._cv:
-            message_id, self._msg = self._serializer.deserialize(data)
-            if message_id == self._request_id:
-                self._request_id = None
-                self._cv.notify()
-            elif message_id in self._publish_callbacks:
-                self._publish_callbacks[message_id](self._msg)
-            else:
-                logging.warning(f'Dropping message with ID {message_id}: {self._msg}')
+        if self.FRAME_HEADER:
+            frame = cast(
+                serializer.FrameSerializerLike, self._serializer
+            ).deserialize_frame(data)
+        else:
+            frame = serializer.Frame(*self._serializer.deserialize(data))
+
+        with self._lock:
+            future = None
+            if frame.flags & serializer.Flags.RESPONSE:
+                _, future = self._sequenced.pop(frame.sequence, (None, None))
+            elif pending := self._pending.get(frame.request_id):
+                future = pending.popleft()
+
+            if future is not None:
+                if frame.flags & serializer.Flags.ERROR:
+                    future.set_exception(
+                        RuntimeError(
+                            f'Node failed to handle request {frame.request_id}'
+                        )
+                    )
+                else:
+                    future.set_result(frame.message)
+                return
+
+        if frame.flags & serializer.Flags.RESPONSE:
+            logging.warning(
+                f'Dropping response to abandoned request {frame.request_id}: '
+                f'{frame.message}'
+            )
+        elif not self._dispatcher.publish(frame.request_id, frame.message):
+            logging.warning(
+                f'Dropping message with ID {frame.request_id}: {frame.message}'
+            )
 
     def command(self, message: Any, request_id: int) -> None:
         """Send a one-way command with no response"""
@@ -103,16 +171,82 @@ class NlbNode[
             self._serializer.serialize(message, request_id)
         )
 
+    def _submit(self, message: Any, request_id: int) -> futures.Future:
+        """Send a transaction request without waiting for its response
+
+        Any number of transactions may be in flight at once, pipelined over
+        the link; wait for each with `result`.
+        """
+        with self._send_lock:
+            future, frame = self._register(message, request_id)
+            try:
+                self._comms_transporter.send(frame)
+            except BaseException:
+                self._abandon(future)
+                raise
+        return future
+
+    def _register(self, message: Any, request_id: int) -> tuple[futures.Future, bytes]:
+        """Serialize a transaction request and track the future for its response
+
+        Hold `_send_lock` until the request is sent (or abandoned).
+        """
+        future: futures.Future = futures.Future()
+        if self.FRAME_HEADER:
+            sequence = self._sequence
+            self._sequence = (sequence + 1) % self.SEQUENCE_LIMIT
+            frame = cast(
+                serializer.FrameSerializerLike, self._serializer
+            ).serialize_frame(serializer.Frame(request_id, message, sequence))
+            with self._lock:
+                if sequence in self._sequenced:
+                    raise RuntimeError(
+                        f'{self.SEQUENCE_LIMIT} transactions are already in flight'
+                    )
+                self._sequenced[sequence] = (request_id, future)
+        else:
+            frame = self._serializer.serialize(message, request_id)
+            with self._lock:
+                self._pending[request_id].append(future)
+        return future, frame
+
+    def _abandon(self, future: futures.Future) -> int:
+        """Stop waiting on a transaction, returning its request ID"""
+        with self._lock:
+            for sequence, (request_id, other) in self._sequenced.items():
+                if other is future:
+                    del self._sequenced[sequence]
+                    return request_id
+            for request_id, pending in self._pending.items():
+                if future in pending:
+                    pending.remove(future)
+                    return request_id
+        raise ValueError('Transaction is not in flight')
+
+    def result[Response](self, future: futures.Future[Response]) -> Response:
+        """Wait for the response to a submitted transaction
+
+        Raises:
+            TimeoutError: If no response arrives within `TRANSACT_TIMEOUT_S`.
+                The transaction is abandoned, so a late response is taken as
+                the next one with the same request ID (or dropped, if it has a
+                frame header).
+            RuntimeError: If the node failed to handle the request.
+        """
+        try:
+            return future.result(timeout=self.TRANSACT_TIMEOUT_S)
+        except TimeoutError:
+            return self._timed_out(future)
+
+    def _timed_out(self, future: futures.Future) -> Any:
+        """Abandon a transaction that timed out, unless its response raced in"""
+        try:
+            request_id = self._abandon(future)
+        except ValueError:
+            return future.result()
+        raise TimeoutError(
+            f'No response to request {request_id} within {self.TRANSACT_TIMEOUT_S}s'
+        )
+
     def _transact(self, message: Any, request_id: int) -> Any:
-        with self._cv:
-            self._request_id = request_id
-            self._comms_transporter.send(
-                self._serializer.serialize(message, request_id)
-            )
-            if not self._cv.wait(timeout=self.TRANSACT_TIMEOUT_S):
-                self._request_id = None
-                raise TimeoutError(
-                    f'No response to request {request_id} within '
-                    f'{self.TRANSACT_TIMEOUT_S}s'
-                )
-            return self._msg
+        return self.result(self._submit(message, request_id))
@@ -0,0 +1,141 @@
+import threading
+import unittest
+from typing import Callable, ClassVar
+
+from emb.network.node import node
+from emb.network.serialize import bh_cobs
+from emb.network.serialize import serializer
+from emb.network.serialize.testdata import test_bh
+
+
+class FakeTransporter:
+    """Record sent frames; responses are injected by the test."""
+
+    MAX_PAYLOAD_SIZE: ClassVar[int] = 1024
+
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+        self.read_callback: Callable[[bytes], None] = lambda _: None
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def send(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    def register_read_callback(self, callback: Callable[[bytes], None]) -> None:
+        self.read_callback = callback
+
+
+class TestNlbNode(unittest.TestCase):
+    def setUp(self) -> None:
+        self.serializer = bh_cobs.BhCobs({1: test_bh.Point, 2: test_bh.Foo})
+        self.transporter = FakeTransporter()
+        self.node = node.NlbNode(self.serializer, self.transporter, self.transporter)
+        self.node.start()
+
+    def tearDown(self) -> None:
+        self.node.stop()
+
+    def respond(self, msg: test_bh.Point | test_bh.Foo, request_id: int) -> None:
+        self.transporter.read_callback(self.serializer.serialize(msg, request_id))
+        # Let any publish callback run
+        self.node._dispatcher.flush()
+
+    def respond_frame(
+        self, msg: test_bh.Point | None, sequence: int, flags=serializer.Flags.NONE
+    ) -> None:
+        frame = serializer.Frame(1, msg, sequence, serializer.Flags.RESPONSE | flags)
+        self.transporter.read_callback(self.serializer.serialize_frame(frame))
+        self.node._dispatcher.flush()
+
+    def test_pipelined(self):
+        pending = [
+            self.node._submit(test_bh.Point(1, 1), 1),
+            self.node._submit(test_bh.Foo(0, '', []), 2),
+            self.node._submit(test_bh.Point(2, 2), 1),
+        ]
+        self.assertEqual(len(self.transporter.sent), 3)
+        self.assertFalse(any(future.done() for future in pending))
+
+        # Responses to different requests may interleave, but each request ID's
+        # come back in the order its requests were sent
+        self.respond(test_bh.Foo(1, 'b', []), 2)
+        self.respond(test_bh.Point(3, 3), 1)
+        self.respond(test_bh.Point(4, 4), 1)
+
+        self.assertEqual(
+            [self.node.result(future) for future in pending],
+            [test_bh.Point(3, 3), test_bh.Foo(1, 'b', []), test_bh.Point(4, 4)],
+        )
+
+    def test_transact(self):
+        send = self.transporter.send
+
+        def send_and_respond(data: bytes) -> None:
+            send(data)
+            # Respond from another thread, like a transport's read thread would
+            threading.Thread(target=self.respond, args=(test_bh.Point(5, 6), 1)).start()
+
+        self.transporter.send = send_and_respond  # type: ignore[method-assign]
+        self.assertEqual(
+            self.node._transact(test_bh.Point(0, 0), 1), test_bh.Point(5, 6)
+        )
+
+    def test_timeout(self):
+        self.node.TRANSACT_TIMEOUT_S = 0.01
+        future = self.node._submit(test_bh.Point(0, 0), 1)
+        with self.assertRaisesRegex(TimeoutError, 'No response to request 1'):
+            self.node.result(future)
+
+        # An abandoned request no longer takes responses
+        published: list[test_bh.Point] = []
+        self.node.register_publish_callback(1, published.append)
+        self.respond(test_bh.Point(1, 2), 1)
+        self.assertEqual(published, [test_bh.Point(1, 2)])
+        self.assertFalse(future.done())
+
+    def test_frame_header(self):
+        self.node.FRAME_HEADER = True
+        pending = [self.node._submit(test_bh.Point(i, i), 1) for i in range(3)]
+        self.assertEqual(
+            [self.serializer.deserialize_frame(data) for data in self.transporter.sent],
+            [serializer.Frame(1, test_bh.Point(i, i), i) for i in range(3)],
+        )
+
+        # Responses are matched by sequence number, in any order
+        self.respond_frame(test_bh.Point(2, 0), 2)
+        self.respond_frame(test_bh.Point(0, 0), 0)
+        self.respond_frame(None, 1, serializer.Flags.ERROR)
+        self.assertEqual(self.node.result(pending[0]), test_bh.Point(0, 0))
+        self.assertEqual(self.node.result(pending[2]), test_bh.Point(2, 0))
+        with self.assertRaisesRegex(RuntimeError, 'failed to handle request 1'):
+            self.node.result(pending[1])
+
+        # Publishes are never headered
+        published: list[test_bh.Point] = []
+        self.node.register_publish_callback(1, published.append)
+        self.respond(test_bh.Point(3, 3), 1)
+        self.assertEqual(published, [test_bh.Point(3, 3)])
+
+    def test_frame_header_timeout(self):
+        self.node.FRAME_HEADER = True
+        self.node.TRANSACT_TIMEOUT_S = 0.01
+        future = self.node._submit(test_bh.Point(0, 0), 1)
+        with self.assertRaisesRegex(TimeoutError, 'No response to request 1'):
+            self.node.result(future)
+
+        # A late response is dropped rather than published
+        published: list[test_bh.Point] = []
+        self.node.register_publish_callback(1, published.append)
+        with self.assertLogs(level='WARNING'):
+            self.respond_frame(test_bh.Point(1, 2), 0)
+        self.assertEqual(published, [])
+        self.assertFalse(future.done())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,28 +1,177 @@
+import struct
+
 from emb.network.frame import cobs
+from emb.network.serialize import serializer
 from nlb.buffham import bh
+from nlb.buffham import parser
 
 type Registry = dict[int, type[bh.BuffhamLike]]
+type DispatchTable = list[bh.Deserializer | None]
+
+# Request IDs are a `uint16_t` in frame headers. Frames without a header
+# only have a byte for them, and its last value marks a header instead.
+MAX_REQUEST_IDS = 0x10000
+HEADER_MARKER = 0xFF
+
+# Versioned frame headers (`FrameHeader` in `serializer.hpp`) are the marker,
+# the version, `serializer.Flags`, the request ID and the sequence number
+HEADER_VERSION = 1
+_HEADER = struct.Struct('<BBBHH')
+HEADER_SIZE = _HEADER.size
+
+# Largest frame a node receives (`kBufSize` in `bh_cobs.hpp`)
+BUF_SIZE = 1536
+
+
+def max_message_size(frame_budget: int = BUF_SIZE) -> int:
+    """Get the largest message sure to fit in a frame of `frame_budget` bytes."""
+    size = frame_budget
+    while parser.framed_size(size) > frame_budget:
+        size -= 1
+    return size
+
+
+def merge_registries(*registries: Registry) -> Registry:
+    """Merge registries, e.g. of several projects' `*_bh` modules.
+
+    Raises:
+        ValueError: If a request ID is registered to different messages
+    """
+    merged: Registry = {}
+    for registry in registries:
+        for request_id, message_cls in registry.items():
+            other = merged.setdefault(request_id, message_cls)
+            if other is not message_cls:
+                raise ValueError(
+                    f'Request ID {request_id} is registered to both '
+                    f'{other.__name__} and {message_cls.__name__}'
+                )
+    return merged
+
+
+def _check_size(message_cls: type[bh.BuffhamLike], size: int) -> bh.Deserializer:
+    """Wrap a fixed-size message's deserializer to check frame lengths first."""
+    deserialize = message_cls.deserialize
+
+    def deserialize_fixed(
+        buffer: bytes | memoryview, offset: int
+    ) -> tuple[bh.BuffhamLike, int]:
+        if len(buffer) - offset != size:
+            raise ValueError(
+                f'Expected {size} bytes for {message_cls.__name__}, '
+                f'got {len(buffer) - offset}'
+            )
+        return deserialize(buffer, offset)
+
+    return deserialize_fixed
+
+
+def dispatch_table(registry: Registry) -> DispatchTable:
+    """Build a table of deserializers indexed by request ID.
+
+    The table covers at least every request ID a frame without a header can
+    hold, so those can be looked up unchecked.
+    """
+    for request_id in registry:
+        if not 0 <= request_id < MAX_REQUEST_IDS:
+            raise ValueError(f'Request ID {request_id} does not fit in a frame header')
+        if request_id == HEADER_MARKER:
+            raise ValueError(f'Request ID {request_id} is reserved for frame headers')
+
+    table: DispatchTable = [None] * (max([HEADER_MARKER, *registry]) + 1)
+    for request_id, message_cls in registry.items():
+        # Fixed-size messages can be checked before decoding
+        size = getattr(message_cls, 'SIZE', None)
+        table[request_id] = (
+            message_cls.deserialize if size is None else _check_size(message_cls, size)
+        )
+    return table
 
 
 class BhCobs:
     def __init__(self, registry: Registry):
         self._registry = registry
+        self._dispatch = dispatch_table(registry)
 
     def serialize(self, msg: bh.BuffhamLike, request_id: int) -> bytes:
-        buffer = msg.serialize()
+        if not 0 <= request_id < HEADER_MARKER:
+            raise ValueError(f'Request ID {request_id} needs a frame header')
 
-        # Add the request ID to the beginning of the buffer
-        return (
-            cobs.cobs_encode(
-                request_id.to_bytes(length=1, byteorder='little', signed=False) + buffer
-            )
-            + b'\x00'
-        )
+        # Write the request ID and the message into a single buffer
+        buffer = bytearray(1 + msg.serialized_size())
+        buffer[0] = request_id
+        msg.serialize_into(buffer, 1)
+
+        return cobs.cobs_encode(bytes(buffer)) + b'\x00'
 
     def deserialize(self, data: bytes) -> tuple[int, bh.BuffhamLike]:
         # Drop the null byte
         decoded_buffer = cobs.cobs_decode(data[:-1])
+        if decoded_buffer[0] == HEADER_MARKER:
+            frame = self._deserialize_header(decoded_buffer)
+            return frame.request_id, frame.message
+
+        # Get the message type's deserializer from the first byte
+        deserialize = self._dispatch[decoded_buffer[0]]
+        if deserialize is None:
+            raise KeyError(f'Unknown request ID {decoded_buffer[0]}')
+        return decoded_buffer[0], deserialize(decoded_buffer, 1)[0]
+
+    def serialize_frame(self, frame: serializer.Frame) -> bytes:
+        """Serialize a message, with a header if it has a sequence number."""
+        if frame.sequence is None:
+            return self.serialize(frame.message, frame.request_id)
+
+        size = 0 if frame.message is None else frame.message.serialized_size()
+        buffer = bytearray(HEADER_SIZE + size)
+        _HEADER.pack_into(
+            buffer,
+            0,
+            HEADER_MARKER,
+            HEADER_VERSION,
+            frame.flags,
+            frame.request_id,
+            frame.sequence,
+        )
+        if frame.message is not None:
+            frame.message.serialize_into(buffer, HEADER_SIZE)
+
+        return cobs.cobs_encode(bytes(buffer)) + b'\x00'
 
-        # Get the message type from the first byte
-        message_cls = self._registry[decoded_buffer[0]]
-        return decoded_buffer[0], message_cls.deserialize(decoded_buffer[1:])[0]
+    def deserialize_frame(self, data: bytes) -> serializer.Frame:
+        """Deserialize a message, along with its header if it has one.
+
+        Raises:
+            KeyError: If the request ID isn't in the registry
+            ValueError: If the header is truncated or its version unsupported
+        """
+        # Drop the null byte
+        decoded_buffer = cobs.cobs_decode(data[:-1])
+        if decoded_buffer[0] == HEADER_MARKER:
+            return self._deserialize_header(decoded_buffer)
+
+        deserialize = self._dispatch[decoded_buffer[0]]
+        if deserialize is None:
+            raise KeyError(f'Unknown request ID {decoded_buffer[0]}')
+        return serializer.Frame(decoded_buffer[0], deserialize(decoded_buffer, 1)[0])
+
+    def _deserialize_header(self, decoded_buffer: bytes) -> serializer.Frame:
+        """Deserialize a decoded frame that starts with a header."""
+        if len(decoded_buffer) < HEADER_SIZE:
+            raise ValueError(f'Frame header is truncated: {decoded_buffer!r}')
+        _, version, flags, request_id, sequence = _HEADER.unpack_from(decoded_buffer)
+        if version != HEADER_VERSION:
+            raise ValueError(f'Unsupported frame header version {version}')
+        flags = serializer.Flags(flags)
+
+        # Error responses carry no message to decode
+        if flags & serializer.Flags.ERROR:
+            return serializer.Frame(request_id, None, sequence, flags)
+
+        deserialize = (
+            self._dispatch[request_id] if request_id < len(self._dispatch) else None
+        )
+        if deserialize is None:
+            raise KeyError(f'Unknown request ID {request_id}')
+        message = deserialize(decoded_buffer, HEADER_SIZE)[0]
+        return serializer.Frame(request_id, message, sequence, flags)
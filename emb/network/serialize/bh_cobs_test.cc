@@ -1,3 +1,4 @@
+#include <array>
 #include <span>
 #include <vector>
 
@@ -5,6 +6,7 @@
 #include "gtest/gtest.h"
 
 #include "emb/network/serialize/bh_cobs.hpp"
+#include "emb/network/serialize/serializer.hpp"
 #include "emb/network/serialize/testdata/test_bh.hpp"
 
 using namespace testing;
@@ -90,6 +92,27 @@ TEST(BhCobsTest, TestBasic) {
     ASSERT_THAT(out_large_data.qux, Eq(in_large_data.qux));
 }
 
+TEST(BhCobsTest, TestFrameHeader) {
+    std::array<uint8_t, FrameHeader::kSize> buffer;
+    FrameHeader{.flags = kFlagResponse | kFlagError,
+                .request_id = 0x1234,
+                .sequence = 0xABCD}
+        .write(buffer.data());
+
+    ASSERT_THAT(buffer, ElementsAre(0xFF, 0x01, 0x03, 0x34, 0x12, 0xCD, 0xAB));
+
+    auto header = FrameHeader::read(buffer);
+    ASSERT_TRUE(header.has_value());
+    ASSERT_THAT(header->flags, Eq(kFlagResponse | kFlagError));
+    ASSERT_THAT(header->request_id, Eq(0x1234));
+    ASSERT_THAT(header->sequence, Eq(0xABCD));
+
+    // Truncated headers and unknown versions are rejected
+    ASSERT_FALSE(FrameHeader::read(std::span(buffer).first(4)).has_value());
+    buffer[1] = 0x02;
+    ASSERT_FALSE(FrameHeader::read(buffer).has_value());
+}
+
 }  // namespace serialize
 }  // namespace network
 }  // namespace emb
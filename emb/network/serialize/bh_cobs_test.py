@@ -1,7 +1,10 @@
 import unittest
 
+from emb.network.frame import cobs
 from emb.network.serialize import bh_cobs
+from emb.network.serialize import serializer
 from emb.network.serialize.testdata import test_bh
+from nlb.buffham import parser
 
 
 class TestBhCobs(unittest.TestCase):
@@ -10,6 +13,7 @@ class TestBhCobs(unittest.TestCase):
             {
                 8: test_bh.Foo,
                 9: test_bh.NestedMessage,
+                10: test_bh.Point,
             }
         )
 
@@ -88,3 +92,111 @@ class TestBhCobs(unittest.TestCase):
         self.assertEqual(
             self.serializer.deserialize(self.serializer.serialize(msg, 9))[1], msg
         )
+
+    def test_fixed_size(self) -> None:
+        msg = test_bh.Point(x=-1, y=2)
+        data = self.serializer.serialize(msg, 10)
+        self.assertEqual(self.serializer.deserialize(data)[1], msg)
+
+        # Frames of the wrong length are rejected before decoding
+        data = self.serializer.serialize(test_bh.Foo(bar=1, baz='hi', qux=[]), 8)
+        data = bytes([data[0], 10]) + data[2:]
+        with self.assertRaisesRegex(ValueError, 'Expected 8 bytes for Point'):
+            self.serializer.deserialize(data)
+
+    def test_unknown_request_id(self) -> None:
+        data = self.serializer.serialize(test_bh.Foo(bar=1, baz='', qux=[]), 11)
+        with self.assertRaisesRegex(KeyError, 'Unknown request ID 11'):
+            self.serializer.deserialize(data)
+
+        # The last byte marks a frame header, so is no request ID
+        with self.assertRaisesRegex(ValueError, 'reserved for frame headers'):
+            bh_cobs.BhCobs({bh_cobs.HEADER_MARKER: test_bh.Point})
+        with self.assertRaisesRegex(ValueError, 'needs a frame header'):
+            self.serializer.serialize(test_bh.Point(x=0, y=0), 0x100)
+
+    def test_empty_registry(self) -> None:
+        # e.g. a node that only sends
+        empty = bh_cobs.BhCobs({})
+        data = empty.serialize(test_bh.Point(x=1, y=2), 10)
+        self.assertEqual(self.serializer.deserialize(data), (10, test_bh.Point(1, 2)))
+        with self.assertRaisesRegex(KeyError, 'Unknown request ID 10'):
+            empty.deserialize(data)
+
+    def test_frame_header(self) -> None:
+        msg = test_bh.Point(x=-1, y=2)
+        frame = serializer.Frame(10, msg, 0x1234, serializer.Flags.RESPONSE)
+        data = self.serializer.serialize_frame(frame)
+
+        # Marker, version, flags, then the request ID and sequence number
+        self.assertEqual(
+            cobs.cobs_decode(data[:-1])[: bh_cobs.HEADER_SIZE],
+            b'\xff\x01\x01\x0a\x00\x34\x12',
+        )
+        self.assertEqual(self.serializer.deserialize_frame(data), frame)
+        self.assertEqual(self.serializer.deserialize(data), (10, msg))
+        self.assertLessEqual(
+            len(data), parser.framed_size(msg.serialized_size(), bh_cobs.HEADER_SIZE)
+        )
+
+        # Frames without a sequence number don't have a header
+        frame = serializer.Frame(10, msg)
+        data = self.serializer.serialize_frame(frame)
+        self.assertEqual(data, self.serializer.serialize(msg, 10))
+        self.assertEqual(self.serializer.deserialize_frame(data), frame)
+
+        # Headers make room for more request IDs
+        bh_serializer = bh_cobs.BhCobs({0x1000: test_bh.Point})
+        frame = serializer.Frame(0x1000, msg, 0)
+        self.assertEqual(
+            bh_serializer.deserialize_frame(bh_serializer.serialize_frame(frame)),
+            frame,
+        )
+
+    def test_frame_header_errors(self) -> None:
+        # Error responses have no message
+        frame = serializer.Frame(
+            11, None, 7, serializer.Flags.RESPONSE | serializer.Flags.ERROR
+        )
+        self.assertEqual(
+            self.serializer.deserialize_frame(self.serializer.serialize_frame(frame)),
+            frame,
+        )
+
+        header = bytes([bh_cobs.HEADER_MARKER, 2, 0, 10, 0, 0, 0])
+        with self.assertRaisesRegex(ValueError, 'Unsupported frame header version 2'):
+            self.serializer.deserialize_frame(cobs.cobs_encode(header) + b'\x00')
+        with self.assertRaisesRegex(ValueError, 'truncated'):
+            self.serializer.deserialize_frame(cobs.cobs_encode(header[:4]) + b'\x00')
+
+        frame = serializer.Frame(11, test_bh.Point(x=0, y=0), 0)
+        with self.assertRaisesRegex(KeyError, 'Unknown request ID 11'):
+            self.serializer.deserialize_frame(self.serializer.serialize_frame(frame))
+
+    def test_merge_registries(self) -> None:
+        self.assertEqual(
+            bh_cobs.merge_registries(
+                {8: test_bh.Foo}, {8: test_bh.Foo, 9: test_bh.NestedMessage}
+            ),
+            {8: test_bh.Foo, 9: test_bh.NestedMessage},
+        )
+
+        with self.assertRaisesRegex(
+            ValueError, 'Request ID 8 is registered to both Foo and Point'
+        ):
+            bh_cobs.merge_registries({8: test_bh.Foo}, {8: test_bh.Point})
+
+    def test_frame_size(self) -> None:
+        # No zeroes is the worst case for COBS, adding a byte per 254
+        for size in (0, 1, 252, 253, 254, 1000):
+            msg = test_bh.Foo(bar=2**32 - 1, baz='a' * size, qux=[])
+            data = self.serializer.serialize(msg, 8)
+            self.assertLessEqual(len(data), parser.framed_size(msg.serialized_size()))
+
+        size = bh_cobs.max_message_size(bh_cobs.BUF_SIZE)
+        self.assertLessEqual(parser.framed_size(size), bh_cobs.BUF_SIZE)
+        self.assertGreater(parser.framed_size(size + 1), bh_cobs.BUF_SIZE)
+        self.assertEqual(
+            len(cobs.cobs_encode(b'\xff' * (1 + size)) + b'\x00'),
+            parser.framed_size(size),
+        )
@@ -2,6 +2,8 @@
 
 #include <cinttypes>
 #include <concepts>
+#include <cstring>
+#include <optional>
 #include <span>
 
 namespace emb {
@@ -25,6 +27,50 @@ concept SerializerLike = requires(T t, std::span<uint8_t> buffer) {
     { T::kBufSize + 0 } -> std::same_as<size_t>;
 };
 
+// Frames starting with this byte carry a `FrameHeader` rather than a
+// one-byte request ID; request ID 255 is reserved for it
+constexpr uint8_t kHeaderMarker = 0xFF;
+constexpr uint8_t kHeaderVersion = 1;
+
+enum FrameFlags : uint8_t {
+    kFlagResponse = 1 << 0,
+    // The request couldn't be handled; the frame carries no message
+    kFlagError = 1 << 1,
+    // Reserved for compressed messages
+    kFlagCompressed = 1 << 2,
+};
+
+// A versioned frame header, to tell apart requests with the same ID; see
+// `serializer.py`. On the wire it's `kHeaderMarker`, the version, the flags,
+// then the (little-endian) request ID and sequence number.
+struct FrameHeader {
+    constexpr static size_t kSize = 7;
+
+    uint8_t flags;
+    uint16_t request_id;
+    uint16_t sequence;
+
+    // Read a header from the start of a frame, if it has a supported one
+    static std::optional<FrameHeader> read(std::span<const uint8_t> frame) {
+        if (frame.size() < kSize || frame[0] != kHeaderMarker ||
+            frame[1] != kHeaderVersion) {
+            return std::nullopt;
+        }
+        FrameHeader header{.flags = frame[2]};
+        memcpy(&header.request_id, frame.data() + 3, 2);
+        memcpy(&header.sequence, frame.data() + 5, 2);
+        return header;
+    }
+
+    void write(uint8_t *buffer) const {
+        buffer[0] = kHeaderMarker;
+        buffer[1] = kHeaderVersion;
+        buffer[2] = flags;
+        memcpy(buffer + 3, &request_id, 2);
+        memcpy(buffer + 5, &sequence, 2);
+    }
+};
+
 }  // namespace serialize
 }  // namespace network
 }  // namespace emb
@@ -1,8 +1,37 @@
+import dataclasses
+import enum
 from typing import Any, Protocol
 
 from nlb.util import dataclass
 
 
+class Flags(enum.IntFlag):
+    """Flags carried by a frame header."""
+
+    NONE = 0
+    RESPONSE = 1
+    # The request couldn't be handled; the frame carries no message
+    ERROR = 2
+    # Reserved for compressed messages
+    COMPRESSED = 4
+
+
+@dataclasses.dataclass(frozen=True)
+class Frame:
+    """A message and what its frame says about it.
+
+    Frames with a `sequence` carry a versioned header, which tells apart
+    requests with the same ID (and their responses). Frames without one only
+    carry the request ID, and responses have to be matched by their order.
+    """
+
+    request_id: int
+    # Missing from error responses
+    message: Any | None
+    sequence: int | None = None
+    flags: Flags = Flags.NONE
+
+
 class SerializerLike(Protocol):
     """Protocol for serializing and deserializing data."""
 
@@ -11,6 +40,14 @@ class SerializerLike(Protocol):
     def deserialize(self, data: bytes) -> tuple[int, Any]: ...
 
 
+class FrameSerializerLike(SerializerLike, Protocol):
+    """Protocol for serializers that can also frame messages with a header."""
+
+    def serialize_frame(self, frame: Frame) -> bytes: ...
+
+    def deserialize_frame(self, data: bytes) -> Frame: ...
+
+
 class DataclassSerializer(Protocol):
     def serialize(self, msg: dataclass.DataclassLike, request_id: int) -> bytes: ...
 
@@ -1,6 +1,6 @@
 # @generated by Buffham
 import dataclasses
-from typing import Self
+from typing import ClassVar, Self
 
 @dataclasses.dataclass
 class Foo:
@@ -8,9 +8,15 @@ class Foo:
     baz: str
     qux: list[int]
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 11
+    MAX_ENCODED_SIZE: ClassVar[int] = 197390
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class Unaligned:
@@ -24,15 +30,44 @@ class Unaligned:
     h: list[int]
     i: list[int]
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 28
+    MAX_ENCODED_SIZE: ClassVar[int] = 1052716
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class NestedMessage:
     foo: Foo
     flag: int
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 12
+    MAX_ENCODED_SIZE: ClassVar[int] = 197391
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+    SIZE: ClassVar[int] = 8
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 11
+    MAX_ENCODED_SIZE: ClassVar[int] = 11
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
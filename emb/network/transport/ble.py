@@ -22,27 +22,55 @@ class Ble(abc.ABC):
     # in `btstack_config.h` and the rx handling in `pico/ble.cc`)
     MAX_PAYLOAD_SIZE: ClassVar[int] = 256
 
-    def __init__(self):
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        """Create the transport, on `loop` if given.
+
+        Sharing a caller's event loop saves its async methods a hop between
+        threads; otherwise the transport runs its own in a background thread.
+        """
         self._started = False
         self.__client: bleak.BleakClient | None = None
         self._read_callback: Callable[[bytes], None] = lambda _: None
         self._device: device.BLEDevice | None = None
 
+        self._loop_thread: threading.Thread | None = None
+        if loop is not None:
+            self._loop = loop
+            return
+
         # Start the event loop in a background thread
         self._loop = asyncio.new_event_loop()
         self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
         self._loop_thread.start()
 
     def __del__(self):
-        # Properly close the event loop
-        self._loop.call_soon_threadsafe(self._loop.stop)
-        self._loop_thread.join()
+        # Properly close the event loop, if it's ours
+        if self._loop_thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
 
     def _run_coroutine_threadsafe[T](self, coro: Coroutine[None, None, T]) -> T:
+        if self._on_loop():
+            coro.close()
+            raise RuntimeError('Blocking on the event loop would deadlock it')
         future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         # Wait for the coroutine to finish and get result
         return future.result()
 
+    async def _run_coroutine[T](self, coro: Coroutine[None, None, T]) -> T:
+        """Run a coroutine on the transport's event loop from another (or it)"""
+        if self._on_loop():
+            return await coro
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+        )
+
+    def _on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
     async def _find_device(self) -> None:
         """Currently unused & not exposed"""
         if self._device is not None:
@@ -72,6 +100,12 @@ class Ble(abc.ABC):
         self._run_coroutine_threadsafe(self._start())
         self._started = True
 
+    async def start_async(self) -> None:
+        if self._started:
+            return
+        await self._run_coroutine(self._start())
+        self._started = True
+
     async def _start(self) -> None:
         if not self._client.is_connected:
             await self._client.connect()
@@ -85,6 +119,12 @@ class Ble(abc.ABC):
         self._run_coroutine_threadsafe(self._stop())
         self._started = False
 
+    async def stop_async(self) -> None:
+        if not self._started:
+            return
+        await self._run_coroutine(self._stop())
+        self._started = False
+
     async def _stop(self) -> None:
         try:
             await self._client.stop_notify(self.NOTIFY_CHAR_UUID)
@@ -99,6 +139,12 @@ class Ble(abc.ABC):
             self._client.write_gatt_char(self.WRITE_CHAR_UUID, data, response=False)
         )
 
+    async def send_async(self, data: bytes) -> None:
+        logging.debug('Ble Tx: ' + ' '.join(f'{byte:02x}' for byte in data))
+        await self._run_coroutine(
+            self._client.write_gatt_char(self.WRITE_CHAR_UUID, data, response=False)
+        )
+
     def register_read_callback(self, callback: Callable[[bytes], None]) -> None:
         self._read_callback = callback
 
@@ -1,4 +1,4 @@
-from typing import Callable, ClassVar, Protocol
+from typing import Callable, ClassVar, Protocol, runtime_checkable
 
 
 class TransporterLike(Protocol):
@@ -20,3 +20,18 @@ class TransporterLike(Protocol):
         Callbacks are invoked on the read thread. Keep them short to avoid
         blocking the read loop.
         """
+
+
+@runtime_checkable
+class AsyncTransporterLike(TransporterLike, Protocol):
+    """Protocol for transporters that can also be driven from an event loop.
+
+    The async methods don't block the caller's loop; read callbacks may run on
+    it, if the transporter shares it.
+    """
+
+    async def start_async(self) -> None: ...
+
+    async def stop_async(self) -> None: ...
+
+    async def send_async(self, data: bytes) -> None: ...
@@ -69,9 +69,10 @@ class Serial(abc.ABC):
         if not devices:
             raise RuntimeError(f'{self.DEVICE_NAME} not found')
         elif len(devices) > 1:
-            device = devices[0]
-            # TODO: Handle multiple devices found / stop using WSL
-            # raise RuntimeError(f'Multiple {self.DEVICE_NAME}s found')
+            # Pass a port to pick one, or use a `NodeFleet` for all of them
+            logging.warning(
+                f'{len(devices)} {self.DEVICE_NAME}s found; using {devices[0].device}'
+            )
         device = devices[0]
 
         logging.debug(f'{self.DEVICE_NAME} found at {device.device}')
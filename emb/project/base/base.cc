@@ -3,6 +3,8 @@
 #include <array>
 #include <cinttypes>
 #include <optional>
+#include <span>
+#include <vector>
 
 #include "emb/project/base/base_bh.hpp"
 #include "emb/project/base/image_stamp.hpp"
@@ -17,6 +19,23 @@ namespace emb {
 namespace project {
 namespace base {
 
+namespace {
+
+void write_app_image(uint32_t address, std::span<const uint8_t> data) {
+    // Write to the flash memory opposite of our current app side
+    uint32_t app_addr = yaal::kAppAddrB;
+
+    yaal::flash_write(app_addr + address, data);
+}
+
+std::vector<uint8_t> read_flash_data(uint32_t address, uint32_t read_size) {
+    // Read from the flash memory
+    const uint8_t *flash_ptr = yaal::get_flash_ptr(address);
+    return std::vector<uint8_t>(flash_ptr, flash_ptr + read_size);
+}
+
+}  // namespace
+
 struct Base::BaseImpl {
     BaseImpl() = default;
     ~BaseImpl() = default;
@@ -70,10 +89,7 @@ FlashPage Base::write_flash_image(const FlashPage &flash_page) {
     response.address = flash_page.address;
     response.read_size = flash_page.read_size;
 
-    // Write to the flash memory opposite of our current app side
-    uint32_t app_addr = yaal::kAppAddrB;
-
-    yaal::flash_write(app_addr + flash_page.address, flash_page.data);
+    write_app_image(flash_page.address, flash_page.data);
 
     return response;
 }
@@ -82,13 +98,7 @@ FlashPage Base::read_flash(const FlashPage &flash_page) {
     FlashPage response;
     response.address = flash_page.address;
     response.read_size = flash_page.read_size;
-    response.data.resize(flash_page.read_size);
-
-    // Read from the flash memory
-    const uint8_t *flash_ptr = yaal::get_flash_ptr(flash_page.address);
-    for (uint32_t i = 0; i < flash_page.read_size; i++) {
-        response.data[i] = flash_ptr[i];
-    }
+    response.data = read_flash_data(flash_page.address, flash_page.read_size);
 
     return response;
 }
@@ -125,6 +135,33 @@ Ping Base::reset(const Ping &ping) {
     emb::yaal::force_watchdog_reset();
 }
 
+Capabilities Base::capabilities(const Ping &ping) {
+    Capabilities response;
+    response.flags = kCapabilityRle | kCapabilityFrameHeader;
+
+    return response;
+}
+
+CompressedFlashPage Base::write_flash_image_rle(
+    const CompressedFlashPage &flash_page) {
+    CompressedFlashPage response;
+    response.address = flash_page.address;
+    response.read_size = flash_page.read_size;
+
+    write_app_image(flash_page.address, flash_page.data);
+
+    return response;
+}
+
+CompressedFlashPage Base::read_flash_rle(const CompressedFlashPage &flash_page) {
+    CompressedFlashPage response;
+    response.address = flash_page.address;
+    response.read_size = flash_page.read_size;
+    response.data = read_flash_data(flash_page.address, flash_page.read_size);
+
+    return response;
+}
+
 }  // namespace base
 }  // namespace project
 }  // namespace emb
@@ -1,20 +1,33 @@
 # @generated by Buffham
 import dataclasses
 import enum
-from typing import Self, Type
+from typing import ClassVar, Self, Type
 
 from emb.network.serialize import bh_cobs
 from emb.network.transport import transporter
 from nlb.buffham import bh
 
+# `CompressedFlashPage` transactions are supported
+CAPABILITY_RLE = 1
+# Transactions may carry a versioned frame header; see `serializer.py`
+CAPABILITY_FRAME_HEADER = 2
+
 @dataclasses.dataclass
 class Ping:
     # Pong!
     ping: int
 
+    SIZE: ClassVar[int] = 1
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 4
+    MAX_ENCODED_SIZE: ClassVar[int] = 4
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class FlashPage:
@@ -30,9 +43,15 @@ class FlashPage:
     read_size: int
     data: list[int]
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 13
+    MAX_ENCODED_SIZE: ClassVar[int] = 65806
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class FlashSector:
@@ -42,17 +61,69 @@ class FlashSector:
     sector: int
     data: list[int]
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 9
+    MAX_ENCODED_SIZE: ClassVar[int] = 65802
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class LogMessage:
     message: str
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 5
+    MAX_ENCODED_SIZE: ClassVar[int] = 65798
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class Capabilities:
+    """Optional features, reported by `capabilities` as a set of flags.
+    Everything below is appended with explicit request IDs, so neither older
+    firmware nor the projects importing this schema are renumbered. Older
+    firmware silently drops the requests it doesn't know, so no answer means no flags
+    """
+
+    flags: int
+
+    SIZE: ClassVar[int] = 4
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 7
+    MAX_ENCODED_SIZE: ClassVar[int] = 7
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class CompressedFlashPage:
+    """A `FlashPage` with run-length encoded data, for mostly erased (0xFF) flash"""
+
+    address: int
+    read_size: int
+    data: list[int]
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 13
+    MAX_ENCODED_SIZE: ClassVar[int] = 65806
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 REGISTRY: dict[int, Type[bh.BuffhamLike]] = ...
 
@@ -82,6 +153,12 @@ WRITE_FLASH_SECTOR: bh.Transaction[FlashSector, FlashSector] = ...
 READ_FLASH_SECTOR: bh.Transaction[FlashSector, FlashSector] = ...
 # Reset the device (needs a type to send/receive; both unused)
 RESET: bh.Transaction[Ping, Ping] = ...
+# Report the `capability_*` flags this firmware supports
+CAPABILITIES: bh.Transaction[Ping, Capabilities] = ...
+# `write_flash_image`, run-length encoded
+WRITE_FLASH_IMAGE_RLE: bh.Transaction[CompressedFlashPage, CompressedFlashPage] = ...
+# `read_flash`, run-length encoded
+READ_FLASH_RLE: bh.Transaction[CompressedFlashPage, CompressedFlashPage] = ...
 
 class PublishIds(enum.Enum):
     # Logging macros output over this
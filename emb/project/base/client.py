@@ -1,25 +1,40 @@
+import collections
 import logging
 import pathlib
 import time
-from typing import Self, Type
+from concurrent import futures
+from typing import Iterable, Iterator, Self, Type
 
 from rich import progress
 
+from emb.network.serialize import bh_cobs
 from emb.project import client
 from emb.project.base import base_bh
 from emb.project.bootloader import bootloader_bh
 from nlb.buffham import bh
+from nlb.buffham import rle
 
 
 class BaseClient(client.Client):
+    # Flash pages kept in flight at once, so transfers aren't bound by the
+    # link's round-trip latency
+    PIPELINE_DEPTH = 4
+
+    # Logs arrive in bursts (e.g. at boot); queue enough of them to ride one
+    # out before the oldest are dropped
+    LOG_QUEUE_SIZE = 256
+
     def __init__(self, node: bh.BhNode) -> None:
         super().__init__(node)
 
         self._node.register_publish_callback(
-            base_bh.PublishIds.LOG_MESSAGE.value, self._on_log_msg
+            base_bh.PublishIds.LOG_MESSAGE.value,
+            self._on_log_msg,
+            queue_size=self.LOG_QUEUE_SIZE,
         )
 
         self._emb_logger: logging.Logger | None = None
+        self._capabilities: int | None = None
 
     def _on_log_msg(self, msg: base_bh.LogMessage) -> None:
         # TODO: Make a more creative / richer logger
@@ -36,10 +51,75 @@ class BaseClient(client.Client):
         resp = base_bh.PING.transact(self._node, msg)
         logging.info(resp.message)
 
-    def _write_flash_image(self, address: int, data: list[int]) -> None:
-        msg = base_bh.FlashPage(address=address, read_size=0, data=data)
-        resp = base_bh.WRITE_FLASH_IMAGE.transact(self._node, msg)
-        assert resp.address == address
+    def capabilities(self) -> int:
+        """Get the node's `base_bh.CAPABILITY_*` flags.
+
+        Firmware predating the query silently drops it, so it has no flags
+        (after a timeout). The flags are cached until the next `reconnect`.
+
+        Transactions are sent with frame headers from then on if the node
+        supports them, so their responses are matched by sequence number.
+        """
+        if self._capabilities is None:
+            try:
+                resp = base_bh.CAPABILITIES.transact(self._node, base_bh.Ping(ping=0))
+                self._capabilities = resp.flags
+            except TimeoutError:
+                logging.info('No capabilities reported; assuming older firmware')
+                self._capabilities = 0
+            self._node.FRAME_HEADER = bool(
+                self._capabilities & base_bh.CAPABILITY_FRAME_HEADER
+            )
+        return self._capabilities
+
+    def _pipeline[C, R](
+        self, requests: Iterable[tuple[C, futures.Future[R]]]
+    ) -> Iterator[tuple[C, R]]:
+        """Get the responses to submitted requests, in order.
+
+        Requests are pulled from `requests` (e.g. a generator submitting them)
+        up to `PIPELINE_DEPTH` ahead of the responses, along with some context
+        to pass through.
+        """
+        in_flight: collections.deque[tuple[C, futures.Future[R]]] = collections.deque()
+        for request in requests:
+            in_flight.append(request)
+            if len(in_flight) >= self.PIPELINE_DEPTH:
+                context, future = in_flight.popleft()
+                yield context, self._node.result(future)
+        while in_flight:
+            context, future = in_flight.popleft()
+            yield context, self._node.result(future)
+
+    def _write_flash_image(
+        self, address: int, data: bytes, compress: bool
+    ) -> futures.Future[base_bh.FlashPage | base_bh.CompressedFlashPage]:
+        if compress:
+            msg = base_bh.CompressedFlashPage(
+                address=address, read_size=0, data=list(data)
+            )
+            return base_bh.WRITE_FLASH_IMAGE_RLE.submit(self._node, msg)
+        msg = base_bh.FlashPage(address=address, read_size=0, data=list(data))
+        return base_bh.WRITE_FLASH_IMAGE.submit(self._node, msg)
+
+    @staticmethod
+    def _next_chunk(
+        image_data: bytes, address: int, chunk_size: int, compress: bool
+    ) -> tuple[bytes, bool]:
+        """Get the image chunk to write at `address`, and whether to compress it.
+
+        Chunks that compress well (e.g. erased 0xFF padding) grow up to a flash
+        sector, staying aligned so that no write spans two sectors.
+        """
+        if compress:
+            size = bootloader_bh.PICO_SECTOR_SIZE
+            while size > chunk_size:
+                chunk = image_data[address : address + size]
+                if not address % size and rle.encoded_size(chunk) <= chunk_size:
+                    return chunk, True
+                size //= 2
+        chunk = image_data[address : address + chunk_size]
+        return chunk, compress and rle.encoded_size(chunk) < len(chunk)
 
     def write_flash_image(
         self, image: pathlib.Path | str
@@ -58,21 +138,28 @@ class BaseClient(client.Client):
         # Chunk by what the comms transport can carry in a single frame
         # (e.g. BLE messages must fit in a single GATT write)
         chunk_size = self._node._comms_transporter.MAX_PAYLOAD_SIZE
+        compress = bool(self.capabilities() & base_bh.CAPABILITY_RLE)
 
-        with progress.Progress() as progress_bar:
+        image_data = image.read_bytes()
+
+        def pages() -> Iterator[tuple[tuple[int, int], futures.Future]]:
             address = 0
+            while address < len(image_data):
+                data, compressed = self._next_chunk(
+                    image_data, address, chunk_size, compress
+                )
+                yield (
+                    (address, len(data)),
+                    self._write_flash_image(address, data, compressed),
+                )
+                address += len(data)
 
-            task = progress_bar.add_task(
-                'Writing flash image', total=image.stat().st_size
-            )
+        with progress.Progress() as progress_bar:
+            task = progress_bar.add_task('Writing flash image', total=len(image_data))
 
-            with image.open('rb') as f:
-                data = list(f.read(chunk_size))
-                while data:
-                    self._write_flash_image(address, data)
-                    address += len(data)
-                    progress_bar.update(task, advance=len(data))
-                    data = list(f.read(chunk_size))
+            for (address, size), resp in self._pipeline(pages()):
+                assert resp.address == address
+                progress_bar.update(task, advance=size)
 
         system_page = self.read_system_page()
         system_page.image_size_b = image.stat().st_size
@@ -83,10 +170,18 @@ class BaseClient(client.Client):
 
         return system_page
 
-    def _read_flash(self, address: int, size: int) -> base_bh.FlashPage:
+    def _flash_page_overhead(self) -> int:
+        """Get the size of a `FlashPage` without any data."""
+        return base_bh.FlashPage(address=0, read_size=0, data=[]).serialized_size()
+
+    def _read_flash(
+        self, address: int, size: int, compress: bool
+    ) -> futures.Future[base_bh.FlashPage | base_bh.CompressedFlashPage]:
+        if compress:
+            msg = base_bh.CompressedFlashPage(address=address, read_size=size, data=[])
+            return base_bh.READ_FLASH_RLE.submit(self._node, msg)
         msg = base_bh.FlashPage(address=address, read_size=size, data=[])
-        resp = base_bh.READ_FLASH.transact(self._node, msg)
-        return resp
+        return base_bh.READ_FLASH.submit(self._node, msg)
 
     def read_flash_image(
         self,
@@ -115,17 +210,30 @@ class BaseClient(client.Client):
         read_size: int = bootloader_bh.PICO_FLASH_SIZE,
     ) -> None:
         end_address = address + read_size
+        # Fill each page to what the node can send back in a single frame
+        chunk_size = bh_cobs.max_message_size() - self._flash_page_overhead()
+        compress = bool(self.capabilities() & base_bh.CAPABILITY_RLE)
+        if compress:
+            # Size reads so even incompressible data fits once encoded; the
+            # node can't shorten a read, so only the bytes on the wire shrink
+            chunk_size = chunk_size * rle.MAX_CHUNK // (rle.MAX_CHUNK + 1)
+
+        def pages(address: int) -> Iterator[tuple[int, futures.Future]]:
+            while address < end_address:
+                size = min(chunk_size, end_address - address)
+                yield size, self._read_flash(address, size, compress)
+                address += size
+
         with progress.Progress() as progress_bar:
             task = progress_bar.add_task('Reading flash', total=read_size)
 
             with pathlib.Path(outpath).open('wb') as f:
-                while address < end_address:
-                    page = self._read_flash(address, min(1024, end_address - address))
-                    if not page.data:
-                        break
+                for size, page in self._pipeline(pages(address)):
                     f.write(bytes(page.data))
-                    address += len(page.data)
                     progress_bar.update(task, advance=len(page.data))
+                    # A short page is the end of flash
+                    if len(page.data) < size:
+                        break
         logging.info(f'Flash read to {outpath}')
 
     def _write_flash_sector(self, sector: int, msg: bh.BuffhamLike) -> None:
@@ -158,6 +266,10 @@ class BaseClient(client.Client):
         Useful after a reset, when the device drops off the bus and
         re-enumerates. The node may be started or stopped beforehand.
         """
+        # The device may come back with different firmware
+        self._capabilities = None
+        self._node.FRAME_HEADER = False
+
         deadline = time.monotonic() + timeout_s
         while True:
             try:
@@ -15,7 +15,7 @@ class HostTest(host_test_base.HostTestBase[client.BaseClient, base_bh.BaseNode])
     def setUp(self) -> None:
         super().setUp()
 
-        # Generate a random file a little over 16kB
+        # Generate a random file a little over 16kB, padded like a flash image
         self.image = pathlib.Path(tempfile.mktemp())
         # Make it deterministic
         random.seed(0)
@@ -23,11 +23,22 @@ class HostTest(host_test_base.HostTestBase[client.BaseClient, base_bh.BaseNode])
             for _ in range(16):
                 # Write a little over 1kB
                 f.write(bytes([random.randint(0, 255) for _ in range(1024 + 4)]))
+            # ...and some erased flash, for the run-length encoding to find
+            f.write(b'\xff' * 4096)
 
     def test_ping(self):
         with self.client:
             self.client.ping()
 
+    def test_capabilities(self):
+        with self.client:
+            self.assertEqual(
+                self.client.capabilities(),
+                base_bh.CAPABILITY_RLE | base_bh.CAPABILITY_FRAME_HEADER,
+            )
+            # Later transactions carry a frame header
+            self.client.ping()
+
     def test_read_write_flash(self):
         with self.client:
             # Tell the firmware we're on side 0
@@ -1,6 +1,6 @@
 # @generated by Buffham
 import dataclasses
-from typing import Self
+from typing import ClassVar, Self
 
 PICO_FLASH_BASE_ADDR = 0x10000000
 PICO_FLASH_SIZE = 2 * 1024 * 1024
@@ -26,6 +26,12 @@ class SystemFlashPage:
     # on boot (see `emb/project/base/image_stamp.hpp`)
     image_hash: list[int]
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 18
+    MAX_ENCODED_SIZE: ClassVar[int] = 65811
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
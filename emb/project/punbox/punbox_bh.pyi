@@ -1,6 +1,6 @@
 # @generated by Buffham
 import dataclasses
-from typing import Self, Type
+from typing import ClassVar, Self, Type
 
 from emb.network.serialize import bh_cobs
 from emb.network.transport import transporter
@@ -15,9 +15,17 @@ class PunboxState:
     # 1 if the clip is currently playing
     playing: int
 
+    SIZE: ClassVar[int] = 5
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 8
+    MAX_ENCODED_SIZE: ClassVar[int] = 8
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 REGISTRY: dict[int, Type[bh.BuffhamLike]] = ...
 
@@ -0,0 +1,344 @@
+"""Benchmark Buffham's codecs across message shapes.
+
+Compares the runtime engine's configurations with the generated classes' own
+codecs, measuring throughput and peak allocations. Results may be saved as
+JSON to compare against a later run.
+"""
+
+import dataclasses
+import enum
+import importlib
+import json
+import pathlib
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+import numpy as np
+import rich_click as click
+
+from nlb.buffham import engine
+from nlb.buffham import parser
+from nlb.buffham import schema_bh
+
+# Schemas to pull real message shapes from, in import order
+SCHEMAS = [
+    pathlib.Path('emb/project/base/base.bh'),
+    pathlib.Path('emb/project/robo24/robo24.bh'),
+    pathlib.Path('emb/project/bootloader/bootloader.bh'),
+    pathlib.Path('nlb/buffham/testdata/other.bh'),
+    pathlib.Path('nlb/buffham/testdata/sample.bh'),
+    pathlib.Path('nlb/buffham/testdata/shapes.bh'),
+]
+
+# Message shapes to benchmark, as (namespace, name)
+SHAPES = [
+    ('emb.project.base.base', 'Ping'),
+    ('emb.project.robo24.robo24', 'DistanceMeasurement'),
+    ('emb.project.bootloader.bootloader', 'SystemFlashPage'),
+    ('emb.project.base.base', 'FlashPage'),
+    ('nlb.buffham.testdata.sample', 'NestedMessage'),
+    ('nlb.buffham.testdata.sample', 'StringLists'),
+    ('nlb.buffham.testdata.shapes', 'DeepNesting'),
+    ('nlb.buffham.testdata.shapes', 'WideOptionals'),
+    ('nlb.buffham.testdata.shapes', 'LargeBytes'),
+    ('nlb.buffham.testdata.shapes', 'ManyStrings'),
+]
+
+# Engine configurations to compare, as (column, `CodecCache` options)
+CONFIGS: list[tuple[str, dict[str, bool]]] = [
+    ('unfused', {'fuse': False}),
+    ('fused', {}),
+    ('jit', {'jit': True}),
+    ('numpy', {'jit': True, 'numpy': True}),
+]
+
+# Column for the generated classes' `serialize` and `deserialize`
+GENERATED = 'generated'
+
+PY_TYPES: dict[schema_bh.FieldType, type] = {
+    schema_bh.FieldType.BOOL: bool,
+    schema_bh.FieldType.FLOAT32: float,
+    schema_bh.FieldType.FLOAT64: float,
+    schema_bh.FieldType.STRING: str,
+    schema_bh.FieldType.BYTES: bytes,
+}
+
+
+def make_dataclasses(ctx: parser.Parser) -> dict[tuple[str, str], type]:
+    """Make a class for every enum and message in the context."""
+    classes: dict[tuple[str, str], type] = {}
+    for enum_, name in ctx.iter_enums():
+        classes[(name.namespace, name.name)] = enum.Enum(
+            name.name, {field.name: field.value for field in enum_.fields}
+        )
+
+    for message, name in ctx.iter_messages():
+        fields = []
+        for field in message.fields:
+            if field.obj_name is not None:
+                field_type = classes[(field.obj_name.namespace, field.obj_name.name)]
+            else:
+                field_type = PY_TYPES.get(field.sub_type or field.pri_type, int)
+            if field.pri_type is schema_bh.FieldType.LIST:
+                field_type = list[field_type]
+            if field.is_optional:
+                field_type = field_type | None
+            fields.append((field.name, field_type))
+        classes[(name.namespace, name.name)] = dataclasses.make_dataclass(
+            name.name, fields
+        )
+
+    return classes
+
+
+def generated_classes(ctx: parser.Parser) -> dict[tuple[str, str], type]:
+    """Get the generated class for every enum and message in the context."""
+    classes: dict[tuple[str, str], type] = {}
+    for _, name in (*ctx.iter_enums(), *ctx.iter_messages()):
+        module = importlib.import_module(f'{name.namespace}_bh')
+        classes[(name.namespace, name.name)] = getattr(module, name.name)
+    return classes
+
+
+def make_instance(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    classes: dict[tuple[str, str], type],
+    list_size: int,
+    numpy: bool = False,
+) -> Any:
+    """Make an instance of a message with every field populated.
+
+    Numeric list fields are populated with arrays with `numpy`, or where the
+    class expects them.
+    """
+    name = next(k for k, m in message_registry.items() if m is message)
+    field_types = {f.name: f.type for f in dataclasses.fields(classes[name])}
+
+    def value(field: schema_bh.Field, field_type: schema_bh.FieldType) -> Any:
+        match field_type:
+            case schema_bh.FieldType.MESSAGE:
+                assert field.obj_name is not None
+                key = (field.obj_name.namespace, field.obj_name.name)
+                return make_instance(
+                    message_registry[key], message_registry, classes, list_size, numpy
+                )
+            case schema_bh.FieldType.ENUM:
+                assert field.obj_name is not None
+                key = (field.obj_name.namespace, field.obj_name.name)
+                return next(iter(classes[key]))  # type: ignore
+            case schema_bh.FieldType.STRING:
+                return 'x' * list_size
+            case schema_bh.FieldType.BYTES:
+                return b'\xff' * list_size
+            case _:
+                return PY_TYPES.get(field_type, int)(1)
+
+    values = {}
+    for field in message.fields:
+        if parser.is_field_numeric_list(field) and (
+            numpy or field_types[field.name] is np.ndarray
+        ):
+            assert field.sub_type is not None
+            dtype = '<' + parser.FORMAT_MAP[field.sub_type]
+            values[field.name] = np.ones(list_size, dtype)
+        elif field.pri_type is schema_bh.FieldType.LIST:
+            assert field.sub_type is not None
+            values[field.name] = [value(field, field.sub_type)] * list_size
+        else:
+            values[field.name] = value(field, field.pri_type)
+
+    return classes[name](**values)
+
+
+def ops_per_sec(fns: list[Callable[[], Any]], repeat: int) -> list[float]:
+    """Measure the best-case throughput of functions.
+
+    Runs are interleaved so that drift (e.g. CPU frequency) affects each
+    function alike.
+    """
+    timers = [timeit.Timer(fn) for fn in fns]
+    numbers = [timer.autorange()[0] for timer in timers]
+    best = [float('inf')] * len(fns)
+    for _ in range(repeat):
+        for i, (timer, number) in enumerate(zip(timers, numbers)):
+            best[i] = min(best[i], timer.timeit(number))
+    return [number / elapsed for number, elapsed in zip(numbers, best)]
+
+
+def peak_allocation(fn: Callable[[], Any]) -> int:
+    """Measure the peak memory a function allocates in a single call."""
+    # Warm up any caches first so they aren't counted
+    fn()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def print_table(
+    title: str,
+    results: dict[str, dict[str, dict[str, dict[str, float]]]],
+    columns: list[str],
+    cell: Callable[[str, str, str], str],
+) -> None:
+    """Print a table of a shape and operation per row, and a column per codec."""
+    print(f'\n{title}')
+    print(f'{"shape":<24}{"op":<14}' + ''.join(f'{c:>12}' for c in columns))
+    for shape, ops in results.items():
+        for op in ops:
+            cells = ''.join(f'{cell(shape, op, column):>12}' for column in columns)
+            print(f'{shape:<24}{op:<14}{cells}')
+
+
+@click.command()
+@click.option(
+    '--shape',
+    '-s',
+    multiple=True,
+    help='Message name(s) to benchmark (default: all)',
+)
+@click.option(
+    '--list-size',
+    type=int,
+    default=256,
+    show_default=True,
+    help='Number of items in each list (and characters in each string)',
+)
+@click.option(
+    '--repeat',
+    type=int,
+    default=5,
+    show_default=True,
+    help='Number of timing runs to take the best of',
+)
+@click.option(
+    '--output',
+    '-o',
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help='JSON file to write the results to',
+)
+@click.option(
+    '--compare',
+    '-c',
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+    help='JSON results of an earlier run to compare throughput against',
+)
+def main(
+    shape: list[str],
+    list_size: int,
+    repeat: int,
+    output: pathlib.Path | None,
+    compare: pathlib.Path | None,
+) -> None:
+    ctx = parser.Parser()
+    for schema in SCHEMAS:
+        ctx.parse_file(schema)
+    message_registry = {
+        (name.namespace, name.name): message for message, name in ctx.iter_messages()
+    }
+    classes = make_dataclasses(ctx)
+    generated = generated_classes(ctx)
+
+    # Results per shape, operation and column
+    columns = [column for column, _ in CONFIGS] + [GENERATED]
+    results: dict[str, dict[str, dict[str, dict[str, float]]]] = {}
+    for key in SHAPES:
+        if shape and key[1] not in shape:
+            continue
+        message = message_registry[key]
+        clz = classes[key]
+
+        instances = []
+        serializers = []
+        deserializers = []
+        for _, options in CONFIGS:
+            instances.append(
+                make_instance(
+                    message,
+                    message_registry,
+                    classes,
+                    list_size,
+                    options.get('numpy', False),
+                )
+            )
+            cache = engine.CodecCache(message_registry, **options)
+            serializers.append(
+                engine.generate_serializer(message, message_registry, cache)
+            )
+            deserializers.append(
+                engine.generate_deserializer(message, message_registry, clz, cache)
+            )
+        instances.append(make_instance(message, message_registry, generated, list_size))
+        serializers.append(lambda instance: instance.serialize())
+        deserializers.append(generated[key].deserialize)
+
+        # Every codec must agree on the encoding
+        buffer = serializers[0](instances[0])
+        for column, serializer, instance in zip(columns, serializers, instances):
+            assert serializer(instance) == buffer, f'{column} encodes {key[1]} wrong'
+
+        results[key[1]] = {}
+        for op, fns in (
+            (
+                'serialize',
+                [lambda s=s, i=i: s(i) for s, i in zip(serializers, instances)],
+            ),
+            (
+                'deserialize',
+                [lambda d=d, b=buffer: d(b) for d in deserializers],
+            ),
+        ):
+            rates = ops_per_sec(fns, repeat)
+            results[key[1]][op] = {
+                column: {
+                    'messages_per_sec': rate,
+                    'bytes_per_sec': rate * len(buffer),
+                    'peak_alloc_bytes': peak_allocation(fn),
+                }
+                for column, rate, fn in zip(columns, rates, fns)
+            }
+
+    print_table(
+        'Messages/s',
+        results,
+        columns,
+        lambda s, o, c: f'{results[s][o][c]["messages_per_sec"]:,.0f}',
+    )
+    print_table(
+        'MB/s',
+        results,
+        columns,
+        lambda s, o, c: f'{results[s][o][c]["bytes_per_sec"] / 1e6:,.1f}',
+    )
+    print_table(
+        'Peak allocation (bytes)',
+        results,
+        columns,
+        lambda s, o, c: f'{results[s][o][c]["peak_alloc_bytes"]:,.0f}',
+    )
+
+    if compare is not None:
+        baseline = json.loads(compare.read_text())['results']
+
+        def speedup(s: str, o: str, c: str) -> str:
+            try:
+                before = baseline[s][o][c]['messages_per_sec']
+            except KeyError:
+                return '-'
+            return f'{results[s][o][c]["messages_per_sec"] / before:.2f}x'
+
+        print_table(f'Messages/s vs {compare}', results, columns, speedup)
+
+    if output is not None:
+        output.write_text(
+            json.dumps({'list_size': list_size, 'results': results}, indent=2)
+        )
+        print(f'\nWrote results to {output}')
+
+
+if __name__ == '__main__':
+    main(prog_name='benchmark')
@@ -1,9 +1,15 @@
 """Utilities for Buffham."""
 
+import array
 import dataclasses
+import mmap
 import pathlib
-from typing import Protocol, Self, Type, cast
+import struct
+import sys
+from concurrent import futures
+from typing import IO, Callable, Iterator, Protocol, Self, Type, cast
 
+from emb.network.node import async_node
 from emb.network.node import node
 from emb.network.transport import transporter
 from nlb.util import dataclass
@@ -12,10 +18,22 @@ from nlb.util import dataclass
 class BuffhamLike(dataclass.DataclassLike, Protocol):
     """Protocol for Buffham-like objects."""
 
+    def serialized_size(self) -> int: ...
+
+    def serialize_into(
+        self, buffer: bytearray | memoryview, offset: int = 0
+    ) -> int: ...
+
     def serialize(self) -> bytes: ...
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(
+        cls, buffer: bytes | memoryview, offset: int = 0
+    ) -> tuple[Self, int]: ...
+
+
+# A message class's `deserialize`, bound to the class
+type Deserializer = Callable[[bytes | memoryview, int], tuple[BuffhamLike, int]]
 
 
 class BhSerializer(Protocol):
@@ -46,6 +64,13 @@ class Transaction[S: BuffhamLike, R: BuffhamLike]:
     def transact(self, node: BhNode, msg: S) -> R:
         return cast(R, node._transact(msg, self.request_id))
 
+    def submit(self, node: BhNode, msg: S) -> futures.Future[R]:
+        """Send the request without waiting; get the response with `node.result`."""
+        return cast(futures.Future[R], node._submit(msg, self.request_id))
+
+    async def transact_async(self, node: async_node.AsyncNlbNode, msg: S) -> R:
+        return cast(R, await node._transact(msg, self.request_id))
+
 
 def read_file(path: pathlib.Path, schema: Type[BuffhamLike]) -> BuffhamLike:
     """Read a binary Buffham file (.bhb) from a schema"""
@@ -55,3 +80,154 @@ def read_file(path: pathlib.Path, schema: Type[BuffhamLike]) -> BuffhamLike:
 def write_file(path: pathlib.Path, msg: BuffhamLike) -> None:
     """Write a message to a binary Buffham file (.bhb)"""
     path.write_bytes(msg.serialize())
+
+
+# Record logs frame each message with its length, and keep the offset of each
+# record in a sidecar index file
+_RECORD_LENGTH = struct.Struct('<I')
+_INDEX_ENTRY = struct.Struct('<Q')
+
+
+def index_path(path: pathlib.Path) -> pathlib.Path:
+    """Get the path of a record log's offset index"""
+    return path.with_name(path.name + '.idx')
+
+
+def _map(path: pathlib.Path) -> mmap.mmap | bytes:
+    """Memory-map a file for reading, if it has anything to map"""
+    if not path.exists() or not path.stat().st_size:
+        return b''
+    with path.open('rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _index_records(log: mmap.mmap | bytes, index: mmap.mmap | bytes) -> array.array:
+    """Find the offsets of the whole records in a log.
+
+    Index entries are trusted, bar those at the end whose records run past
+    the log (e.g. if it was cut short); any records after the last entry are
+    found by scanning the log from there.
+    """
+    offsets = array.array('Q')
+    offsets.frombytes(index[: len(index) - len(index) % _INDEX_ENTRY.size])
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    def next_record(offset: int) -> int | None:
+        """Get the offset after the whole record at `offset`, if there is one"""
+        if offset + _RECORD_LENGTH.size > len(log):
+            return None
+        end = offset + _RECORD_LENGTH.size + _RECORD_LENGTH.unpack_from(log, offset)[0]
+        return end if end <= len(log) else None
+
+    # Only the last entry is checked, so opening a long log doesn't touch
+    # every record in it
+    offset = 0
+    while offsets:
+        if (end := next_record(offsets[-1])) is not None:
+            offset = end
+            break
+        offsets.pop()
+    while (end := next_record(offset)) is not None:
+        offsets.append(offset)
+        offset = end
+    return offsets
+
+
+class RecordWriter:
+    """Append messages to a record log (.bhl) and its offset index.
+
+    Each record is a `uint32` length followed by the serialized message. The
+    index holds the `uint64` offset of each record, so readers can seek to
+    any record without scanning the log. Opening an existing log drops any
+    partially written record and repairs the index.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        log = _map(path)
+        index = _map(index_path(path))
+        offsets = _index_records(log, index)
+        self._offset = 0
+        if offsets:
+            self._offset = offsets[-1] + _RECORD_LENGTH.size
+            self._offset += _RECORD_LENGTH.unpack_from(log, offsets[-1])[0]
+        repair_index = len(index) != len(offsets) * _INDEX_ENTRY.size
+        for m in (log, index):
+            if isinstance(m, mmap.mmap):
+                m.close()
+
+        self._log: IO[bytes] = path.open('ab')
+        self._log.truncate(self._offset)
+        self._index: IO[bytes] = index_path(path).open('ab')
+        if repair_index:
+            self._index.truncate(0)
+            self._index.write(b''.join(_INDEX_ENTRY.pack(o) for o in offsets))
+        self._count = len(offsets)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, msg: BuffhamLike) -> int:
+        """Append a message, returning its record number"""
+        buffer = bytearray(_RECORD_LENGTH.size + msg.serialized_size())
+        _RECORD_LENGTH.pack_into(buffer, 0, len(buffer) - _RECORD_LENGTH.size)
+        msg.serialize_into(buffer, _RECORD_LENGTH.size)
+        self._log.write(buffer)
+        self._index.write(_INDEX_ENTRY.pack(self._offset))
+        self._offset += len(buffer)
+        self._count += 1
+        return self._count - 1
+
+    def flush(self) -> None:
+        """Flush written records to disk, the log ahead of its index"""
+        self._log.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._log.close()
+        self._index.close()
+
+
+class RecordReader[M: BuffhamLike]:
+    """Read messages from a record log (.bhl) without loading it into memory.
+
+    The log is memory-mapped; iterating yields each message in turn, and
+    indexing by record number seeks with the offset index. Records missing
+    from the index (e.g. if the writer was interrupted) are found by scanning
+    the log.
+    """
+
+    def __init__(self, path: pathlib.Path, schema: Type[M]) -> None:
+        self._schema = schema
+        self._log = _map(path)
+        index = _map(index_path(path))
+        self._offsets = _index_records(self._log, index)
+        if isinstance(index, mmap.mmap):
+            index.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, record: int) -> M:
+        offset = self._offsets[record] + _RECORD_LENGTH.size
+        size = _RECORD_LENGTH.unpack_from(self._log, self._offsets[record])[0]
+        # Copy the record out of the map so messages outlive it
+        return self._schema.deserialize(self._log[offset : offset + size])[0]
+
+    def __iter__(self) -> Iterator[M]:
+        for record in range(len(self._offsets)):
+            yield self[record]
+
+    def close(self) -> None:
+        if isinstance(self._log, mmap.mmap):
+            self._log.close()
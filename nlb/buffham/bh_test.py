@@ -0,0 +1,85 @@
+import pathlib
+import tempfile
+import unittest
+
+from nlb.buffham import bh
+from nlb.buffham.testdata import sample_bh
+
+
+class TestRecordLog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tempdir.name) / 'capture.bhl'
+        self.messages = [
+            sample_bh.StringLists([f'message {i}'] * i, [bytes([i])] * i)
+            for i in range(10)
+        ]
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def test_round_trip(self):
+        with bh.RecordWriter(self.path) as writer:
+            for i, msg in enumerate(self.messages[:5]):
+                self.assertEqual(writer.write(msg), i)
+
+        # Appending picks up the record numbers where they left off
+        with bh.RecordWriter(self.path) as writer:
+            for i, msg in enumerate(self.messages[5:], start=5):
+                self.assertEqual(writer.write(msg), i)
+
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            self.assertEqual(len(reader), len(self.messages))
+            self.assertEqual(list(reader), self.messages)
+            self.assertEqual(reader[7], self.messages[7])
+            self.assertEqual(reader[-1], self.messages[-1])
+
+    def test_empty(self):
+        with bh.RecordWriter(self.path):
+            pass
+
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(list(reader), [])
+
+    def test_recovery(self):
+        with bh.RecordWriter(self.path) as writer:
+            for msg in self.messages:
+                writer.write(msg)
+
+        # Lose the index's tail and part of the last record
+        index = bh.index_path(self.path)
+        index.write_bytes(index.read_bytes()[:-20])
+        self.path.write_bytes(self.path.read_bytes()[:-3])
+
+        # Readers scan past the index for whole records
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            self.assertEqual(list(reader), self.messages[:-1])
+
+        # Writers drop the partial record and repair the index
+        with bh.RecordWriter(self.path) as writer:
+            self.assertEqual(writer.write(self.messages[-1]), 9)
+        self.assertEqual(len(index.read_bytes()), 8 * len(self.messages))
+
+        # ...or rebuild it entirely
+        index.unlink()
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            self.assertEqual(list(reader), self.messages)
+
+    def test_index_past_log(self):
+        with bh.RecordWriter(self.path) as writer:
+            for msg in self.messages:
+                writer.write(msg)
+
+        # Lose the last two records, but not their index entries
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            end = reader._offsets[-2]
+        self.path.write_bytes(self.path.read_bytes()[:end])
+
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            self.assertEqual(list(reader), self.messages[:-2])
+
+        with bh.RecordWriter(self.path) as writer:
+            self.assertEqual(writer.write(self.messages[-2]), 8)
+        with bh.RecordReader(self.path, sample_bh.StringLists) as reader:
+            self.assertEqual(list(reader), self.messages[:-1])
@@ -1,11 +1,18 @@
+import concurrent.futures
+import dataclasses
 import enum
+import graphlib
+import itertools
 import pathlib
+import tempfile
+import tomllib
 
 import rich_click as click
 
 from nlb.buffham import cpp_generator
 from nlb.buffham import parser
 from nlb.buffham import py_generator
+from nlb.buffham import schema_bh
 from nlb.buffham import template_generator
 from nlb.util import click_utils
 
@@ -17,19 +24,270 @@ class Languages(enum.Enum):
     BINARY = enum.auto()
 
 
+@dataclasses.dataclass
+class Target:
+    """A schema to generate outputs for in batch mode."""
+
+    # Schema file, relative to the root of the namespaces (like `--input`)
+    src: pathlib.Path
+    languages: list[Languages]
+    numpy: bool = False
+    slots: bool = False
+    # Template files to their output files, both relative to the schema
+    templates: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    @property
+    def namespace(self) -> str:
+        return '.'.join((*self.src.parent.parts, self.src.stem))
+
+
+def generate(
+    ctx: parser.Parser,
+    ns: str,
+    language: Languages,
+    output: pathlib.Path,
+    secondary_output: pathlib.Path | None = None,
+    template_file: pathlib.Path | None = None,
+    numpy: bool = False,
+    slots: bool = False,
+) -> None:
+    """Generate a parsed schema's output(s) in a language."""
+    match language:
+        case Languages.PYTHON:
+            py_generator.generate_python(
+                ctx, ns, output, stub=False, numpy=numpy, slots=slots
+            )
+            if secondary_output is not None:
+                py_generator.generate_python(
+                    ctx, ns, secondary_output, stub=True, numpy=numpy, slots=slots
+                )
+        case Languages.CPP:
+            assert secondary_output is not None
+            cpp_generator.generate_cpp(ctx, ns, output, hpp=True)
+            cpp_generator.generate_cpp(ctx, ns, secondary_output, hpp=False)
+        case Languages.TEMPLATE:
+            assert template_file is not None
+            template_generator.generate_template(ctx, ns, output, template_file)
+        case Languages.BINARY:
+            # Serialize the parsed buffham data
+            with output.open('wb') as f:
+                f.write(ctx.buffhams[ns].serialize())
+        case _:
+            raise ValueError(f'Unsupported language: {language}')
+
+
+def check_frame_budget(ctx: parser.Parser, ns: str, frame_budget: int) -> list[str]:
+    """Check that a schema's transactions and publishes fit in a frame budget.
+
+    Args:
+        frame_budget: Largest frame, in bytes, a node can receive (e.g.
+            `kBufSize` in `bh_cobs.hpp`)
+
+    Returns:
+        Warnings for messages whose largest frames exceed the budget
+
+    Raises:
+        ValueError: If a message's smallest frame exceeds the budget
+    """
+    bh = ctx.buffhams[ns]
+    requests = [
+        *(
+            (t.name, name)
+            for t in bh.transactions
+            for name in (t.receive_name, t.send_name)
+        ),
+        *((p.name, p.send_name) for p in bh.publishes),
+    ]
+
+    warnings = []
+    for request, name in requests:
+        min_size, max_size = map(
+            parser.framed_size, ctx.size_range(ctx.get_message(name))
+        )
+        if min_size > frame_budget:
+            raise ValueError(
+                f'{request}: {name.name} takes at least {min_size} bytes to frame, '
+                f'over the {frame_budget} byte frame budget'
+            )
+        if max_size > frame_budget:
+            warnings.append(
+                f'{request}: {name.name} may take up to {max_size} bytes to frame, '
+                f'over the {frame_budget} byte frame budget'
+            )
+    # Transactions may send and receive the same message
+    return list(dict.fromkeys(warnings))
+
+
+def load_targets(
+    source: pathlib.Path, languages: list[Languages], numpy: bool, slots: bool
+) -> list[Target]:
+    """Load batch targets from a directory of schemas or a TOML manifest.
+
+    Every schema in a directory is generated in `languages`. Manifests list
+    schemas as `[[schema]]` tables with a `src`, and optionally `languages`,
+    `numpy`, `slots` and `templates` to override the defaults, e.g.:
+
+    ```
+    [[schema]]
+    src = "emb/project/bootloader/bootloader.bh"
+    languages = ["python", "cpp"]
+    templates = { "memmap_bootloader_patch.ld" = "memmap_bootloader_bh.ld" }
+    ```
+    """
+    if source.is_dir():
+        return [
+            Target(src, list(languages), numpy, slots)
+            for src in sorted(source.rglob('*.bh'))
+        ]
+
+    manifest = tomllib.loads(source.read_text())
+    return [
+        Target(
+            pathlib.Path(entry['src']),
+            [Languages[language.upper()] for language in entry['languages']]
+            if 'languages' in entry
+            else list(languages),
+            entry.get('numpy', numpy),
+            entry.get('slots', slots),
+            entry.get('templates', {}),
+        )
+        for entry in manifest['schema']
+    ]
+
+
+def import_order(targets: list[Target]) -> list[tuple[Target, list[str]]]:
+    """Order targets after the schemas they import.
+
+    Returns:
+        Each target with the namespaces it imports, directly or transitively,
+        in the same order
+    """
+    by_namespace = {target.namespace: target for target in targets}
+    imports: dict[str, list[str]] = {}
+    for namespace, target in by_namespace.items():
+        imports[namespace] = []
+        for line in target.src.read_text().splitlines():
+            if match := parser.IMPORT_REGEX.match(line):
+                name = match.groups()[0]
+                if name not in by_namespace:
+                    raise ValueError(f'{target.src} imports {name}, not in the batch')
+                imports[namespace].append(name)
+
+    order = list(graphlib.TopologicalSorter(imports).static_order())
+    position = {namespace: i for i, namespace in enumerate(order)}
+    deps: dict[str, list[str]] = {}
+    for namespace in order:
+        transitive = {dep for i in imports[namespace] for dep in (*deps[i], i)}
+        deps[namespace] = sorted(transitive, key=position.__getitem__)
+
+    return [(by_namespace[namespace], deps[namespace]) for namespace in order]
+
+
+def _generate_target(
+    ctx: parser.Parser, target: Target, output_dir: pathlib.Path
+) -> list[pathlib.Path]:
+    """Generate a target's outputs, writing only those that changed."""
+    stem = target.src.stem
+    with tempfile.TemporaryDirectory() as tempdir:
+        staging = pathlib.Path(tempdir)
+
+        names = []
+        for language in target.languages:
+            match language:
+                case Languages.PYTHON:
+                    outputs = [f'{stem}_bh.py', f'{stem}_bh.pyi']
+                case Languages.CPP:
+                    outputs = [f'{stem}_bh.hpp', f'{stem}_bh.cc']
+                case Languages.BINARY:
+                    outputs = [f'{stem}.bhb']
+                case _:
+                    # Templates are generated from `templates`
+                    continue
+            generate(
+                ctx,
+                target.namespace,
+                language,
+                *(staging / output for output in outputs),
+                numpy=target.numpy,
+                slots=target.slots,
+            )
+            names += outputs
+        for template, output in target.templates.items():
+            generate(
+                ctx,
+                target.namespace,
+                Languages.TEMPLATE,
+                staging / output,
+                template_file=target.src.parent / template,
+            )
+            names.append(output)
+
+        written = []
+        for name in names:
+            contents = (staging / name).read_bytes()
+            path = output_dir / target.src.parent / name
+            if path.exists() and path.read_bytes() == contents:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(contents)
+            written.append(path)
+
+    return written
+
+
+def generate_batch(
+    targets: list[Target],
+    output_dir: pathlib.Path,
+    jobs: int | None = None,
+    cache_dir: pathlib.Path | None = None,
+    frame_budget: int | None = None,
+) -> list[pathlib.Path]:
+    """Generate outputs for many schemas at once.
+
+    Each schema is parsed once, in import order, with the schemas it imports
+    in its context as `--dep`s would be. Outputs are then generated in a
+    process pool of `jobs` processes (defaulting to the number of CPUs).
+    Schemas are checked against a `frame_budget`, if given, as they're parsed.
+
+    Returns:
+        The outputs that were written; unchanged outputs are left untouched
+    """
+    parsed: dict[str, schema_bh.Buffham] = {}
+    contexts = []
+    for target, deps in import_order(targets):
+        ctx = parser.Parser(cache_dir=cache_dir)
+        for dep in deps:
+            ctx.add_buffham(parsed[dep])
+        parsed[target.namespace] = ctx.parse_file(target.src)
+        if frame_budget is not None:
+            for warning in check_frame_budget(ctx, target.namespace, frame_budget):
+                click.echo(f'Warning: {target.src}: {warning}', err=True)
+        contexts.append((ctx, target))
+
+    if jobs == 1:
+        written = [_generate_target(*context, output_dir) for context in contexts]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+            written = list(
+                pool.map(
+                    _generate_target, *zip(*contexts), itertools.repeat(output_dir)
+                )
+            )
+
+    return [path for paths in written for path in paths]
+
+
 @click.command()
 @click.option(
     '--input',
     '-i',
     type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
-    required=True,
     help='Input Buffham file',
 )
 @click.option(
     '--output',
     '-o',
     type=click.Path(dir_okay=False, path_type=pathlib.Path),
-    required=True,
     help='Output file',
 )
 @click.option(
@@ -54,18 +312,79 @@ class Languages(enum.Enum):
     '--language',
     '-l',
     type=click_utils.EnumChoice(Languages),
-    required=True,
-    help='Output language',
+    multiple=True,
+    help='Output language (one, or any number with `--batch`)',
+)
+@click.option(
+    '--numpy',
+    is_flag=True,
+    help='Use NumPy arrays for numeric list fields (Python only)',
+)
+@click.option(
+    '--slots',
+    is_flag=True,
+    help='Generate dataclasses with `__slots__` (Python only)',
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    envvar='BUFFHAM_CACHE_DIR',
+    help='Directory to cache parsed schemas in, to skip re-parsing unchanged ones',
+)
+@click.option(
+    '--batch',
+    '-b',
+    type=click.Path(exists=True, path_type=pathlib.Path),
+    help='Directory of Buffham files, or a TOML manifest of them, to generate at once',
+)
+@click.option(
+    '--output-dir',
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    default='.',
+    show_default=True,
+    help='Directory to write batch outputs under, mirroring the inputs',
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    help='Number of processes to generate batch outputs with (default: CPUs)',
+)
+@click.option(
+    '--frame-budget',
+    type=int,
+    help='Largest frame a node can receive, to check messages fit in (bytes)',
 )
 def main(
-    input: pathlib.Path,
-    output: pathlib.Path,
+    input: pathlib.Path | None,
+    output: pathlib.Path | None,
     secondary_output: pathlib.Path | None,
     template_file: pathlib.Path | None,
     dep: list[pathlib.Path],
-    language: Languages,
+    language: list[Languages],
+    numpy: bool,
+    slots: bool,
+    cache_dir: pathlib.Path | None,
+    batch: pathlib.Path | None,
+    output_dir: pathlib.Path,
+    jobs: int | None,
+    frame_budget: int | None,
 ):
-    p = parser.Parser()
+    if batch is not None:
+        languages = list(language) or [Languages.PYTHON, Languages.CPP]
+        targets = load_targets(batch, languages, numpy, slots)
+        written = generate_batch(targets, output_dir, jobs, cache_dir, frame_budget)
+        for path in written:
+            print(f'Generated {path}')
+        print(f'{len(written)} outputs changed')
+        return
+
+    if input is None or output is None or len(language) != 1:
+        raise click.UsageError(
+            '`--input`, `--output` and one `--language` are required without `--batch`'
+        )
+
+    p = parser.Parser(cache_dir=cache_dir)
 
     for d in dep:
         p.parse_file(d)
@@ -73,24 +392,11 @@ def main(
     p.parse_file(input)
     ns = parser.full_name(p.cur_namespace)
 
-    match language:
-        case Languages.PYTHON:
-            py_generator.generate_python(p, ns, output, stub=False)
-            if secondary_output is not None:
-                py_generator.generate_python(p, ns, secondary_output, stub=True)
-        case Languages.CPP:
-            assert secondary_output is not None
-            cpp_generator.generate_cpp(p, ns, output, hpp=True)
-            cpp_generator.generate_cpp(p, ns, secondary_output, hpp=False)
-        case Languages.TEMPLATE:
-            assert template_file is not None
-            template_generator.generate_template(p, ns, output, template_file)
-        case Languages.BINARY:
-            # Serialize the parsed buffham data
-            with output.open('wb') as f:
-                f.write(p.buffhams[ns].serialize())
-        case _:
-            raise ValueError(f'Unsupported language: {language}')
+    if frame_budget is not None:
+        for warning in check_frame_budget(p, ns, frame_budget):
+            click.echo(f'Warning: {input}: {warning}', err=True)
+
+    generate(p, ns, language[0], output, secondary_output, template_file, numpy, slots)
 
     print(f'Generated {output}')
     if secondary_output is not None:
@@ -0,0 +1,126 @@
+import pathlib
+import tempfile
+import unittest
+
+from nlb.buffham import buffham
+from nlb.buffham import parser
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.testdata_dir = pathlib.Path('nlb/buffham/testdata')
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.output_dir = pathlib.Path(self.tempdir.name)
+
+        # Generate what the Bazel rules for the sample schemas do
+        self.manifest = self.output_dir / 'buffham.toml'
+        self.manifest.write_text(
+            '[[schema]]\n'
+            f'src = "{self.testdata_dir / "sample.bh"}"\n'
+            'languages = ["python", "cpp", "binary"]\n'
+            'templates = { "sample.template.md" = "sample_template.md" }\n'
+            '\n'
+            '[[schema]]\n'
+            f'src = "{self.testdata_dir / "other.bh"}"\n'
+        )
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def test_import_order(self):
+        targets = buffham.load_targets(
+            self.testdata_dir, [buffham.Languages.PYTHON], numpy=False, slots=False
+        )
+        order = [
+            (target.namespace, deps) for target, deps in buffham.import_order(targets)
+        ]
+        self.assertLess(
+            order.index(('nlb.buffham.testdata.other', [])),
+            order.index(
+                ('nlb.buffham.testdata.sample', ['nlb.buffham.testdata.other'])
+            ),
+        )
+        self.assertIn(('nlb.buffham.testdata.shapes', []), order)
+
+    def test_generate_batch(self):
+        targets = buffham.load_targets(
+            self.manifest, [buffham.Languages.PYTHON], numpy=False, slots=False
+        )
+        written = buffham.generate_batch(targets, self.output_dir, jobs=2)
+
+        out_dir = self.output_dir / self.testdata_dir
+        self.assertCountEqual(
+            written,
+            [
+                out_dir / name
+                for name in (
+                    'other_bh.py',
+                    'other_bh.pyi',
+                    'sample.bhb',
+                    'sample_bh.py',
+                    'sample_bh.pyi',
+                    'sample_bh.hpp',
+                    'sample_bh.cc',
+                    'sample_template.md',
+                )
+            ],
+        )
+
+        # Outputs match those of one `buffham` run per output
+        for name, golden in (
+            ('sample_bh.py', 'sample_bh.py.golden'),
+            ('sample_bh.pyi', 'sample_bh.pyi.golden'),
+            ('sample_bh.hpp', 'sample_bh.hpp.golden'),
+            ('sample_bh.cc', 'sample_bh.cc.golden'),
+            ('sample_template.md', 'sample.md.golden'),
+            ('other_bh.pyi', 'other_bh.pyi'),
+        ):
+            self.assertEqual(
+                (out_dir / name).read_text(),
+                (self.testdata_dir / golden).read_text(),
+                name,
+            )
+
+        # Unchanged outputs aren't rewritten
+        self.assertEqual(buffham.generate_batch(targets, self.output_dir, jobs=1), [])
+
+        (out_dir / 'sample_bh.py').write_text('')
+        self.assertEqual(
+            buffham.generate_batch(targets, self.output_dir, jobs=1),
+            [out_dir / 'sample_bh.py'],
+        )
+
+    def test_frame_budget(self):
+        ctx = parser.Parser()
+        ctx.parse_file(self.testdata_dir / 'other.bh')
+        ns = parser.full_name(ctx.parse_file(self.testdata_dir / 'sample.bh').name)
+
+        # Only `Pong` (in `other`) has no variable-length fields
+        self.assertEqual(buffham.check_frame_budget(ctx, ns, 1 << 40), [])
+        self.assertEqual(
+            buffham.check_frame_budget(ctx, ns, 1536),
+            [
+                f'{request}: {message} may take up to {size} bytes to frame, '
+                'over the 1536 byte frame budget'
+                for request, message, size in (
+                    ('ping', 'LogMessage', 65800),
+                    ('flash_page', 'FlashPage', 65807),
+                    ('read_flash_page', 'FlashPage', 65807),
+                    ('log_message', 'LogMessage', 65800),
+                )
+            ],
+        )
+
+        with self.assertRaisesRegex(
+            ValueError,
+            'flash_page: FlashPage takes at least 10 bytes to frame, over the 7 byte',
+        ):
+            buffham.check_frame_budget(ctx, ns, 7)
+
+    def test_unknown_import(self):
+        targets = buffham.load_targets(
+            self.manifest, [buffham.Languages.PYTHON], numpy=False, slots=False
+        )
+        with self.assertRaisesRegex(ValueError, 'not in the batch'):
+            buffham.import_order(targets[:1])
@@ -102,6 +102,191 @@ def _cpp_type(
     return type_str
 
 
+def _varint(value: str, field_type: schema_bh.FieldType | None) -> str:
+    """Get the expression for an integer's varint value (zigzagged if signed)."""
+    if field_type in parser.SIGNED_TYPES:
+        return f'nlb::buffham::zigzag({value})'
+    return value
+
+
+def _generate_packed_serializer(field: schema_bh.Field, tabs: str) -> str:
+    """Generate the statements writing a present packed field at `offset`."""
+    value = f'{field.name}.value()' if field.is_optional else field.name
+    write = 'offset += nlb::buffham::writeVarint(buffer.data() + offset, {});'
+
+    if field.pri_type not in (
+        schema_bh.FieldType.LIST,
+        schema_bh.FieldType.STRING,
+        schema_bh.FieldType.BYTES,
+    ):
+        return f'\n{tabs}' + write.format(_varint(value, field.pri_type))
+
+    definition = f'\n{tabs}' + write.format(f'{value}.size()')
+    if field.pri_type is not schema_bh.FieldType.LIST:
+        definition += (
+            f'\n{tabs}memcpy(buffer.data() + offset, {value}.data(), {value}.size());'
+        )
+        definition += f'\n{tabs}offset += {value}.size();'
+    elif field.sub_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES):
+        definition += f'\n{tabs}for (const auto &item : {value}) {{'
+        definition += f'\n{tabs}{T}' + write.format(_varint('item', field.sub_type))
+        definition += f'\n{tabs}}}'
+    elif field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        definition += f'\n{tabs}for (const auto &item : {value}) {{'
+        definition += f'\n{tabs}{T}' + write.format('item.size()')
+        definition += (
+            f'\n{tabs}{T}memcpy(buffer.data() + offset, item.data(), item.size());'
+        )
+        definition += f'\n{tabs}{T}offset += item.size();'
+        definition += f'\n{tabs}}}'
+    elif field.sub_type is schema_bh.FieldType.MESSAGE:
+        definition += f'\n{tabs}for (const auto &item : {value}) {{'
+        definition += (
+            f'\n{tabs}{T}auto item_buffer = item.serialize(buffer.subspan(offset));'
+        )
+        definition += f'\n{tabs}{T}offset += item_buffer.size();'
+        definition += f'\n{tabs}}}'
+    else:
+        field_size = parser.SIZE_MAP[field.sub_type]  # type: ignore
+        definition += f'\n{tabs}memcpy(buffer.data() + offset, {value}.data(), {value}.size() * {field_size});'
+        definition += f'\n{tabs}offset += {value}.size() * {field_size};'
+    return definition
+
+
+def _generate_varint_read(
+    target: str, message_name: str, tabs: str, min_item_size: int | None = None
+) -> str:
+    """Generate the statements reading a varint at `offset` into `target`.
+
+    A malformed varint ends the message early, consuming the rest of the
+    buffer. So does a length (with `min_item_size`, the smallest size of an
+    item) that can't fit in the rest of the buffer.
+    """
+    read = f'{target}_read'
+    definition = (
+        f'\n{tabs}size_t {read} = nlb::buffham::readVarint('
+        f'buffer.data() + offset, buffer.size() - offset, &{target});'
+    )
+    check = f'{read} == 0'
+    if min_item_size is not None:
+        remaining = f'buffer.size() - offset - {read}'
+        if min_item_size > 1:
+            remaining = f'({remaining}) / {min_item_size}'
+        check += f' || {target} > {remaining}'
+    definition += f'\n{tabs}if ({check}) {{'
+    definition += f'\n{tabs}{T}return {{{message_name}, buffer}};'
+    definition += f'\n{tabs}}}'
+    definition += f'\n{tabs}offset += {read};'
+    return definition
+
+
+def _generate_packed_deserializer(
+    field: schema_bh.Field, message_name: str, primary_namespace: str, tabs: str
+) -> str:
+    """Generate the statements reading a present packed field at `offset`."""
+    emplace = '.emplace()' if field.is_optional else ''
+    value = f'{field.name}_value'
+    definition = f'\n{tabs}auto &{value} = {message_name}.{field.name}{emplace};'
+
+    def read(target: str, field_type: schema_bh.FieldType | None, tabs: str) -> str:
+        """Read an integer's varint into `target`."""
+        varint = f'{field.name}_varint'
+        result = f'\n{tabs}uint64_t {varint};'
+        result += _generate_varint_read(varint, message_name, tabs)
+        if field_type in parser.SIGNED_TYPES:
+            varint = f'nlb::buffham::unzigzag({varint})'
+        if field_type is not schema_bh.FieldType.UINT64_T:
+            varint = f'static_cast<{TYPE_MAP[field_type]}>({varint})'  # type: ignore
+        result += f'\n{tabs}{target} = {varint};'
+        return result
+
+    if field.pri_type not in (
+        schema_bh.FieldType.LIST,
+        schema_bh.FieldType.STRING,
+        schema_bh.FieldType.BYTES,
+    ):
+        return definition + read(value, field.pri_type, tabs)
+
+    # Every item takes at least a byte, bar (possibly empty) nested messages
+    min_item_size = 1
+    if field.sub_type is schema_bh.FieldType.MESSAGE:
+        min_item_size = None
+    elif field.sub_type in (schema_bh.FieldType.FLOAT32, schema_bh.FieldType.FLOAT64):
+        min_item_size = parser.SIZE_MAP[field.sub_type]
+
+    size = f'{field.name}_size'
+    definition += f'\n{tabs}uint64_t {size};'
+    definition += _generate_varint_read(size, message_name, tabs, min_item_size)
+    definition += f'\n{tabs}{value}.resize({size});'
+    if field.pri_type is not schema_bh.FieldType.LIST:
+        definition += f'\n{tabs}memcpy({value}.data(), buffer.data() + offset, {size});'
+        definition += f'\n{tabs}offset += {size};'
+    elif field.sub_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES):
+        definition += f'\n{tabs}for (auto &item : {value}) {{'
+        definition += read('item', field.sub_type, tabs + T)
+        definition += f'\n{tabs}}}'
+    elif field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        definition += f'\n{tabs}for (auto &item : {value}) {{'
+        definition += f'\n{tabs}{T}uint64_t item_size;'
+        definition += _generate_varint_read('item_size', message_name, tabs + T, 1)
+        definition += f'\n{tabs}{T}item.resize(item_size);'
+        definition += (
+            f'\n{tabs}{T}memcpy(item.data(), buffer.data() + offset, item_size);'
+        )
+        definition += f'\n{tabs}{T}offset += item_size;'
+        definition += f'\n{tabs}}}'
+    elif field.sub_type is schema_bh.FieldType.MESSAGE:
+        definition += f'\n{tabs}for (auto &item : {value}) {{'
+        definition += f'\n{tabs}{T}auto item_buffer = buffer.subspan(offset);'
+        definition += f'\n{tabs}{T}std::tie(item, item_buffer) = {_cpp_type(field, primary_namespace, just_object=True)}::deserialize(item_buffer);'
+        definition += f'\n{tabs}{T}offset += item_buffer.size();'
+        definition += f'\n{tabs}}}'
+    else:
+        field_size = parser.SIZE_MAP[field.sub_type]  # type: ignore
+        definition += f'\n{tabs}memcpy({value}.data(), buffer.data() + offset, {size} * {field_size});'
+        definition += f'\n{tabs}offset += {size} * {field_size};'
+    return definition
+
+
+def _generate_rle_serializer(field: schema_bh.Field, tabs: str) -> str:
+    """Generate the statements writing a present `rle` field at `offset`."""
+    value = f'{field.name}.value()' if field.is_optional else field.name
+    encode = f'nlb::buffham::rleEncode({value}, buffer.data() + offset{{}})'
+    if field.is_packed:
+        # The varint length goes first, so the encoded size is needed up front
+        definition = (
+            f'\n{tabs}offset += nlb::buffham::writeVarint(buffer.data() + offset, '
+            f'nlb::buffham::rleSize({value}));'
+        )
+        definition += f'\n{tabs}offset += {encode.format("")};'
+        return definition
+
+    # Encode after the length, then fill it in
+    size = f'{field.name}_size'
+    definition = f'\n{tabs}uint16_t {size} = {encode.format(" + 2")};'
+    definition += f'\n{tabs}memcpy(buffer.data() + offset, &{size}, 2);'
+    definition += f'\n{tabs}offset += 2 + {size};'
+    return definition
+
+
+def _generate_rle_deserializer(
+    field: schema_bh.Field, message_name: str, tabs: str
+) -> str:
+    """Generate the statements reading a present `rle` field at `offset`."""
+    emplace = '.emplace()' if field.is_optional else ''
+    size = f'{field.name}_size'
+    if field.is_packed:
+        definition = f'\n{tabs}uint64_t {size};'
+        definition += _generate_varint_read(size, message_name, tabs, 1)
+    else:
+        definition = f'\n{tabs}uint16_t {size};'
+        definition += f'\n{tabs}memcpy(&{size}, buffer.data() + offset, 2);'
+        definition += f'\n{tabs}offset += 2;'
+    definition += f'\n{tabs}nlb::buffham::rleDecode(buffer.subspan(offset, {size}), {message_name}.{field.name}{emplace});'
+    definition += f'\n{tabs}offset += {size};'
+    return definition
+
+
 def _generate_serializer(
     message: schema_bh.Message,
     num_optional_fields: int,
@@ -131,7 +316,19 @@ def _generate_serializer(
         optional_value = '.value()' if field.is_optional else ''
         access = '->' if field.is_optional else '.'
 
-        if parser.is_field_iterable(field):
+        if field.is_rle or field.is_packed:
+            generate = (
+                _generate_rle_serializer
+                if field.is_rle
+                else _generate_packed_serializer
+            )
+            if field.is_optional:
+                definition += f'\n{T}if ({field.name}.has_value()) {{'
+                definition += generate(field, T * 2)
+                definition += f'\n{T}}}'
+            else:
+                definition += generate(field, T)
+        elif parser.is_field_iterable(field):
             # Get size
             size_expression = f'{field.name}.size()'
             if field.is_optional:
@@ -211,6 +408,40 @@ def _generate_serializer(
     return definition
 
 
+def _generate_fixed_serializer(message: schema_bh.Message, definition: str) -> str:
+    # Every offset is known up front
+    definition += ' {'
+    offset = 0
+    for field in message.fields:
+        field_size = parser.SIZE_MAP[field.pri_type]
+        destination = f'buffer.data() + {offset}' if offset else 'buffer.data()'
+        definition += f'\n{T}memcpy({destination}, &{field.name}, {field_size});'
+        offset += field_size
+    definition += f'\n{T}return buffer.subspan(0, kSize);\n'
+    definition += '}\n\n'
+
+    return definition
+
+
+def _generate_fixed_deserializer(message: schema_bh.Message, definition: str) -> str:
+    # Every offset is known up front
+    definition += ' {'
+    message_name = _to_snake_case(message.name)
+    definition += f'\n{T}{message.name} {message_name};'
+    offset = 0
+    for field in message.fields:
+        field_size = parser.SIZE_MAP[field.pri_type]
+        source = f'buffer.data() + {offset}' if offset else 'buffer.data()'
+        definition += (
+            f'\n{T}memcpy(&{message_name}.{field.name}, {source}, {field_size});'
+        )
+        offset += field_size
+    definition += f'\n{T}return {{{message_name}, buffer.subspan(0, kSize)}};\n'
+    definition += '}\n'
+
+    return definition
+
+
 def _generate_deserializer(
     message: schema_bh.Message,
     num_optional_fields: int,
@@ -239,7 +470,21 @@ def _generate_deserializer(
         optional_value = '.emplace()' if field.is_optional else ''
         access = '->' if field.is_optional else '.'
 
-        if parser.is_field_iterable(field):
+        if field.is_rle or field.is_packed:
+            tabs = T * 2 if field.is_optional else T
+            if field.is_rle:
+                statements = _generate_rle_deserializer(field, message_name, tabs)
+            else:
+                statements = _generate_packed_deserializer(
+                    field, message_name, primary_namespace, tabs
+                )
+            if field.is_optional:
+                definition += f'\n{T}if ((optional_bitfield >> {optional_idx}) & 1) {{'
+                definition += statements
+                definition += f'\n{T}}}'
+            else:
+                definition += statements
+        elif parser.is_field_iterable(field):
             # Get size
             definition += f'\n{T}uint16_t {field.name}_size;'
             expression = f'memcpy(&{field.name}_size, buffer.data() + offset, 2)'
@@ -323,9 +568,16 @@ def _generate_deserializer(
 
 
 def generate_message(
-    message: schema_bh.Message, primary_namespace: str, hpp: bool
+    message: schema_bh.Message,
+    primary_namespace: str,
+    hpp: bool,
+    size_range: tuple[int, int] | None = None,
 ) -> str:
-    """Generate a struct definition from a Message."""
+    """Generate a struct definition from a Message.
+
+    With a `size_range` (see `parser.Parser.size_range`), the struct
+    advertises its framed sizes.
+    """
     definition = ''
     ns = '' if hpp else f'{message.name}::'
     tab = T if hpp else ''
@@ -346,6 +598,20 @@ def generate_message(
                 definition += f'  //{field.inline_comment}'
         definition += '\n\n'
 
+        # Fixed-size messages advertise their size up front
+        size = parser.fixed_size(message)
+        if size is not None:
+            definition += f'{T}static constexpr uint16_t kSize = {size};\n\n'
+
+        if size_range is not None:
+            definition += (
+                f'{T}// Worst-case sizes when framed by `BhCobs`\n'
+                f'{T}static constexpr uint64_t kMinEncodedSize = '
+                f'{parser.framed_size(size_range[0])};\n'
+                f'{T}static constexpr uint64_t kMaxEncodedSize = '
+                f'{parser.framed_size(size_range[1])};\n\n'
+            )
+
     num_optional_fields = sum(1 for f in message.fields if f.is_optional)
     num_optional_bytes = (num_optional_fields + 7) // 8
 
@@ -356,6 +622,8 @@ def generate_message(
 
     if hpp:
         definition += ';\n\n'
+    elif parser.fixed_size(message) is not None:
+        definition = _generate_fixed_serializer(message, definition)
     else:
         definition = _generate_serializer(
             message, num_optional_fields, num_optional_bytes, definition
@@ -366,6 +634,8 @@ def generate_message(
     definition += f'{tab}{qualifiers}std::pair<{message.name}, std::span<const uint8_t> > {ns}deserialize(std::span<const uint8_t> buffer)'
     if hpp:
         definition += ';\n'
+    elif parser.fixed_size(message) is not None:
+        definition = _generate_fixed_deserializer(message, definition)
     else:
         definition = _generate_deserializer(
             message,
@@ -530,6 +800,9 @@ def generate_cpp(
     ctx: parser.Parser, primary_namespace: str, outfile: pathlib.Path, hpp: bool
 ) -> None:
     bh = ctx.buffhams[primary_namespace]
+    if len(bh.transactions) or len(bh.publishes):
+        # Checks that imported schemas don't reuse each other's request IDs
+        ctx.request_ids()
 
     with outfile.open('w') as fp:
         if hpp:
@@ -550,6 +823,14 @@ def generate_cpp(
                 '#include <tuple>\n'
                 '#include <vector>\n\n'
             )
+            fields = [field for message in bh.messages for field in message.fields]
+            buffham_includes = []
+            if any(field.is_rle for field in fields):
+                buffham_includes.append('#include "nlb/buffham/rle.hpp"\n')
+            if any(field.is_packed for field in fields):
+                buffham_includes.append('#include "nlb/buffham/varint.hpp"\n')
+            if not hpp and buffham_includes:
+                fp.write(''.join(buffham_includes) + '\n')
         elif schema_bh.FieldType.STRING in [constant.type for constant in bh.constants]:
             fp.write('#include <string>\n\n')
 
@@ -584,7 +865,11 @@ def generate_cpp(
 
         # Generate message definitions
         for message in bh.messages:
-            fp.write(generate_message(message, primary_namespace, hpp))
+            fp.write(
+                generate_message(
+                    message, primary_namespace, hpp, ctx.size_range(message)
+                )
+            )
 
         # Generate transaction definitions
         if (len(bh.transactions) or len(bh.svr_methods)) and hpp:
@@ -32,6 +32,22 @@ TEST(SampleBhTest, TestPingSerialization) {
     ASSERT_THAT(used_buffer.size(), Eq(serialized.size()));
 }
 
+// Test that fixed-size messages encode to their advertised size
+TEST(SampleBhTest, TestFixedSize) {
+    static_assert(testdata::Ping::kSize == 1);
+    static_assert(testdata::Pong::kSize == 1);
+
+    testdata::Ping ping{42};
+    std::array<uint8_t, testdata::Ping::kSize> buffer{};
+    auto serialized = ping.serialize(buffer);
+    ASSERT_THAT(serialized.size(), Eq(testdata::Ping::kSize));
+
+    auto [deserialized_ping, used_buffer] =
+        testdata::Ping::deserialize(serialized);
+    ASSERT_THAT(deserialized_ping.ping, Eq(ping.ping));
+    ASSERT_THAT(used_buffer.size(), Eq(testdata::Ping::kSize));
+}
+
 // Test FlashPage serialization and deserialization
 TEST(SampleBhTest, TestFlashPageSerialization) {
     testdata::FlashPage flash_page{0x1234, {0x9A, 0xBC}, 0x5678};
@@ -171,6 +187,122 @@ TEST(SampleBhTest, TestStringListsSerialization) {
     ASSERT_THAT(used_buffer.size(), Eq(serialized.size()));
 }
 
+// Test PackedSample serialization and deserialization, with the same bytes as
+// `py_generator_test.py`
+TEST(SampleBhTest, TestPackedSampleSerialization) {
+    testdata::PackedSample packed_sample{
+        300, -3, -300, "hi", {1, 400}, {-1, 2}, {0.5}, {"ab"}, {{42}}, true};
+    std::vector<uint8_t> expected{
+        0x01, 0xAC, 0x02, 0x05, 0xD7, 0x04, 0x02, 'h',  'i',  0x02,
+        0x01, 0x90, 0x03, 0x02, 0x01, 0x04, 0x01, 0x00, 0x00, 0x00,
+        0x3F, 0x01, 0x02, 'a',  'b',  0x01, 0x2A, 0x01};
+
+    // Serialize
+    std::array<uint8_t, 512> buffer{};
+    auto serialized = packed_sample.serialize(buffer);
+    ASSERT_THAT(serialized, ElementsAreArray(expected));
+
+    // Deserialize
+    auto [deserialized_packed_sample, used_buffer] =
+        testdata::PackedSample::deserialize(serialized);
+
+    // Verify
+    ASSERT_THAT(deserialized_packed_sample.counter, Eq(packed_sample.counter));
+    ASSERT_THAT(deserialized_packed_sample.delta, Eq(packed_sample.delta));
+    ASSERT_THAT(deserialized_packed_sample.timestamp,
+                Eq(packed_sample.timestamp));
+    ASSERT_THAT(deserialized_packed_sample.label, Eq(packed_sample.label));
+    ASSERT_THAT(deserialized_packed_sample.samples,
+                ElementsAreArray(packed_sample.samples));
+    ASSERT_THAT(deserialized_packed_sample.deltas,
+                ElementsAreArray(packed_sample.deltas));
+    ASSERT_THAT(deserialized_packed_sample.gains,
+                ElementsAreArray(packed_sample.gains));
+    ASSERT_THAT(deserialized_packed_sample.tags,
+                ElementsAreArray(packed_sample.tags));
+    ASSERT_THAT(deserialized_packed_sample.pings.size(), Eq(1));
+    ASSERT_THAT(deserialized_packed_sample.pings[0].ping, Eq(42));
+    ASSERT_THAT(deserialized_packed_sample.enabled, Eq(packed_sample.enabled));
+    ASSERT_THAT(used_buffer.size(), Eq(serialized.size()));
+}
+
+// Test PartlyPacked serialization and deserialization
+TEST(SampleBhTest, TestPartlyPackedSerialization) {
+    testdata::PartlyPacked partly_packed{1ULL << 40, 3, std::nullopt};
+
+    // Serialize
+    std::array<uint8_t, 512> buffer{};
+    auto serialized = partly_packed.serialize(buffer);
+    ASSERT_THAT(serialized, ElementsAre(0x00, 0x80, 0x80, 0x80, 0x80, 0x80,
+                                        0x20, 0x03));
+
+    // Deserialize
+    auto [deserialized_partly_packed, used_buffer] =
+        testdata::PartlyPacked::deserialize(serialized);
+
+    // Verify
+    ASSERT_THAT(deserialized_partly_packed.timestamp,
+                Eq(partly_packed.timestamp));
+    ASSERT_THAT(deserialized_partly_packed.channel, Eq(partly_packed.channel));
+    ASSERT_FALSE(deserialized_partly_packed.payload.has_value());
+    ASSERT_THAT(used_buffer.size(), Eq(serialized.size()));
+}
+
+// Test that malformed varints end deserialization, consuming the buffer
+TEST(SampleBhTest, TestMalformedVarints) {
+    // Longer than any `uint64_t`
+    std::array<uint8_t, 12> overlong{};
+    overlong.fill(0x80);
+    overlong[0] = 0x00;
+    auto [overlong_partly_packed, overlong_used] =
+        testdata::PartlyPacked::deserialize(overlong);
+    ASSERT_THAT(overlong_used.size(), Eq(overlong.size()));
+
+    // Cut short by the end of the buffer
+    std::array<uint8_t, 3> truncated{0x00, 0x80, 0x80};
+    auto [truncated_partly_packed, truncated_used] =
+        testdata::PartlyPacked::deserialize(truncated);
+    ASSERT_THAT(truncated_used.size(), Eq(truncated.size()));
+
+    // A `label` length past the end of the buffer
+    std::array<uint8_t, 5> too_long{0x00, 0x01, 0x00, 0x7F, 'a'};
+    auto [packed_sample, too_long_used] =
+        testdata::PackedSample::deserialize(too_long);
+    ASSERT_THAT(packed_sample.counter, Eq(1));
+    ASSERT_THAT(packed_sample.label, IsEmpty());
+    ASSERT_THAT(too_long_used.size(), Eq(too_long.size()));
+}
+
+// Test CompressedPage serialization and deserialization, with the same bytes
+// as `py_generator_test.py`
+TEST(SampleBhTest, TestCompressedPageSerialization) {
+    testdata::CompressedPage compressed_page{0x1000, {}, std::vector<uint8_t>(10)};
+    compressed_page.data.assign(200, 0xFF);
+    compressed_page.data.push_back(0x01);
+    compressed_page.data.push_back(0x02);
+
+    // Serialize
+    std::array<uint8_t, 512> buffer{};
+    auto serialized = compressed_page.serialize(buffer);
+    ASSERT_THAT(serialized,
+                ElementsAre(0x01, 0x00, 0x10, 0x00, 0x00, 0x07, 0x00, 0x81,
+                            0xFF, 0xB9, 0xFF, 0x01, 0x01, 0x02, 0x02, 0xF7,
+                            0x00));
+
+    // Deserialize
+    auto [deserialized_compressed_page, used_buffer] =
+        testdata::CompressedPage::deserialize(serialized);
+
+    // Verify
+    ASSERT_THAT(deserialized_compressed_page.address,
+                Eq(compressed_page.address));
+    ASSERT_THAT(deserialized_compressed_page.data,
+                ElementsAreArray(compressed_page.data));
+    ASSERT_THAT(deserialized_compressed_page.spare,
+                Optional(ElementsAreArray(*compressed_page.spare)));
+    ASSERT_THAT(used_buffer.size(), Eq(serialized.size()));
+}
+
 // Test constants
 TEST(SampleBhTest, TestConstants) {
     ASSERT_THAT(testdata::kMyConstant, Eq(4));
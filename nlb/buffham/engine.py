@@ -1,8 +1,14 @@
+import dataclasses
+import linecache
+import operator
 import struct
 import types
-from typing import Callable, Type, Union, get_args, get_origin
+from typing import Any, Callable, Protocol, Type, Union, get_args, get_origin
+
+import numpy as np
 
 from nlb.buffham import parser
+from nlb.buffham import rle
 from nlb.buffham import schema_bh
 from nlb.util import dataclass
 
@@ -37,188 +43,1754 @@ def split_optional(field_type: Type) -> tuple[Type, bool]:
     return field_type, False
 
 
-def generate_serializer(
-    message: schema_bh.Message,
-    message_registry: dict[tuple[str, str], schema_bh.Message],
-) -> Callable[[dataclass.DataclassLike], bytes]:
-    """Generic serializer generator for a message schema."""
-    num_optional_fields = sum(1 for f in message.fields if f.is_optional)
-    num_optional_bytes = (num_optional_fields + 7) // 8
+type Serializer = Callable[[dataclass.DataclassLike], bytes]
+type Sizer = Callable[[dataclass.DataclassLike], int]
+type SerializerInto = Callable[
+    [dataclass.DataclassLike, bytearray | memoryview, int], int
+]
 
-    def serializer(instance: dataclass.DataclassLike) -> bytes:
-        buffer = bytes()
 
+class Deserializer[T: dataclass.DataclassLike](Protocol):
+    """Decodes a message at `offset` in `buffer`, returning it and the new offset.
+
+    `bytes` fields are slices of `buffer`; pass a `memoryview` to get them
+    without copying.
+    """
+
+    def __call__(
+        self, buffer: bytes | memoryview, offset: int = 0, /
+    ) -> tuple[T, int]: ...
+
+
+# Compiled per-field decoders return the new offset after storing the field
+# into its slot of `values`
+type _Decoder = Callable[[bytes | memoryview, int, int, list[Any]], int]
+
+# Skippers return the offset just past the field or message at `offset`
+type _Skipper = Callable[[bytes | memoryview, int], int]
+
+# Indexers return a message's optional fields bitfield, the offset of each of
+# its fields, and the offset just past it
+type _Indexer = Callable[[bytes | memoryview, int], tuple[int, list[int], int]]
+
+_LENGTH = struct.Struct('<H')
+
+
+class LazyMessage[T: dataclass.DataclassLike]:
+    """A view of an encoded message that decodes each field on first access.
+
+    Views are made by a lazy deserializer, which records where each field
+    starts in one pass over the length prefixes. A view's class has a slot per
+    field, so a decoded value is cached there and later reads cost nothing.
+    `materialize` decodes the whole message.
+    """
+
+    __slots__ = ('_buffer', '_offsets', '_bitfield')
+
+    # Set on each message's subclass: the class to materialize into, and each
+    # field's slot in `_offsets` and decoder
+    _clz: Type[T]
+    _decoders: dict[str, tuple[int, _Decoder]]
+
+    def __init__(
+        self, buffer: bytes | memoryview, offsets: list[int], bitfield: int
+    ) -> None:
+        self._buffer = buffer
+        self._offsets = offsets
+        self._bitfield = bitfield
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the field's slot is still empty
+        try:
+            index, decode = self._decoders[name]
+        except KeyError:
+            raise AttributeError(
+                f'{type(self).__name__!r} object has no attribute {name!r}'
+            ) from None
+        values = [None]
+        decode(self._buffer, self._offsets[index], self._bitfield, values)
+        setattr(self, name, values[0])
+        return values[0]
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._decoders)
+        return f'{type(self).__name__}({fields})'
+
+
+class LazyDeserializer[T: dataclass.DataclassLike](Protocol):
+    """Indexes a message at `offset` in `buffer`, returning a view and new offset."""
+
+    def __call__(
+        self, buffer: bytes | memoryview, offset: int = 0, /
+    ) -> tuple[LazyMessage[T], int]: ...
+
+
+def _as_array(value: Any, dtype: str) -> np.ndarray:
+    """Get a numeric list field's value as a contiguous array.
+
+    Bytes-like values are taken as the field's raw little-endian items;
+    anything else (e.g. a list or another array) is converted to `dtype`.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype)
+    return np.ascontiguousarray(value, dtype)
+
+
+def _pack_varint_into(buffer: bytearray | memoryview, offset: int, value: int) -> int:
+    """Write a non-negative value as a LEB128 varint, returning the new offset."""
+    while value > 0x7F:
+        buffer[offset] = value & 0x7F | 0x80
+        value >>= 7
+        offset += 1
+    buffer[offset] = value
+    return offset + 1
+
+
+def _unpack_varint(buffer: bytes | memoryview, offset: int) -> tuple[int, int]:
+    """Read a LEB128 varint, returning its value and the new offset."""
+    value = shift = 0
+    while buffer[offset] & 0x80:
+        value |= (buffer[offset] & 0x7F) << shift
+        offset += 1
+        shift += 7
+    return value | buffer[offset] << shift, offset + 1
+
+
+def _skip_varint(buffer: bytes | memoryview, offset: int) -> int:
+    """Get the offset just past the LEB128 varint at `offset`."""
+    while buffer[offset] & 0x80:
+        offset += 1
+    return offset + 1
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed (up to 64-bit) value to an unsigned one, small to small."""
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    """Undo `_zigzag`."""
+    return (value >> 1) ^ -(value & 1)
+
+
+@dataclasses.dataclass
+class CodecCache:
+    """Compiled serializers and deserializers for the messages in a registry.
+
+    Each codec is built once, the first time it's requested, and reused by
+    every message that nests it.
+    """
+
+    message_registry: dict[tuple[str, str], schema_bh.Message]
+    # Pack runs of consecutive fixed-size fields with a single `struct.Struct`
+    fuse: bool = True
+    # Generate and compile straight-line Python source for each codec, like
+    # `py_generator` does, instead of chaining per-field closures
+    jit: bool = False
+    # Decode numeric list fields to `np.ndarray` views of the buffer, and encode
+    # them from arrays or bytes-like objects without boxing each item
+    numpy: bool = False
+    serializers: dict[tuple[str, str], Serializer] = dataclasses.field(
+        default_factory=dict
+    )
+    sizers: dict[tuple[str, str], Sizer] = dataclasses.field(default_factory=dict)
+    serializers_into: dict[tuple[str, str], SerializerInto] = dataclasses.field(
+        default_factory=dict
+    )
+    deserializers: dict[tuple[str, str, Type], Deserializer] = dataclasses.field(
+        default_factory=dict
+    )
+    batch_dtypes: dict[tuple[str, str], np.dtype] = dataclasses.field(
+        default_factory=dict
+    )
+    skippers: dict[tuple[str, str], int | _Skipper] = dataclasses.field(
+        default_factory=dict
+    )
+    lazy_deserializers: dict[tuple[str, str, Type], LazyDeserializer] = (
+        dataclasses.field(default_factory=dict)
+    )
+
+    def serializer(self, name: schema_bh.Name) -> Serializer:
+        """Get the serializer for a message, compiling it if necessary."""
+        key = (name.namespace, name.name)
+        if (serializer := self.serializers.get(key)) is None:
+            serializer = _wrap_serializer(
+                self.message_registry[key], self.sizer(name), self.serializer_into(name)
+            )
+            self.serializers[key] = serializer
+        return serializer
+
+    def sizer(self, name: schema_bh.Name) -> Sizer:
+        """Get the serialized size function for a message, compiling it if necessary."""
+        key = (name.namespace, name.name)
+        if (sizer := self.sizers.get(key)) is None:
+            sizer = _compile_sizer(self.message_registry[key], self)
+            self.sizers[key] = sizer
+        return sizer
+
+    def serializer_into(self, name: schema_bh.Name) -> SerializerInto:
+        """Get the in-place serializer for a message, compiling it if necessary."""
+        key = (name.namespace, name.name)
+        if (serializer_into := self.serializers_into.get(key)) is None:
+            serializer_into = _compile_serializer_into(self.message_registry[key], self)
+            self.serializers_into[key] = serializer_into
+        return serializer_into
+
+    def deserializer[T: dataclass.DataclassLike](
+        self, name: schema_bh.Name, clz: Type[T]
+    ) -> Deserializer[T]:
+        """Get the deserializer for a message, compiling it if necessary."""
+        key = (name.namespace, name.name, clz)
+        if (deserializer := self.deserializers.get(key)) is None:
+            deserializer = _compile_deserializer(
+                self.message_registry[key[:2]], self, clz
+            )
+            self.deserializers[key] = deserializer
+        return deserializer
+
+    def batch_dtype(self, name: schema_bh.Name) -> np.dtype:
+        """Get the batch dtype for a message, building it if necessary."""
+        key = (name.namespace, name.name)
+        if (dtype := self.batch_dtypes.get(key)) is None:
+            dtype = _compile_batch_dtype(self.message_registry[key], self)
+            self.batch_dtypes[key] = dtype
+        return dtype
+
+    def skipper(self, name: schema_bh.Name) -> int | _Skipper:
+        """Get a message's constant encoded size, or a function skipping past it."""
+        key = (name.namespace, name.name)
+        if (skipper := self.skippers.get(key)) is None:
+            skipper = _compile_skipper(self.message_registry[key], self)
+            self.skippers[key] = skipper
+        return skipper
+
+    def lazy_deserializer[T: dataclass.DataclassLike](
+        self, name: schema_bh.Name, clz: Type[T]
+    ) -> LazyDeserializer[T]:
+        """Get the lazy deserializer for a message, compiling it if necessary."""
+        key = (name.namespace, name.name, clz)
+        if (deserializer := self.lazy_deserializers.get(key)) is None:
+            deserializer = _compile_lazy_deserializer(
+                self.message_registry[key[:2]], self, clz
+            )
+            self.lazy_deserializers[key] = deserializer
+        return deserializer
+
+
+def _field_clz(clz: Type[dataclass.DataclassLike], field: schema_bh.Field) -> Type:
+    """Get the class a message or enum field (or its list items) decodes into."""
+    field_type = clz.__dataclass_fields__[field.name].type
+    if field.pri_type is schema_bh.FieldType.LIST:
+        field_type = field_type.__args__[0]
+    return split_optional(field_type)[0]
+
+
+def _packed_items(field: schema_bh.Field, cache: CodecCache) -> Callable[[Any], Any]:
+    """Compile a function getting the varints of a packed integer list's value."""
+    dtype = f'<{parser.FORMAT_MAP[field.sub_type]}'  # type: ignore
+    signed = field.sub_type in parser.SIGNED_TYPES
+    numpy = cache.numpy
+
+    def items(value: Any) -> Any:
+        if numpy:
+            value = _as_array(value, dtype).tolist()
+        return [_zigzag(item) for item in value] if signed else value
+
+    return items
+
+
+def _packed_size(field: schema_bh.Field, cache: CodecCache) -> Callable[[Any], int]:
+    """Compile a function of a packed field's value for its size."""
+    field_type = field.sub_type or field.pri_type
+    varint_size = parser.varint_size
+
+    size: Callable[[Any], int]
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if field_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            is_string = field_type is schema_bh.FieldType.STRING
+
+            def size(value: Any) -> int:
+                if is_string:
+                    value = [item.encode() for item in value]
+                return varint_size(len(value)) + sum(
+                    [varint_size(len(item)) + len(item) for item in value]
+                )
+        elif field_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_sizer = cache.sizer(field.obj_name)
+
+            def size(value: Any) -> int:
+                return varint_size(len(value)) + sum(map(item_sizer, value))
+        elif field_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES):
+            items = _packed_items(field, cache)
+
+            def size(value: Any) -> int:
+                value = items(value)
+                return varint_size(len(value)) + sum(map(varint_size, value))
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = f'<{parser.FORMAT_MAP[field_type]}'
+
+            def size(value: Any) -> int:
+                array = _as_array(value, dtype)
+                return varint_size(len(array)) + array.nbytes
+        else:
+            item_size = parser.SIZE_MAP[field_type]
+
+            def size(value: Any) -> int:
+                return varint_size(len(value)) + len(value) * item_size
+    elif field.pri_type is schema_bh.FieldType.STRING:
+
+        def size(value: Any) -> int:
+            length = len(value.encode())
+            return varint_size(length) + length
+    elif field.pri_type is schema_bh.FieldType.BYTES:
+
+        def size(value: Any) -> int:
+            return varint_size(len(value)) + len(value)
+    elif field.pri_type in parser.SIGNED_TYPES:
+
+        def size(value: Any) -> int:
+            return varint_size(_zigzag(value))
+    else:
+        size = varint_size
+
+    return size
+
+
+def _packed_writer(
+    field: schema_bh.Field, cache: CodecCache
+) -> Callable[[Any, bytearray | memoryview, int], int]:
+    """Compile a function writing a packed field's value at an offset."""
+    field_type = field.sub_type or field.pri_type
+
+    write: Callable[[Any, bytearray | memoryview, int], int]
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if field_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            is_string = field_type is schema_bh.FieldType.STRING
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                offset = _pack_varint_into(buffer, offset, len(value))
+                for item in value:
+                    if is_string:
+                        item = item.encode()
+                    offset = _pack_varint_into(buffer, offset, len(item))
+                    buffer[offset : offset + len(item)] = item
+                    offset += len(item)
+                return offset
+        elif field_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_serializer_into = cache.serializer_into(field.obj_name)
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                offset = _pack_varint_into(buffer, offset, len(value))
+                for item in value:
+                    offset = item_serializer_into(item, buffer, offset)
+                return offset
+        elif field_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES):
+            items = _packed_items(field, cache)
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                value = items(value)
+                offset = _pack_varint_into(buffer, offset, len(value))
+                for item in value:
+                    offset = _pack_varint_into(buffer, offset, item)
+                return offset
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = f'<{parser.FORMAT_MAP[field_type]}'
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                array = _as_array(value, dtype)
+                offset = _pack_varint_into(buffer, offset, len(array))
+                buffer[offset : offset + array.nbytes] = memoryview(array).cast('B')
+                return offset + array.nbytes
+        else:
+            field_format = parser.FORMAT_MAP[field_type]
+            item_size = struct.calcsize(field_format)
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                offset = _pack_varint_into(buffer, offset, len(value))
+                struct.pack_into(f'<{len(value)}{field_format}', buffer, offset, *value)
+                return offset + len(value) * item_size
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        is_string = field.pri_type is schema_bh.FieldType.STRING
+
+        def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+            if is_string:
+                value = value.encode()
+            offset = _pack_varint_into(buffer, offset, len(value))
+            buffer[offset : offset + len(value)] = value
+            return offset + len(value)
+    elif field.pri_type in parser.SIGNED_TYPES:
+
+        def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+            return _pack_varint_into(buffer, offset, _zigzag(value))
+    else:
+
+        def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+            return _pack_varint_into(buffer, offset, value)
+
+    return write
+
+
+def _packed_decode(
+    field: schema_bh.Field, cache: CodecCache, clz: Type[dataclass.DataclassLike]
+) -> Callable[[bytes | memoryview, int], tuple[Any, int]]:
+    """Compile a function decoding a packed field's value, and the new offset."""
+    field_type = field.sub_type or field.pri_type
+
+    decode: Callable[[bytes | memoryview, int], tuple[Any, int]]
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if field_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            is_string = field_type is schema_bh.FieldType.STRING
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size, offset = _unpack_varint(buffer, offset)
+                items = []
+                for _ in range(size):
+                    item_size, offset = _unpack_varint(buffer, offset)
+                    item = buffer[offset : offset + item_size]
+                    offset += item_size
+                    items.append(str(item, 'utf-8') if is_string else item)
+                return items, offset
+        elif field_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_deserializer = cache.deserializer(
+                field.obj_name, _field_clz(clz, field)
+            )
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size, offset = _unpack_varint(buffer, offset)
+                items = []
+                for _ in range(size):
+                    item, offset = item_deserializer(buffer, offset)
+                    items.append(item)
+                return items, offset
+        elif field_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES):
+            signed = field_type in parser.SIGNED_TYPES
+            dtype = (
+                np.dtype(f'<{parser.FORMAT_MAP[field_type]}') if cache.numpy else None
+            )
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size, offset = _unpack_varint(buffer, offset)
+                items = []
+                for _ in range(size):
+                    item, offset = _unpack_varint(buffer, offset)
+                    items.append(item)
+                if signed:
+                    items = [_unzigzag(item) for item in items]
+                return (items if dtype is None else np.array(items, dtype)), offset
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = np.dtype(f'<{parser.FORMAT_MAP[field_type]}')
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size, offset = _unpack_varint(buffer, offset)
+                items = np.frombuffer(buffer, dtype, size, offset)
+                return items, offset + items.nbytes
+        else:
+            field_format = parser.FORMAT_MAP[field_type]
+            item_size = struct.calcsize(field_format)
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size, offset = _unpack_varint(buffer, offset)
+                items = list(
+                    struct.unpack_from(f'<{size}{field_format}', buffer, offset)
+                )
+                return items, offset + size * item_size
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        is_string = field.pri_type is schema_bh.FieldType.STRING
+
+        def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+            size, offset = _unpack_varint(buffer, offset)
+            value = buffer[offset : offset + size]
+            return (str(value, 'utf-8') if is_string else value), offset + size
+    elif field.pri_type in parser.SIGNED_TYPES:
+
+        def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+            value, offset = _unpack_varint(buffer, offset)
+            return _unzigzag(value), offset
+    else:
+        decode = _unpack_varint
+
+    return decode
+
+
+def _packed_skipper(field: schema_bh.Field, cache: CodecCache) -> _Skipper:
+    """Compile a skipper for a present packed field."""
+    field_type = field.sub_type or field.pri_type
+
+    if field.pri_type is not schema_bh.FieldType.LIST:
+        if field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+
+            def skip(buffer: bytes | memoryview, offset: int) -> int:
+                size, offset = _unpack_varint(buffer, offset)
+                return offset + size
+
+            return skip
+        return _skip_varint
+
+    if field_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+
+        def skip(buffer: bytes | memoryview, offset: int) -> int:
+            size, offset = _unpack_varint(buffer, offset)
+            for _ in range(size):
+                item_size, offset = _unpack_varint(buffer, offset)
+                offset += item_size
+            return offset
+
+        return skip
+
+    # Items have either a constant size or a skipper of their own
+    item_skipper: int | _Skipper
+    if field_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        item_skipper = cache.skipper(field.obj_name)
+    elif field_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES):
+        item_skipper = _skip_varint
+    else:
+        item_skipper = parser.SIZE_MAP[field_type]
+
+    if isinstance(item_skipper, int):
+        item_size = item_skipper
+
+        def skip(buffer: bytes | memoryview, offset: int) -> int:
+            size, offset = _unpack_varint(buffer, offset)
+            return offset + size * item_size
+
+        return skip
+
+    skip_item = item_skipper
+
+    def skip(buffer: bytes | memoryview, offset: int) -> int:
+        size, offset = _unpack_varint(buffer, offset)
+        for _ in range(size):
+            offset = skip_item(buffer, offset)
+        return offset
+
+    return skip
+
+
+def _rle_data(field: schema_bh.Field, cache: CodecCache) -> Callable[[Any], Any]:
+    """Compile a function getting the bytes of an `rle` field's value."""
+    numpy = cache.numpy
+    is_list = field.pri_type is schema_bh.FieldType.LIST
+
+    def data(value: Any) -> Any:
+        if numpy and is_list:
+            return _as_array(value, '<B')
+        return bytes(value) if is_list else value
+
+    return data
+
+
+def _rle_size(field: schema_bh.Field, cache: CodecCache) -> Callable[[Any], int]:
+    """Compile a function of an `rle` field's value for its size."""
+    data = _rle_data(field, cache)
+    length_size = parser.varint_size if field.is_packed else lambda _: 2
+
+    def size(value: Any) -> int:
+        encoded_size = rle.encoded_size(data(value))
+        return length_size(encoded_size) + encoded_size
+
+    return size
+
+
+def _rle_writer(
+    field: schema_bh.Field, cache: CodecCache
+) -> Callable[[Any, bytearray | memoryview, int], int]:
+    """Compile a function writing an `rle` field's value at an offset."""
+    data = _rle_data(field, cache)
+    packed = field.is_packed
+    pack_length = _LENGTH.pack_into
+
+    def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+        encoded = rle.encode(data(value))
+        if packed:
+            offset = _pack_varint_into(buffer, offset, len(encoded))
+        else:
+            pack_length(buffer, offset, len(encoded))
+            offset += 2
+        buffer[offset : offset + len(encoded)] = encoded
+        return offset + len(encoded)
+
+    return write
+
+
+def _rle_decode(
+    field: schema_bh.Field, cache: CodecCache
+) -> Callable[[bytes | memoryview, int], tuple[Any, int]]:
+    """Compile a function decoding an `rle` field's value, and the new offset."""
+    packed = field.is_packed
+    unpack_length = _LENGTH.unpack_from
+    convert: Callable[[bytearray], Any] = bytes
+    if field.pri_type is schema_bh.FieldType.LIST:
+        convert = (lambda b: np.frombuffer(b, np.uint8)) if cache.numpy else list
+
+    def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+        if packed:
+            size, offset = _unpack_varint(buffer, offset)
+        else:
+            size = unpack_length(buffer, offset)[0]
+            offset += 2
+        return convert(rle.decode(buffer[offset : offset + size])), offset + size
+
+    return decode
+
+
+def _field_size(field: schema_bh.Field, cache: CodecCache) -> int | Sizer:
+    """Get a field's serialized size, or compile a function of the instance for it.
+
+    Fixed-size, non-optional fields return their size as a constant.
+    """
+    get = operator.attrgetter(field.name)
+    item_size = parser.SIZE_MAP[field.sub_type or field.pri_type]
+
+    size: Callable[[Any], int]
+    if field.is_rle:
+        size = _rle_size(field, cache)
+    elif field.is_packed:
+        size = _packed_size(field, cache)
+    elif field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type is schema_bh.FieldType.STRING:
+
+            def size(value: Any) -> int:
+                return 2 + 2 * len(value) + sum([len(item.encode()) for item in value])
+        elif field.sub_type is schema_bh.FieldType.BYTES:
+
+            def size(value: Any) -> int:
+                return 2 + 2 * len(value) + sum(map(len, value))
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_sizer = cache.sizer(field.obj_name)
+
+            def size(value: Any) -> int:
+                return 2 + sum(map(item_sizer, value))
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = f'<{parser.FORMAT_MAP[field.sub_type]}'
+
+            def size(value: Any) -> int:
+                return 2 + _as_array(value, dtype).nbytes
+        else:
+
+            def size(value: Any) -> int:
+                return 2 + len(value) * item_size
+    elif field.pri_type is schema_bh.FieldType.STRING:
+
+        def size(value: Any) -> int:
+            return 2 + len(value.encode())
+    elif field.pri_type is schema_bh.FieldType.BYTES:
+
+        def size(value: Any) -> int:
+            return 2 + len(value)
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        size = cache.sizer(field.obj_name)
+    elif not field.is_optional:
+        return item_size
+    else:
+
+        def size(value: Any) -> int:
+            return item_size
+
+    if field.is_optional:
+
+        def size_optional(instance: dataclass.DataclassLike) -> int:
+            value = get(instance)
+            return 0 if value is None else size(value)
+
+        return size_optional
+
+    return lambda instance: size(get(instance))
+
+
+def _field_serializer_into(field: schema_bh.Field, cache: CodecCache) -> SerializerInto:
+    """Compile the in-place serializer for a single field."""
+    get = operator.attrgetter(field.name)
+    field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
+    pack_length = _LENGTH.pack_into
+
+    write: Callable[[Any, bytearray | memoryview, int], int]
+    if field.is_rle:
+        write = _rle_writer(field, cache)
+    elif field.is_packed:
+        write = _packed_writer(field, cache)
+    elif field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            is_string = field.sub_type is schema_bh.FieldType.STRING
+            pack_length_bytes = _LENGTH.pack
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                pack_length(buffer, offset, len(value))
+                offset += 2
+                if is_string:
+                    value = [item.encode() for item in value]
+                # Joining the items is cheaper than writing each in place
+                data = b''.join([pack_length_bytes(len(item)) + item for item in value])
+                buffer[offset : offset + len(data)] = data
+                return offset + len(data)
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_serializer_into = cache.serializer_into(field.obj_name)
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                pack_length(buffer, offset, len(value))
+                offset += 2
+                for item in value:
+                    offset = item_serializer_into(item, buffer, offset)
+                return offset
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = f'<{field_format}'
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                array = _as_array(value, dtype)
+                pack_length(buffer, offset, len(array))
+                offset += 2
+                buffer[offset : offset + array.nbytes] = memoryview(array).cast('B')
+                return offset + array.nbytes
+        else:
+            item_size = struct.calcsize(field_format)
+
+            def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+                pack_length(buffer, offset, len(value))
+                struct.pack_into(
+                    f'<{len(value)}{field_format}', buffer, offset + 2, *value
+                )
+                return offset + 2 + len(value) * item_size
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        is_string = field.pri_type is schema_bh.FieldType.STRING
+
+        def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+            if is_string:
+                value = value.encode()
+            pack_length(buffer, offset, len(value))
+            offset += 2
+            buffer[offset : offset + len(value)] = value
+            return offset + len(value)
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        write = cache.serializer_into(field.obj_name)
+    else:
+        scalar = struct.Struct(f'<{field_format}')
+        is_enum = field.pri_type is schema_bh.FieldType.ENUM
+
+        def write(value: Any, buffer: bytearray | memoryview, offset: int) -> int:
+            scalar.pack_into(buffer, offset, value.value if is_enum else value)
+            return offset + scalar.size
+
+    if field.is_optional:
+
+        def write_optional(
+            instance: dataclass.DataclassLike,
+            buffer: bytearray | memoryview,
+            offset: int,
+        ) -> int:
+            value = get(instance)
+            return offset if value is None else write(value, buffer, offset)
+
+        return write_optional
+
+    return lambda instance, buffer, offset: write(get(instance), buffer, offset)
+
+
+def _group_fields(
+    message: schema_bh.Message, fuse: bool
+) -> list[list[schema_bh.Field]]:
+    """Group the fields into runs of fixed-size fields and lone other fields."""
+    groups: list[list[schema_bh.Field]] = []
+    for field in message.fields:
+        if (
+            fuse
+            and groups
+            and parser.is_field_fixed(field)
+            and parser.is_field_fixed(groups[-1][-1])
+        ):
+            groups[-1].append(field)
+        else:
+            groups.append([field])
+    return groups
+
+
+def _run_layout(fields: list[schema_bh.Field]) -> struct.Struct:
+    """Get the fused layout for a run of fixed-size fields."""
+    return struct.Struct(
+        '<' + ''.join(parser.FORMAT_MAP[field.pri_type] for field in fields)
+    )
+
+
+def _run_serializer_into(fields: list[schema_bh.Field]) -> SerializerInto:
+    """Compile the in-place serializer for a run of fixed-size fields."""
+    layout = _run_layout(fields)
+    pack_into = layout.pack_into
+    get = operator.attrgetter(*(field.name for field in fields))
+    enum_idxs = [
+        i
+        for i, field in enumerate(fields)
+        if field.pri_type is schema_bh.FieldType.ENUM
+    ]
+
+    def write(
+        instance: dataclass.DataclassLike, buffer: bytearray | memoryview, offset: int
+    ) -> int:
+        values = get(instance)
+        if enum_idxs:
+            values = list(values)
+            for i in enum_idxs:
+                values[i] = values[i].value
+        pack_into(buffer, offset, *values)
+        return offset + layout.size
+
+    return write
+
+
+def _compile_sizer(message: schema_bh.Message, cache: CodecCache) -> Sizer:
+    """Compile a serialized size function from a message schema."""
+    if cache.jit:
+        return _jit_sizer(message, cache)
+
+    num_optional_fields = sum(field.is_optional for field in message.fields)
+    constant = (num_optional_fields + 7) // 8
+    sizers = []
+    for field in message.fields:
+        size = _field_size(field, cache)
+        if isinstance(size, int):
+            constant += size
+        else:
+            sizers.append(size)
+
+    if not sizers:
+        return lambda instance: constant
+
+    def sizer(instance: dataclass.DataclassLike) -> int:
+        return constant + sum(size(instance) for size in sizers)
+
+    return sizer
+
+
+def _compile_serializer_into(
+    message: schema_bh.Message, cache: CodecCache
+) -> SerializerInto:
+    """Compile an in-place serializer from a message schema."""
+    if cache.jit:
+        return _jit_serializer_into(message, cache)
+
+    optional_getters = [
+        operator.attrgetter(f.name) for f in message.fields if f.is_optional
+    ]
+    num_optional_bytes = (len(optional_getters) + 7) // 8
+    writers = [
+        _run_serializer_into(group)
+        if len(group) > 1
+        else _field_serializer_into(group[0], cache)
+        for group in _group_fields(message, cache.fuse)
+    ]
+
+    def serializer_into(
+        instance: dataclass.DataclassLike, buffer: bytearray | memoryview, offset: int
+    ) -> int:
         # Handle optional fields bitfield
-        if num_optional_fields > 0:
+        if optional_getters:
             bitfield = 0
-            optional_idx = 0
-            for field in message.fields:
-                if field.is_optional:
-                    value = getattr(instance, field.name)
-                    if value is not None:
-                        bitfield |= 1 << optional_idx
-                    optional_idx += 1
-            buffer += bitfield.to_bytes(length=num_optional_bytes, byteorder='little')
-
-        for field in message.fields:
-            value = getattr(instance, field.name)
-            field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
-
-            if field.is_optional and value is None:
-                continue
+            for optional_idx, get in enumerate(optional_getters):
+                if get(instance) is not None:
+                    bitfield |= 1 << optional_idx
+            buffer[offset : offset + num_optional_bytes] = bitfield.to_bytes(
+                length=num_optional_bytes, byteorder='little'
+            )
+            offset += num_optional_bytes
 
-            if parser.is_field_iterable(field):
-                # Write the size of the value as a uint16_t
-                buffer += struct.pack('<H', len(value))
-
-                if field.pri_type is schema_bh.FieldType.LIST:
-                    if field.sub_type in (
-                        schema_bh.FieldType.STRING,
-                        schema_bh.FieldType.BYTES,
-                    ):
-                        for item in value:
-                            buffer += struct.pack('<H', len(item))
-                            if field.sub_type is schema_bh.FieldType.STRING:
-                                item = item.encode()
-                            buffer += item
-                    elif field.sub_type is schema_bh.FieldType.MESSAGE:
-                        assert field.obj_name is not None
-                        nested_message = message_registry[
-                            (field.obj_name.namespace, field.obj_name.name)
-                        ]
-                        # Turtles all the way down
-                        for item in value:
-                            buffer += generate_serializer(
-                                nested_message, message_registry
-                            )(item)
-                    else:
-                        buffer += struct.pack(f'<{len(value)}{field_format}', *value)
-                else:
-                    if field.pri_type is schema_bh.FieldType.STRING:
-                        value = value.encode()
-                    buffer += value
-            elif field.pri_type is schema_bh.FieldType.MESSAGE:
-                assert field.obj_name is not None
-                nested_message = message_registry[
-                    (field.obj_name.namespace, field.obj_name.name)
-                ]
-                # Turtles all the way down
-                buffer += generate_serializer(nested_message, message_registry)(value)
-            elif field.pri_type is schema_bh.FieldType.ENUM:
-                buffer += struct.pack(f'<{field_format}', value.value)
-            else:
-                buffer += struct.pack(f'<{field_format}', value)
+        for write in writers:
+            offset = write(instance, buffer, offset)
+        return offset
 
-        return buffer
+    return serializer_into
+
+
+def _wrap_serializer(
+    message: schema_bh.Message, sizer: Sizer, serializer_into: SerializerInto
+) -> Serializer:
+    """Make a serializer that writes a message into a buffer of its exact size."""
+    if all(parser.is_field_fixed(field) for field in message.fields):
+        # Skip sizing messages that are always the same size
+        size = sum(parser.SIZE_MAP[field.pri_type] for field in message.fields)
+
+        def serialize_fixed(instance: dataclass.DataclassLike) -> bytes:
+            buffer = bytearray(size)
+            serializer_into(instance, buffer, 0)
+            return bytes(buffer)
+
+        return serialize_fixed
+
+    def serializer(instance: dataclass.DataclassLike) -> bytes:
+        buffer = bytearray(sizer(instance))
+        serializer_into(instance, buffer, 0)
+        return bytes(buffer)
 
     return serializer
 
 
-def generate_deserializer[T: dataclass.DataclassLike](
-    message: schema_bh.Message,
-    message_registry: dict[tuple[str, str], schema_bh.Message],
-    clz: Type[T],
-) -> Callable[[bytes], tuple[T, int]]:
-    """Generic deserializer generator for a message schema."""
-    num_optional_fields = sum(1 for f in message.fields if f.is_optional)
-    num_optional_bytes = (num_optional_fields + 7) // 8
+def _field_decoder(
+    field: schema_bh.Field,
+    cache: CodecCache,
+    clz: Type[dataclass.DataclassLike],
+    index: int,
+    optional_idx: int | None,
+) -> _Decoder:
+    """Compile the decoder for the field in slot `index` of a message."""
+    field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
 
-    def deserializer(buffer: bytes) -> tuple[T, int]:
-        values = {}
+    # Decodes a present value, returning it and the new offset
+    decode: Callable[[bytes | memoryview, int], tuple[Any, int]]
+    if field.is_rle:
+        decode = _rle_decode(field, cache)
+    elif field.is_packed:
+        decode = _packed_decode(field, cache, clz)
+    elif field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            is_string = field.sub_type is schema_bh.FieldType.STRING
 
-        # Handle optional fields bitfield
-        optional_bitfield = 0
-        if num_optional_fields > 0:
-            optional_bitfield = int.from_bytes(
-                buffer[0:num_optional_bytes], byteorder='little'
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size = _LENGTH.unpack_from(buffer, offset)[0]
+                offset += 2
+                items = []
+                for _ in range(size):
+                    item_size = _LENGTH.unpack_from(buffer, offset)[0]
+                    offset += 2
+                    item = buffer[offset : offset + item_size]
+                    offset += item_size
+                    items.append(str(item, 'utf-8') if is_string else item)
+                return items, offset
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_deserializer = cache.deserializer(
+                field.obj_name, _field_clz(clz, field)
             )
-            offset = num_optional_bytes
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size = _LENGTH.unpack_from(buffer, offset)[0]
+                offset += 2
+                items = []
+                for _ in range(size):
+                    # Turtles all the way up
+                    item, offset = item_deserializer(buffer, offset)
+                    items.append(item)
+                return items, offset
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = np.dtype(f'<{field_format}')
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size = _LENGTH.unpack_from(buffer, offset)[0]
+                offset += 2
+                items = np.frombuffer(buffer, dtype, size, offset)
+                return items, offset + items.nbytes
         else:
-            offset = 0
+            item_size = struct.calcsize(field_format)
+
+            def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+                size = _LENGTH.unpack_from(buffer, offset)[0]
+                offset += 2
+                items = list(
+                    struct.unpack_from(f'<{size}{field_format}', buffer, offset)
+                )
+                return items, offset + size * item_size
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        is_string = field.pri_type is schema_bh.FieldType.STRING
+
+        def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+            size = _LENGTH.unpack_from(buffer, offset)[0]
+            offset += 2
+            value = buffer[offset : offset + size]
+            return (str(value, 'utf-8') if is_string else value), offset + size
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        nested_deserializer = cache.deserializer(field.obj_name, _field_clz(clz, field))
+
+        def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+            # Turtles all the way up
+            return nested_deserializer(buffer, offset)
+    else:
+        scalar = struct.Struct(f'<{field_format}')
+        convert: Callable[[Any], Any] | None = None
+        if field.pri_type is schema_bh.FieldType.BOOL:
+            convert = bool
+        elif field.pri_type is schema_bh.FieldType.ENUM:
+            convert = _field_clz(clz, field)
+
+        def decode(buffer: bytes | memoryview, offset: int) -> tuple[Any, int]:
+            value = scalar.unpack_from(buffer, offset)[0]
+            if convert is not None:
+                value = convert(value)
+            return value, offset + scalar.size
+
+    if optional_idx is not None:
+        mask = 1 << optional_idx
+
+        def decode_optional(
+            buffer: bytes | memoryview, offset: int, bitfield: int, values: list[Any]
+        ) -> int:
+            if not bitfield & mask:
+                values[index] = None
+                return offset
+            values[index], offset = decode(buffer, offset)
+            return offset
+
+        return decode_optional
+
+    def decode_required(
+        buffer: bytes | memoryview, offset: int, bitfield: int, values: list[Any]
+    ) -> int:
+        values[index], offset = decode(buffer, offset)
+        return offset
+
+    return decode_required
+
+
+def _run_decoder(
+    fields: list[schema_bh.Field], clz: Type[dataclass.DataclassLike], index: int
+) -> _Decoder:
+    """Compile the decoder for a run of fixed-size fields from slot `index`."""
+    layout = _run_layout(fields)
+    stop = index + len(fields)
+    converts: list[tuple[int, Callable[[Any], Any]]] = []
+    for i, field in enumerate(fields, start=index):
+        if field.pri_type is schema_bh.FieldType.BOOL:
+            converts.append((i, bool))
+        elif field.pri_type is schema_bh.FieldType.ENUM:
+            converts.append((i, _field_clz(clz, field)))
 
-        optional_idx = 0
-        for field in message.fields:
-            field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
+    def decode(
+        buffer: bytes | memoryview, offset: int, bitfield: int, values: list[Any]
+    ) -> int:
+        values[index:stop] = layout.unpack_from(buffer, offset)
+        for i, convert in converts:
+            values[i] = convert(values[i])
+        return offset + layout.size
 
-            if field.is_optional:
-                if not optional_bitfield & (1 << optional_idx):
-                    values[field.name] = None
-                    continue
-                optional_idx += 1
+    return decode
+
+
+def _compile_deserializer[T: dataclass.DataclassLike](
+    message: schema_bh.Message, cache: CodecCache, clz: Type[T]
+) -> Deserializer[T]:
+    """Compile a deserializer from a message schema."""
+    if cache.jit:
+        return _jit_deserializer(message, cache, clz)
+
+    decoders = []
+    index = 0
+    optional_idx = 0
+    for group in _group_fields(message, cache.fuse):
+        if len(group) > 1:
+            # Runs never contain optional fields
+            decoders.append(_run_decoder(group, clz, index))
+            index += len(group)
+            continue
+        field = group[0]
+        decoders.append(
+            _field_decoder(
+                field, cache, clz, index, optional_idx if field.is_optional else None
+            )
+        )
+        index += 1
+        optional_idx += field.is_optional
+    num_fields = index
+    num_optional_bytes = (optional_idx + 7) // 8
+
+    # Construct positionally when the class's fields line up with the schema's
+    names = [field.name for field in message.fields]
+    positional = [f.name for f in dataclasses.fields(clz)] == names
+
+    def deserializer(buffer: bytes | memoryview, offset: int = 0) -> tuple[T, int]:
+        values: list[Any] = [None] * num_fields
+
+        # Handle optional fields bitfield
+        bitfield = int.from_bytes(
+            buffer[offset : offset + num_optional_bytes], byteorder='little'
+        )
+        offset += num_optional_bytes
+
+        for decode in decoders:
+            offset = decode(buffer, offset, bitfield, values)
+
+        if positional:
+            return clz(*values), offset
+        return clz(**dict(zip(names, values))), offset
+
+    return deserializer
 
-            if parser.is_field_iterable(field):
-                size = struct.unpack_from('<H', buffer, offset)[0]
+
+def _field_skipper(field: schema_bh.Field, cache: CodecCache) -> int | _Skipper:
+    """Get a present field's constant encoded size, or compile a skipper for it."""
+    # `rle` fields are skipped by their length, like any other bytes; the
+    # length is a varint if packed, even as a list
+    if field.is_rle and field.is_packed:
+
+        def skip(buffer: bytes | memoryview, offset: int) -> int:
+            size, offset = _unpack_varint(buffer, offset)
+            return offset + size
+
+        return skip
+    if field.is_packed:
+        return _packed_skipper(field, cache)
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_skipper = cache.skipper(field.obj_name)
+            if isinstance(item_skipper, int):
+                item_size = item_skipper
+            else:
+                skip_item = item_skipper
+
+                def skip(buffer: bytes | memoryview, offset: int) -> int:
+                    size = _LENGTH.unpack_from(buffer, offset)[0]
+                    offset += 2
+                    for _ in range(size):
+                        offset = skip_item(buffer, offset)
+                    return offset
+
+                return skip
+        elif field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+
+            def skip(buffer: bytes | memoryview, offset: int) -> int:
+                size = _LENGTH.unpack_from(buffer, offset)[0]
                 offset += 2
+                for _ in range(size):
+                    offset += 2 + _LENGTH.unpack_from(buffer, offset)[0]
+                return offset
 
-                if field.pri_type is schema_bh.FieldType.LIST:
-                    if field.sub_type in (
-                        schema_bh.FieldType.STRING,
-                        schema_bh.FieldType.BYTES,
-                    ):
-                        values[field.name] = []
-                        for _ in range(size):
-                            item_size = struct.unpack_from('<H', buffer, offset)[0]
-                            offset += 2
-                            item = buffer[offset : offset + item_size]
-                            offset += item_size
-                            if field.sub_type is schema_bh.FieldType.STRING:
-                                item = item.decode()
-                            values[field.name].append(item)
-                    elif field.sub_type is schema_bh.FieldType.MESSAGE:
-                        assert field.obj_name is not None
-                        nested_clz, _ = split_optional(
-                            clz.__dataclass_fields__[field.name].type.__args__[0]
-                        )
-                        nested_message = message_registry[
-                            (field.obj_name.namespace, field.obj_name.name)
-                        ]
-                        values[field.name] = []
-                        for _ in range(size):
-                            # Turtles all the way up
-                            item, item_size = generate_deserializer(
-                                nested_message, message_registry, nested_clz
-                            )(buffer[offset:])
-                            values[field.name].append(item)
-                            offset += item_size
-                    else:
-                        values[field.name] = list(
-                            struct.unpack_from(f'<{size}{field_format}', buffer, offset)
-                        )
-                        offset += size * struct.calcsize(field_format)
-                else:
-                    value = buffer[offset : offset + size]
-                    if field.pri_type is schema_bh.FieldType.STRING:
-                        value = value.decode()
-                    values[field.name] = value
-                    offset += size
-            elif field.pri_type is schema_bh.FieldType.MESSAGE:
-                assert field.obj_name is not None
-                nested_clz, _ = split_optional(
-                    clz.__dataclass_fields__[field.name].type
-                )
-                nested_message = message_registry[
-                    (field.obj_name.namespace, field.obj_name.name)
-                ]
-                # Turtles all the way up
-                values[field.name], size = generate_deserializer(
-                    nested_message, message_registry, nested_clz
-                )(buffer[offset:])
-                offset += size
-            elif field.pri_type is schema_bh.FieldType.BOOL:
-                value = struct.unpack_from(f'<{field_format}', buffer, offset)[0]
-                values[field.name] = bool(value)
-                offset += struct.calcsize(field_format)
-            elif field.pri_type is schema_bh.FieldType.ENUM:
-                enum_clz, _ = split_optional(clz.__dataclass_fields__[field.name].type)
-                value = struct.unpack_from(f'<{field_format}', buffer, offset)[0]
-                values[field.name] = enum_clz(value)
-                offset += struct.calcsize(field_format)
+            return skip
+        else:
+            assert field.sub_type is not None
+            item_size = parser.SIZE_MAP[field.sub_type]
+
+        def skip(buffer: bytes | memoryview, offset: int) -> int:
+            return offset + 2 + _LENGTH.unpack_from(buffer, offset)[0] * item_size
+
+        return skip
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+
+        def skip(buffer: bytes | memoryview, offset: int) -> int:
+            return offset + 2 + _LENGTH.unpack_from(buffer, offset)[0]
+
+        return skip
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        return cache.skipper(field.obj_name)
+    return parser.SIZE_MAP[field.pri_type]
+
+
+def _compile_indexer(message: schema_bh.Message, cache: CodecCache) -> _Indexer:
+    """Compile a function finding the offset of each of a message's fields."""
+    # Each step is a run of required constant-size fields, as (each field's
+    # start within the run, run size, None, 0), or a single other field, as
+    # (None, constant size, skipper, optional mask)
+    steps: list[tuple[tuple[int, ...] | None, int, _Skipper | None, int]] = []
+    in_run = False
+    optional_idx = 0
+    for field in message.fields:
+        skipper = _field_skipper(field, cache)
+        if isinstance(skipper, int) and not field.is_optional:
+            if cache.fuse and in_run:
+                # Extend the previous step's run
+                starts, size, _, _ = steps.pop()
+                assert starts is not None
+                steps.append(((*starts, size), size + skipper, None, 0))
             else:
-                values[field.name] = struct.unpack_from(
-                    f'<{field_format}', buffer, offset
-                )[0]
-                offset += struct.calcsize(field_format)
+                steps.append(((0,), skipper, None, 0))
+            in_run = True
+            continue
+        in_run = False
+
+        mask = 0
+        if field.is_optional:
+            mask = 1 << optional_idx
+            optional_idx += 1
+        if isinstance(skipper, int):
+            steps.append((None, skipper, None, mask))
+        else:
+            steps.append((None, 0, skipper, mask))
+    num_optional_bytes = (optional_idx + 7) // 8
+
+    def indexer(buffer: bytes | memoryview, offset: int) -> tuple[int, list[int], int]:
+        bitfield = 0
+        if num_optional_bytes:
+            bitfield = int.from_bytes(
+                buffer[offset : offset + num_optional_bytes], byteorder='little'
+            )
+            offset += num_optional_bytes
+
+        offsets: list[int] = []
+        for starts, size, skip, mask in steps:
+            if starts is not None:
+                offsets.extend([offset + start for start in starts])
+                offset += size
+                continue
+            offsets.append(offset)
+            if mask and not bitfield & mask:
+                continue
+            offset = offset + size if skip is None else skip(buffer, offset)
+        return bitfield, offsets, offset
 
-        return clz(**values), offset
+    return indexer
+
+
+def _compile_skipper(message: schema_bh.Message, cache: CodecCache) -> int | _Skipper:
+    """Get a message's constant encoded size, or compile a skipper for it."""
+    sizes = [_field_skipper(field, cache) for field in message.fields]
+    if not any(field.is_optional for field in message.fields) and all(
+        isinstance(size, int) for size in sizes
+    ):
+        return sum(sizes)  # type: ignore
+
+    indexer = _compile_indexer(message, cache)
+
+    def skipper(buffer: bytes | memoryview, offset: int) -> int:
+        return indexer(buffer, offset)[2]
+
+    return skipper
+
+
+def _compile_lazy_deserializer[T: dataclass.DataclassLike](
+    message: schema_bh.Message, cache: CodecCache, clz: Type[T]
+) -> LazyDeserializer[T]:
+    """Compile a lazy deserializer from a message schema."""
+    indexer = _compile_indexer(message, cache)
+
+    decoders: dict[str, tuple[int, _Decoder]] = {}
+    optional_idx = 0
+    for index, field in enumerate(message.fields):
+        decoder = _field_decoder(
+            field, cache, clz, 0, optional_idx if field.is_optional else None
+        )
+        decoders[field.name] = (index, decoder)
+        optional_idx += field.is_optional
+
+    view = type(
+        f'Lazy{clz.__name__}',
+        (LazyMessage,),
+        {'__slots__': tuple(decoders), '_clz': clz, '_decoders': decoders},
+    )
+
+    def deserializer(
+        buffer: bytes | memoryview, offset: int = 0
+    ) -> tuple[LazyMessage[T], int]:
+        bitfield, offsets, offset = indexer(buffer, offset)
+        return view(buffer, offsets, bitfield), offset
 
     return deserializer
+
+
+@dataclasses.dataclass
+class _Source:
+    """Python source for a JIT-compiled codec and the objects it references."""
+
+    name: str
+    lines: list[str] = dataclasses.field(default_factory=list)
+    namespace: dict[str, Any] = dataclasses.field(
+        default_factory=lambda: {
+            '_as_array': _as_array,
+            '_np': np,
+            '_struct': struct,
+            '_pack_length': _LENGTH.pack,
+            '_pack_length_into': _LENGTH.pack_into,
+            '_unpack_length': _LENGTH.unpack_from,
+        }
+    )
+    indent: int = 1
+
+    def bind(self, value: Any) -> str:
+        """Make a value visible to the source, returning the name it's bound to."""
+        name = f'_g{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def line(self, line: str) -> None:
+        self.lines.append('    ' * self.indent + line)
+
+    def compile(self, function: str, *args: str) -> Callable:
+        """Compile the source into a function of `args`."""
+        source = '\n'.join([f'def {function}({", ".join(args)}):', *self.lines])
+        filename = f'<buffham {self.name}.{function}>'
+
+        # Let tracebacks show the generated source
+        linecache.cache[filename] = (
+            len(source),
+            None,
+            source.splitlines(keepends=True),
+            filename,
+        )
+        exec(compile(source, filename, 'exec'), self.namespace)
+        return self.namespace[function]
+
+
+def _jit_field_size(field: schema_bh.Field, cache: CodecCache, source: _Source) -> None:
+    """Write the source that adds `value`'s (a field's value) size to `size`."""
+    item_size = parser.SIZE_MAP[field.sub_type or field.pri_type]
+
+    if field.is_rle:
+        source.line(f'size += {source.bind(_rle_size(field, cache))}(value)')
+    elif field.is_packed:
+        source.line(f'size += {source.bind(_packed_size(field, cache))}(value)')
+    elif field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type is schema_bh.FieldType.STRING:
+            source.line(
+                'size += 2 + 2 * len(value) + sum([len(item.encode()) for item in value])'
+            )
+        elif field.sub_type is schema_bh.FieldType.BYTES:
+            source.line('size += 2 + 2 * len(value) + sum(map(len, value))')
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_sizer = source.bind(cache.sizer(field.obj_name))
+            source.line(f'size += 2 + sum(map({item_sizer}, value))')
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            dtype = f'<{parser.FORMAT_MAP[field.sub_type]}'
+            source.line(f"size += 2 + _as_array(value, '{dtype}').nbytes")
+        else:
+            source.line(f'size += 2 + len(value) * {item_size}')
+    elif field.pri_type is schema_bh.FieldType.STRING:
+        source.line('size += 2 + len(value.encode())')
+    elif field.pri_type is schema_bh.FieldType.BYTES:
+        source.line('size += 2 + len(value)')
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        source.line(f'size += {source.bind(cache.sizer(field.obj_name))}(value)')
+    else:
+        source.line(f'size += {item_size}')
+
+
+def _jit_sizer(message: schema_bh.Message, cache: CodecCache) -> Sizer:
+    """Generate and compile a serialized size function from a message schema."""
+    source = _Source(message.name)
+
+    # Fixed-size fields (and the optional fields bitfield) add up to a constant
+    num_optional_fields = sum(field.is_optional for field in message.fields)
+    constant = (num_optional_fields + 7) // 8
+    constant += sum(
+        parser.SIZE_MAP[field.pri_type]
+        for field in message.fields
+        if parser.is_field_fixed(field)
+    )
+    source.line(f'size = {constant}')
+
+    for field in message.fields:
+        if parser.is_field_fixed(field):
+            continue
+        source.line(f'value = instance.{field.name}')
+        if field.is_optional:
+            source.line('if value is not None:')
+            source.indent += 1
+        _jit_field_size(field, cache, source)
+        if field.is_optional:
+            source.indent -= 1
+
+    source.line('return size')
+    return source.compile('sizer', 'instance')
+
+
+def _jit_field_serializer_into(
+    field: schema_bh.Field, cache: CodecCache, source: _Source
+) -> None:
+    """Write the source that writes `value` (a field's value) at `offset`."""
+    field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
+
+    if field.is_rle:
+        write = source.bind(_rle_writer(field, cache))
+        source.line(f'offset = {write}(value, buffer, offset)')
+    elif field.is_packed:
+        write = source.bind(_packed_writer(field, cache))
+        source.line(f'offset = {write}(value, buffer, offset)')
+    elif field.pri_type is schema_bh.FieldType.LIST:
+        is_array = cache.numpy and parser.is_field_numeric_list(field)
+        if is_array:
+            source.line(f"value = _as_array(value, '<{field_format}')")
+        source.line('_pack_length_into(buffer, offset, len(value))')
+        source.line('offset += 2')
+        if field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            if field.sub_type is schema_bh.FieldType.STRING:
+                source.line('value = [item.encode() for item in value]')
+            source.line(
+                "data = b''.join([_pack_length(len(item)) + item for item in value])"
+            )
+            source.line('buffer[offset : offset + len(data)] = data')
+            source.line('offset += len(data)')
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_serializer_into = source.bind(cache.serializer_into(field.obj_name))
+            source.line('for item in value:')
+            source.line(f'    offset = {item_serializer_into}(item, buffer, offset)')
+        elif is_array:
+            source.line(
+                "buffer[offset : offset + value.nbytes] = memoryview(value).cast('B')"
+            )
+            source.line('offset += value.nbytes')
+        else:
+            item_size = struct.calcsize(field_format)
+            source.line(
+                f"_struct.pack_into('<%d{field_format}' % len(value), buffer, "
+                'offset, *value)'
+            )
+            source.line(f'offset += len(value) * {item_size}')
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        if field.pri_type is schema_bh.FieldType.STRING:
+            source.line('value = value.encode()')
+        source.line('_pack_length_into(buffer, offset, len(value))')
+        source.line('offset += 2')
+        source.line('buffer[offset : offset + len(value)] = value')
+        source.line('offset += len(value)')
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        serializer_into = source.bind(cache.serializer_into(field.obj_name))
+        source.line(f'offset = {serializer_into}(value, buffer, offset)')
+    else:
+        scalar = struct.Struct(f'<{field_format}')
+        pack_into = source.bind(scalar.pack_into)
+        if field.pri_type is schema_bh.FieldType.ENUM:
+            source.line(f'{pack_into}(buffer, offset, value.value)')
+        else:
+            source.line(f'{pack_into}(buffer, offset, value)')
+        source.line(f'offset += {scalar.size}')
+
+
+def _jit_serializer_into(
+    message: schema_bh.Message, cache: CodecCache
+) -> SerializerInto:
+    """Generate and compile an in-place serializer from a message schema."""
+    source = _Source(message.name)
+
+    # Handle optional fields bitfield
+    optional_fields = [field for field in message.fields if field.is_optional]
+    if optional_fields:
+        source.line('bitfield = 0')
+        for optional_idx, field in enumerate(optional_fields):
+            source.line(f'if instance.{field.name} is not None:')
+            source.line(f'    bitfield |= {1 << optional_idx}')
+        num_optional_bytes = (len(optional_fields) + 7) // 8
+        source.line(
+            f'buffer[offset : offset + {num_optional_bytes}] = '
+            f"bitfield.to_bytes({num_optional_bytes}, 'little')"
+        )
+        source.line(f'offset += {num_optional_bytes}')
+
+    for group in _group_fields(message, cache.fuse):
+        if len(group) > 1:
+            layout = _run_layout(group)
+            args = ', '.join(
+                f'instance.{field.name}.value'
+                if field.pri_type is schema_bh.FieldType.ENUM
+                else f'instance.{field.name}'
+                for field in group
+            )
+            source.line(f'{source.bind(layout.pack_into)}(buffer, offset, {args})')
+            source.line(f'offset += {layout.size}')
+            continue
+
+        field = group[0]
+        source.line(f'value = instance.{field.name}')
+        if field.is_optional:
+            source.line('if value is not None:')
+            source.indent += 1
+        _jit_field_serializer_into(field, cache, source)
+        if field.is_optional:
+            source.indent -= 1
+
+    source.line('return offset')
+    return source.compile('serializer_into', 'instance', 'buffer', 'offset')
+
+
+def _jit_field_decoder(
+    field: schema_bh.Field,
+    cache: CodecCache,
+    clz: Type[dataclass.DataclassLike],
+    target: str,
+    source: _Source,
+) -> None:
+    """Write the source that decodes a field at `offset` into `target`."""
+    field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
+
+    if field.is_rle:
+        decode = source.bind(_rle_decode(field, cache))
+        source.line(f'{target}, offset = {decode}(buffer, offset)')
+        return
+    if field.is_packed:
+        decode = source.bind(_packed_decode(field, cache, clz))
+        source.line(f'{target}, offset = {decode}(buffer, offset)')
+        return
+
+    if field.pri_type in (
+        schema_bh.FieldType.LIST,
+        schema_bh.FieldType.STRING,
+        schema_bh.FieldType.BYTES,
+    ):
+        source.line('size = _unpack_length(buffer, offset)[0]')
+        source.line('offset += 2')
+
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            item = 'buffer[offset : offset + item_size]'
+            if field.sub_type is schema_bh.FieldType.STRING:
+                item = f"str({item}, 'utf-8')"
+            source.line(f'{target} = []')
+            source.line('for _ in range(size):')
+            source.line('    item_size = _unpack_length(buffer, offset)[0]')
+            source.line('    offset += 2')
+            source.line(f'    {target}.append({item})')
+            source.line('    offset += item_size')
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            assert field.obj_name is not None
+            item_deserializer = source.bind(
+                cache.deserializer(field.obj_name, _field_clz(clz, field))
+            )
+            source.line(f'{target} = []')
+            source.line('for _ in range(size):')
+            source.line(f'    item, offset = {item_deserializer}(buffer, offset)')
+            source.line(f'    {target}.append(item)')
+        elif cache.numpy and parser.is_field_numeric_list(field):
+            source.line(
+                f"{target} = _np.frombuffer(buffer, '<{field_format}', size, offset)"
+            )
+            source.line(f'offset += {target}.nbytes')
+        else:
+            item_size = struct.calcsize(field_format)
+            source.line(
+                f"{target} = list(_struct.unpack_from('<%d{field_format}' % size, "
+                'buffer, offset))'
+            )
+            source.line(f'offset += size * {item_size}')
+    elif field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        value = 'buffer[offset : offset + size]'
+        if field.pri_type is schema_bh.FieldType.STRING:
+            value = f"str({value}, 'utf-8')"
+        source.line(f'{target} = {value}')
+        source.line('offset += size')
+    elif field.pri_type is schema_bh.FieldType.MESSAGE:
+        assert field.obj_name is not None
+        nested_deserializer = source.bind(
+            cache.deserializer(field.obj_name, _field_clz(clz, field))
+        )
+        source.line(f'{target}, offset = {nested_deserializer}(buffer, offset)')
+    else:
+        scalar = struct.Struct(f'<{field_format}')
+        value = f'{source.bind(scalar.unpack_from)}(buffer, offset)[0]'
+        if field.pri_type is schema_bh.FieldType.BOOL:
+            value = f'bool({value})'
+        elif field.pri_type is schema_bh.FieldType.ENUM:
+            value = f'{source.bind(_field_clz(clz, field))}({value})'
+        source.line(f'{target} = {value}')
+        source.line(f'offset += {scalar.size}')
+
+
+def _jit_deserializer[T: dataclass.DataclassLike](
+    message: schema_bh.Message, cache: CodecCache, clz: Type[T]
+) -> Deserializer[T]:
+    """Generate and compile a deserializer from a message schema."""
+    source = _Source(message.name)
+
+    # Handle optional fields bitfield
+    num_optional_fields = sum(field.is_optional for field in message.fields)
+    num_optional_bytes = (num_optional_fields + 7) // 8
+    if num_optional_fields:
+        source.line(
+            'bitfield = int.from_bytes('
+            f"buffer[offset : offset + {num_optional_bytes}], 'little')"
+        )
+        source.line(f'offset += {num_optional_bytes}')
+
+    # Fields decode into locals named by their slot, so that field names can't
+    # collide with the codec's own
+    index = 0
+    optional_idx = 0
+    for group in _group_fields(message, cache.fuse):
+        if len(group) > 1:
+            # Runs never contain optional fields
+            layout = _run_layout(group)
+            targets = [f'v{i}' for i in range(index, index + len(group))]
+            source.line(
+                f'{", ".join(targets)} = '
+                f'{source.bind(layout.unpack_from)}(buffer, offset)'
+            )
+            source.line(f'offset += {layout.size}')
+            for target, field in zip(targets, group):
+                if field.pri_type is schema_bh.FieldType.BOOL:
+                    source.line(f'{target} = bool({target})')
+                elif field.pri_type is schema_bh.FieldType.ENUM:
+                    convert = source.bind(_field_clz(clz, field))
+                    source.line(f'{target} = {convert}({target})')
+            index += len(group)
+            continue
+
+        field = group[0]
+        target = f'v{index}'
+        if field.is_optional:
+            source.line(f'if bitfield & {1 << optional_idx}:')
+            source.indent += 1
+        _jit_field_decoder(field, cache, clz, target, source)
+        if field.is_optional:
+            source.indent -= 1
+            source.line('else:')
+            source.line(f'    {target} = None')
+            optional_idx += 1
+        index += 1
+
+    # Construct positionally when the class's fields line up with the schema's
+    names = [field.name for field in message.fields]
+    if [f.name for f in dataclasses.fields(clz)] == names:
+        args = [f'v{i}' for i in range(len(names))]
+    else:
+        args = [f'{name}=v{i}' for i, name in enumerate(names)]
+    source.line(f'return {source.bind(clz)}({", ".join(args)}), offset')
+    return source.compile('deserializer', 'buffer', 'offset=0')
+
+
+def _compile_batch_dtype(message: schema_bh.Message, cache: CodecCache) -> np.dtype:
+    """Build a packed, little-endian structured dtype laid out like the message.
+
+    Nested messages become nested structured fields; bools decode as `?` and
+    enums as their `uint8` values.
+    """
+    fields: list[tuple[str, np.dtype | str]] = []
+    for field in message.fields:
+        if field.pri_type is schema_bh.FieldType.MESSAGE and not field.is_optional:
+            assert field.obj_name is not None
+            fields.append((field.name, cache.batch_dtype(field.obj_name)))
+        elif not parser.is_field_fixed(field):
+            raise ValueError(
+                f'{message.name}.{field.name} has no fixed layout to batch '
+                '(optional, packed, list, string or bytes)'
+            )
+        elif field.pri_type is schema_bh.FieldType.BOOL:
+            fields.append((field.name, '?'))
+        else:
+            fields.append((field.name, f'<{parser.FORMAT_MAP[field.pri_type]}'))
+    return np.dtype(fields)
+
+
+def generate_serializer(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    cache: CodecCache | None = None,
+) -> Serializer:
+    """Generic serializer generator for a message schema.
+
+    The serializer sizes the message up front and writes it into a single
+    buffer. Nested messages are compiled through `cache`, so passing the same
+    cache to several calls shares their codecs.
+    """
+    if cache is None:
+        cache = CodecCache(message_registry)
+    return _wrap_serializer(
+        message,
+        _compile_sizer(message, cache),
+        _compile_serializer_into(message, cache),
+    )
+
+
+def generate_sizer(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    cache: CodecCache | None = None,
+) -> Sizer:
+    """Generic serialized size function generator for a message schema."""
+    if cache is None:
+        cache = CodecCache(message_registry)
+    return _compile_sizer(message, cache)
+
+
+def generate_serializer_into(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    cache: CodecCache | None = None,
+) -> SerializerInto:
+    """Generic in-place serializer generator for a message schema.
+
+    The serializer writes an instance into `buffer` at `offset` and returns the
+    offset just past it; `buffer` must have room for the sizer's result.
+    """
+    if cache is None:
+        cache = CodecCache(message_registry)
+    return _compile_serializer_into(message, cache)
+
+
+def generate_deserializer[T: dataclass.DataclassLike](
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    clz: Type[T],
+    cache: CodecCache | None = None,
+) -> Deserializer[T]:
+    """Generic deserializer generator for a message schema.
+
+    Nested messages are compiled through `cache`, so passing the same cache
+    to several calls shares their codecs.
+    """
+    if cache is None:
+        cache = CodecCache(message_registry)
+    return _compile_deserializer(message, cache, clz)
+
+
+def generate_batch_dtype(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    cache: CodecCache | None = None,
+) -> np.dtype:
+    """Generate a NumPy structured dtype matching a fixed-layout message's encoding.
+
+    Raises:
+        ValueError: If the message (or a message it nests) has an optional,
+            packed, list, string or bytes field.
+    """
+    if cache is None:
+        cache = CodecCache(message_registry)
+    return _compile_batch_dtype(message, cache)
+
+
+def decode_batch(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    buffer: bytes | bytearray | memoryview,
+    count: int = -1,
+    offset: int = 0,
+    cache: CodecCache | None = None,
+) -> np.ndarray:
+    """Decode back-to-back encodings of a fixed-layout message as one array.
+
+    The result is a structured array viewing `buffer`, with a field per
+    message field; no per-record Python objects are made. A `count` of -1
+    decodes every record in the rest of `buffer`.
+    """
+    dtype = generate_batch_dtype(message, message_registry, cache)
+    return np.frombuffer(buffer, dtype, count, offset)
+
+
+def encode_batch(
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    records: Any,
+    cache: CodecCache | None = None,
+) -> bytes:
+    """Encode records of a fixed-layout message back-to-back.
+
+    `records` is anything NumPy can convert to the message's batch dtype, e.g.
+    a structured array (matched by field position) or a list of tuples.
+    """
+    dtype = generate_batch_dtype(message, message_registry, cache)
+    return np.ascontiguousarray(records, dtype).tobytes()
+
+
+def generate_lazy_deserializer[T: dataclass.DataclassLike](
+    message: schema_bh.Message,
+    message_registry: dict[tuple[str, str], schema_bh.Message],
+    clz: Type[T],
+    cache: CodecCache | None = None,
+) -> LazyDeserializer[T]:
+    """Generic lazy deserializer generator for a message schema.
+
+    The deserializer only finds where each field starts, returning a
+    `LazyMessage` view whose fields decode into `clz`'s types when first read.
+    `clz` may be any dataclass matching the schema, e.g. a generated class.
+    """
+    if cache is None:
+        cache = CodecCache(message_registry)
+    return _compile_lazy_deserializer(message, cache, clz)
+
+
+def materialize[T: dataclass.DataclassLike](view: LazyMessage[T]) -> T:
+    """Decode every field of a lazy view into its message class."""
+    return view._clz(**{name: getattr(view, name) for name in view._decoders})
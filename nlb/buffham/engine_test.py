@@ -1,10 +1,15 @@
+import array
 import dataclasses
 import enum
+import linecache
 import unittest
 from typing import Optional, Union
 
+import numpy as np
+
 from nlb.buffham import engine
 from nlb.buffham import schema_bh
+from nlb.util import dataframe
 
 
 class Verbosity(enum.Enum):
@@ -46,6 +51,55 @@ class StringLists:
     buffers: list[bytes]
 
 
+@dataclasses.dataclass
+class Fixed:
+    timestamp_ms: int
+    distance_mm: float
+    valid: bool
+    verbosity: Verbosity
+    samples: list[int]
+    flags: int
+
+
+@dataclasses.dataclass
+class Measurement:
+    timestamp_ms: int
+    valid: bool
+    verbosity: Verbosity
+    ping: Ping
+
+
+@dataclasses.dataclass
+class Packed:
+    counter: int
+    delta: int
+    offset_ms: int | None
+    label: str
+    samples: list[int]
+    buffers: list[bytes]
+    pings: list[Ping]
+    gain: float
+
+
+@dataclasses.dataclass
+class Compressed:
+    address: int
+    data: list[int]
+    blob: bytes | None
+
+
+@dataclasses.dataclass
+class PackedRle:
+    data: list[int]
+    count: int
+
+
+@dataclasses.dataclass
+class Optionals:
+    a: int | None
+    b: int | None
+
+
 @dataclasses.dataclass
 class OptionalTest:
     a: int
@@ -57,6 +111,8 @@ class OptionalTest:
 
 
 class TestEngine(unittest.TestCase):
+    JIT = False
+
     PING = schema_bh.Message(
         'Ping',
         [
@@ -68,6 +124,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
         ],
         [],
@@ -83,6 +141,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'data',
@@ -92,6 +152,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'read_size',
@@ -101,6 +163,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
         ],
         [],
@@ -116,6 +180,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'verbosity',
@@ -125,6 +191,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
         ],
         [],
@@ -140,6 +208,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'inner',
@@ -149,6 +219,8 @@ class TestEngine(unittest.TestCase):
                 schema_bh.Name(LOG_MESSAGE.name, ''),
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'messages',
@@ -158,6 +230,8 @@ class TestEngine(unittest.TestCase):
                 schema_bh.Name(LOG_MESSAGE.name, ''),
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'data',
@@ -167,6 +241,8 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
             schema_bh.Field(
                 'nested',
@@ -176,6 +252,8 @@ class TestEngine(unittest.TestCase):
                 schema_bh.Name(PING.name, ''),
                 [],
                 None,
+                False,
+                False,
             ),
         ],
         [],
@@ -191,6 +269,232 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'buffers',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.BYTES,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+        ],
+        [],
+    )
+
+    OPTIONALS = schema_bh.Message(
+        'Optionals',
+        [
+            schema_bh.Field(
+                'a',
+                schema_bh.FieldType.UINT8_T,
+                None,
+                True,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'b',
+                schema_bh.FieldType.UINT8_T,
+                None,
+                True,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+        ],
+        [],
+    )
+
+    FIXED = schema_bh.Message(
+        'Fixed',
+        [
+            schema_bh.Field(
+                'timestamp_ms',
+                schema_bh.FieldType.UINT32_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'distance_mm',
+                schema_bh.FieldType.FLOAT64,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'valid',
+                schema_bh.FieldType.BOOL,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'verbosity',
+                schema_bh.FieldType.ENUM,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'samples',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.INT16_T,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'flags',
+                schema_bh.FieldType.UINT16_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+        ],
+        [],
+    )
+    MEASUREMENT = schema_bh.Message(
+        'Measurement',
+        [
+            schema_bh.Field(
+                'timestamp_ms',
+                schema_bh.FieldType.UINT32_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'valid',
+                schema_bh.FieldType.BOOL,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'verbosity',
+                schema_bh.FieldType.ENUM,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'ping',
+                schema_bh.FieldType.MESSAGE,
+                None,
+                False,
+                schema_bh.Name(PING.name, ''),
+                [],
+                None,
+                False,
+                False,
+            ),
+        ],
+        [],
+    )
+    PACKED = schema_bh.Message(
+        'Packed',
+        [
+            schema_bh.Field(
+                'counter',
+                schema_bh.FieldType.UINT32_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                True,
+                False,
+            ),
+            schema_bh.Field(
+                'delta',
+                schema_bh.FieldType.INT16_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                True,
+                False,
+            ),
+            schema_bh.Field(
+                'offset_ms',
+                schema_bh.FieldType.INT64_T,
+                None,
+                True,
+                None,
+                [],
+                None,
+                True,
+                False,
+            ),
+            schema_bh.Field(
+                'label',
+                schema_bh.FieldType.STRING,
+                None,
+                False,
+                None,
+                [],
+                None,
+                True,
+                False,
+            ),
+            schema_bh.Field(
+                'samples',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.INT16_T,
+                False,
+                None,
+                [],
+                None,
+                True,
+                False,
             ),
             schema_bh.Field(
                 'buffers',
@@ -200,6 +504,100 @@ class TestEngine(unittest.TestCase):
                 None,
                 [],
                 None,
+                True,
+                False,
+            ),
+            schema_bh.Field(
+                'pings',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.MESSAGE,
+                False,
+                schema_bh.Name(PING.name, ''),
+                [],
+                None,
+                True,
+                False,
+            ),
+            schema_bh.Field(
+                'gain',
+                schema_bh.FieldType.FLOAT32,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+        ],
+        [],
+    )
+
+    COMPRESSED = schema_bh.Message(
+        'Compressed',
+        [
+            schema_bh.Field(
+                'address',
+                schema_bh.FieldType.UINT32_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                False,
+                False,
+            ),
+            schema_bh.Field(
+                'data',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.UINT8_T,
+                False,
+                None,
+                [],
+                None,
+                False,
+                True,
+            ),
+            schema_bh.Field(
+                'blob',
+                schema_bh.FieldType.BYTES,
+                None,
+                True,
+                None,
+                [],
+                None,
+                True,
+                True,
+            ),
+        ],
+        [],
+    )
+
+    # A packed message with an `rle` field that isn't last
+    PACKED_RLE = schema_bh.Message(
+        'PackedRle',
+        [
+            schema_bh.Field(
+                'data',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.UINT8_T,
+                False,
+                None,
+                [],
+                None,
+                True,
+                True,
+            ),
+            schema_bh.Field(
+                'count',
+                schema_bh.FieldType.UINT16_T,
+                None,
+                False,
+                None,
+                [],
+                None,
+                True,
+                False,
             ),
         ],
         [],
@@ -212,8 +610,17 @@ class TestEngine(unittest.TestCase):
             ('', self.LOG_MESSAGE.name): self.LOG_MESSAGE,
             ('', self.NESTED_MESSAGE.name): self.NESTED_MESSAGE,
             ('', self.STRING_LISTS.name): self.STRING_LISTS,
+            ('', self.OPTIONALS.name): self.OPTIONALS,
+            ('', self.FIXED.name): self.FIXED,
+            ('', self.MEASUREMENT.name): self.MEASUREMENT,
+            ('', self.PACKED.name): self.PACKED,
+            ('', self.COMPRESSED.name): self.COMPRESSED,
+            ('', self.PACKED_RLE.name): self.PACKED_RLE,
         }
 
+    def cache(self, **kwargs) -> engine.CodecCache:
+        return engine.CodecCache(self.message_registry, jit=self.JIT, **kwargs)
+
     def test_split_optional(self):
         self.assertEqual(
             engine.split_optional(OptionalTest.__dataclass_fields__['a'].type),
@@ -242,7 +649,9 @@ class TestEngine(unittest.TestCase):
 
     def test_generate_serializer(self):
         message = self.PING
-        serializer = engine.generate_serializer(message, self.message_registry)
+        serializer = engine.generate_serializer(
+            message, self.message_registry, self.cache()
+        )
         instance = Ping(42)
         self.assertEqual(
             serializer(instance),
@@ -250,7 +659,9 @@ class TestEngine(unittest.TestCase):
         )
 
         message = self.FLASH_PAGE
-        serializer = engine.generate_serializer(message, self.message_registry)
+        serializer = engine.generate_serializer(
+            message, self.message_registry, self.cache()
+        )
         instance = FlashPage(0x1234, [0x9ABC, 0xDEF0], 0x5678)
         self.assertEqual(
             serializer(instance),
@@ -258,7 +669,9 @@ class TestEngine(unittest.TestCase):
         )
 
         message = self.LOG_MESSAGE
-        serializer = engine.generate_serializer(message, self.message_registry)
+        serializer = engine.generate_serializer(
+            message, self.message_registry, self.cache()
+        )
         instance = LogMessage('Hello, World!', Verbosity.MEDIUM)
         self.assertEqual(
             serializer(instance),
@@ -269,7 +682,9 @@ class TestEngine(unittest.TestCase):
 
     def test_generate_nested_serializer(self):
         message = self.NESTED_MESSAGE
-        serializer = engine.generate_serializer(message, self.message_registry)
+        serializer = engine.generate_serializer(
+            message, self.message_registry, self.cache()
+        )
         log_message = LogMessage('Hello, World!', Verbosity.LOW)
         instance = NestedMessage(
             True, log_message, [log_message, log_message], [-1, -2, -3], Ping(42)
@@ -281,7 +696,9 @@ class TestEngine(unittest.TestCase):
 
     def test_generate_string_lists_serializer(self):
         message = self.STRING_LISTS
-        serializer = engine.generate_serializer(message, self.message_registry)
+        serializer = engine.generate_serializer(
+            message, self.message_registry, self.cache()
+        )
         instance = StringLists(
             messages=['hello', 'world'],
             buffers=[b'\x01\x02\x03', b'\x04\x05'],
@@ -294,7 +711,7 @@ class TestEngine(unittest.TestCase):
     def test_generate_deserializer(self):
         message = self.PING
         deserializer = engine.generate_deserializer(
-            message, self.message_registry, Ping
+            message, self.message_registry, Ping, self.cache()
         )
         buffer = int(42).to_bytes(length=1, byteorder='little', signed=False)
         msg, size = deserializer(buffer)
@@ -303,7 +720,7 @@ class TestEngine(unittest.TestCase):
 
         message = self.FLASH_PAGE
         deserializer = engine.generate_deserializer(
-            message, self.message_registry, FlashPage
+            message, self.message_registry, FlashPage, self.cache()
         )
         buffer = b'\x01\x34\x12\x00\x00\x02\x00\xbc\x9a\x00\x00\xf0\xde\x00\x00\x78\x56\x00\x00'
         msg, size = deserializer(buffer)
@@ -312,7 +729,7 @@ class TestEngine(unittest.TestCase):
 
         message = self.LOG_MESSAGE
         deserializer = engine.generate_deserializer(
-            message, self.message_registry, LogMessage
+            message, self.message_registry, LogMessage, self.cache()
         )
         buffer = b'\x0d\x00Hello, World!\x02'
         msg, size = deserializer(buffer)
@@ -322,7 +739,7 @@ class TestEngine(unittest.TestCase):
     def test_generate_nested_deserializer(self):
         message = self.NESTED_MESSAGE
         deserializer = engine.generate_deserializer(
-            message, self.message_registry, NestedMessage
+            message, self.message_registry, NestedMessage, self.cache()
         )
         buffer = b'\x03\x01\r\x00Hello, World!\x02\x02\x00\r\x00Hello, World!\x02\r\x00Hello, World!\x02\x03\x00\xff\xff\xff\xff\xfe\xff\xff\xff\xfd\xff\xff\xff*'
         msg, size = deserializer(buffer)
@@ -342,7 +759,7 @@ class TestEngine(unittest.TestCase):
     def test_generate_string_lists_deserializer(self):
         message = self.STRING_LISTS
         deserializer = engine.generate_deserializer(
-            message, self.message_registry, StringLists
+            message, self.message_registry, StringLists, self.cache()
         )
         buffer = b'\x02\x00\x05\x00hello\x05\x00world\x02\x00\x03\x00\x01\x02\x03\x02\x00\x04\x05'
         msg, size = deserializer(buffer)
@@ -354,3 +771,380 @@ class TestEngine(unittest.TestCase):
             ),
         )
         self.assertEqual(size, len(buffer))
+
+    def test_optionals(self):
+        serializer = engine.generate_serializer(
+            self.OPTIONALS, self.message_registry, self.cache()
+        )
+        deserializer = engine.generate_deserializer(
+            self.OPTIONALS, self.message_registry, Optionals, self.cache()
+        )
+
+        # Each optional keeps its own bit, regardless of which are present
+        for instance, buffer in (
+            (Optionals(None, None), b'\x00'),
+            (Optionals(1, None), b'\x01\x01'),
+            (Optionals(None, 2), b'\x02\x02'),
+            (Optionals(1, 2), b'\x03\x01\x02'),
+        ):
+            self.assertEqual(serializer(instance), buffer)
+            self.assertEqual(deserializer(buffer), (instance, len(buffer)))
+
+    def test_codec_cache(self):
+        cache = self.cache()
+        serializer = engine.generate_serializer(
+            self.NESTED_MESSAGE, self.message_registry, cache
+        )
+        deserializer = engine.generate_deserializer(
+            self.NESTED_MESSAGE, self.message_registry, NestedMessage, cache
+        )
+
+        # Nested and list-of-message children are compiled once and shared
+        self.assertEqual(set(cache.sizers), {('', 'LogMessage'), ('', 'Ping')})
+        self.assertEqual(
+            set(cache.serializers_into), {('', 'LogMessage'), ('', 'Ping')}
+        )
+        self.assertEqual(
+            set(cache.deserializers),
+            {('', 'LogMessage', LogMessage), ('', 'Ping', Ping)},
+        )
+        self.assertIs(
+            cache.serializer(schema_bh.Name('LogMessage', '')),
+            cache.serializers[('', 'LogMessage')],
+        )
+
+        log_message = LogMessage('Hello, World!', Verbosity.HIGH)
+        instance = NestedMessage(None, log_message, [log_message] * 3, [1, 2, 3], None)
+        buffer = serializer(instance)
+        self.assertEqual(deserializer(buffer), (instance, len(buffer)))
+
+    def test_serialize_into(self):
+        cache = self.cache()
+        sizer = engine.generate_sizer(self.NESTED_MESSAGE, self.message_registry, cache)
+        serializer_into = engine.generate_serializer_into(
+            self.NESTED_MESSAGE, self.message_registry, cache
+        )
+        serializer = engine.generate_serializer(
+            self.NESTED_MESSAGE, self.message_registry, cache
+        )
+
+        log_message = LogMessage('Hellö, World!', Verbosity.HIGH)
+        for instance in (
+            NestedMessage(True, log_message, [log_message] * 2, [1, -2], Ping(42)),
+            NestedMessage(None, log_message, [], [], None),
+        ):
+            expected = serializer(instance)
+            self.assertEqual(sizer(instance), len(expected))
+
+            # Messages are written in place, at an offset, into a shared buffer
+            buffer = bytearray(b'\xaa' * (len(expected) + 4))
+            end = serializer_into(instance, memoryview(buffer), 3)
+            self.assertEqual(end, 3 + len(expected))
+            self.assertEqual(buffer, b'\xaa' * 3 + expected + b'\xaa')
+
+    def test_deserialize_offset(self):
+        cache = self.cache()
+        serializer = engine.generate_serializer(
+            self.NESTED_MESSAGE, self.message_registry, cache
+        )
+        deserializer = engine.generate_deserializer(
+            self.NESTED_MESSAGE, self.message_registry, NestedMessage, cache
+        )
+        string_lists_deserializer = engine.generate_deserializer(
+            self.STRING_LISTS, self.message_registry, StringLists, cache
+        )
+
+        log_message = LogMessage('Hellö, World!', Verbosity.HIGH)
+        instance = NestedMessage(True, log_message, [log_message] * 3, [1], Ping(4))
+        string_lists = StringLists(['a', 'b'], [b'\x01\x02', b''])
+        buffer = b'\xaa' * 3 + serializer(instance)
+        end = len(buffer)
+        buffer += engine.generate_serializer(
+            self.STRING_LISTS, self.message_registry, cache
+        )(string_lists)
+
+        # Messages decode in place and return the offset just past themselves
+        self.assertEqual(deserializer(buffer, 3), (instance, end))
+        msg, offset = string_lists_deserializer(memoryview(buffer), end)
+        self.assertEqual(msg, string_lists)
+        self.assertEqual(offset, len(buffer))
+
+        # Bytes fields from a memoryview are views into it, not copies
+        self.assertIsInstance(msg.buffers[0], memoryview)
+        self.assertIs(msg.buffers[0].obj, buffer)
+
+    def test_fused_layouts(self):
+        instance = Fixed(1234, 56.5, True, Verbosity.HIGH, [-1, 2], 0xBEEF)
+        buffer = (
+            b'\xd2\x04\x00\x00\x00\x00\x00\x00\x00@L@\x01\x02'
+            b'\x02\x00\xff\xff\x02\x00\xef\xbe'
+        )
+
+        # Fusing runs of fixed-size fields doesn't change the wire format
+        for fuse in (True, False):
+            cache = self.cache(fuse=fuse)
+            serializer = engine.generate_serializer(
+                self.FIXED, self.message_registry, cache
+            )
+            deserializer = engine.generate_deserializer(
+                self.FIXED, self.message_registry, Fixed, cache
+            )
+            self.assertEqual(serializer(instance), buffer)
+            self.assertEqual(deserializer(buffer), (instance, len(buffer)))
+
+    def test_numpy(self):
+        cache = self.cache(numpy=True)
+        serializer = engine.generate_serializer(
+            self.FIXED, self.message_registry, cache
+        )
+        deserializer = engine.generate_deserializer(
+            self.FIXED, self.message_registry, Fixed, cache
+        )
+        buffer = (
+            b'\xd2\x04\x00\x00\x00\x00\x00\x00\x00@L@\x01\x02'
+            b'\x02\x00\xff\xff\x02\x00\xef\xbe'
+        )
+
+        # Numeric lists decode to little-endian views of the buffer
+        msg, size = deserializer(buffer)
+        self.assertEqual(size, len(buffer))
+        self.assertIsInstance(msg.samples, np.ndarray)
+        self.assertEqual(msg.samples.dtype, np.dtype('<i2'))
+        np.testing.assert_array_equal(msg.samples, [-1, 2])
+
+        # ...and encode from arrays, bytes-like objects and lists alike
+        for samples in (
+            msg.samples,
+            np.array([-1, 2]),
+            array.array('h', [-1, 2]),
+            b'\xff\xff\x02\x00',
+            [-1, 2],
+        ):
+            instance = Fixed(1234, 56.5, True, Verbosity.HIGH, samples, 0xBEEF)
+            self.assertEqual(serializer(instance), buffer)
+
+    def test_batch(self):
+        cache = self.cache()
+        serializer = engine.generate_serializer(
+            self.MEASUREMENT, self.message_registry, cache
+        )
+        measurements = [
+            Measurement(i, bool(i % 2), Verbosity(i % 3), Ping(10 * i))
+            for i in range(4)
+        ]
+        buffer = b''.join(serializer(m) for m in measurements)
+
+        # Records decode as one structured view, laid out like the encoding
+        records = engine.decode_batch(
+            self.MEASUREMENT, self.message_registry, buffer, cache=cache
+        )
+        self.assertEqual(records.dtype.itemsize, len(buffer) // 4)
+        self.assertIs(records.base, buffer)
+        self.assertEqual(records['timestamp_ms'].tolist(), [0, 1, 2, 3])
+        self.assertEqual(records['valid'].tolist(), [False, True, False, True])
+        self.assertEqual(records['verbosity'].tolist(), [0, 1, 2, 0])
+        self.assertEqual(records['ping']['ping'].tolist(), [0, 10, 20, 30])
+
+        # `count` and `offset` pick out a slice of the recording
+        size = records.dtype.itemsize
+        records = engine.decode_batch(
+            self.MEASUREMENT, self.message_registry, buffer, 2, size, cache
+        )
+        self.assertEqual(records['timestamp_ms'].tolist(), [1, 2])
+
+        # Encoding round trips, and accepts plain tuples
+        self.assertEqual(
+            engine.encode_batch(
+                self.MEASUREMENT, self.message_registry, records, cache
+            ),
+            buffer[size : 3 * size],
+        )
+        self.assertEqual(
+            engine.encode_batch(
+                self.MEASUREMENT,
+                self.message_registry,
+                [
+                    (m.timestamp_ms, m.valid, m.verbosity.value, (m.ping.ping,))
+                    for m in measurements
+                ],
+                cache,
+            ),
+            buffer,
+        )
+
+        # Flat records become DataFrame columns without any `Ping` objects
+        buffer = engine.encode_batch(
+            self.PING, self.message_registry, [(1,), (2,), (3,)], cache
+        )
+        frame = dataframe.dataframe_from_type(
+            Ping,
+            engine.decode_batch(self.PING, self.message_registry, buffer, cache=cache),
+        )
+        self.assertEqual(frame['ping'].tolist(), [1, 2, 3])
+
+        # Messages without a fixed layout can't be batched
+        with self.assertRaises(ValueError):
+            engine.generate_batch_dtype(self.FIXED, self.message_registry, cache)
+
+    def test_lazy(self):
+        cache = self.cache()
+        deserializer = engine.generate_lazy_deserializer(
+            self.NESTED_MESSAGE, self.message_registry, NestedMessage, cache
+        )
+        buffer = b'\x01\x01\r\x00Hello, World!\x02\x02\x00\r\x00Hello, World!\x02\r\x00Hello, World!\x02\x03\x00\xff\xff\xff\xff\xfe\xff\xff\xff\xfd\xff\xff\xff'
+
+        # Only the field offsets are found up front
+        view, size = deserializer(b'\xaa' + buffer, 1)
+        self.assertEqual(size, 1 + len(buffer))
+        self.assertEqual(view._offsets, [2, 3, 19, 53, 67])
+
+        # Fields decode on first access, then read from their slot
+        self.assertEqual(view.data, [-1, -2, -3])
+        self.assertIs(view.data, view.data)
+        self.assertIsNone(view.nested)
+        self.assertEqual(view.inner, LogMessage('Hello, World!', Verbosity.HIGH))
+        with self.assertRaises(AttributeError):
+            view.missing  # noqa: B018
+
+        # Materializing matches a full decode
+        self.assertEqual(
+            engine.materialize(view),
+            engine.generate_deserializer(
+                self.NESTED_MESSAGE, self.message_registry, NestedMessage, cache
+            )(buffer)[0],
+        )
+
+        # Nested messages skip by their constant size where they have one
+        self.assertEqual(cache.skipper(schema_bh.Name(self.PING.name, '')), 1)
+        self.assertNotIsInstance(
+            cache.skipper(schema_bh.Name(self.LOG_MESSAGE.name, '')), int
+        )
+
+    def test_packed(self):
+        instance = Packed(300, -2, None, 'hi', [-1, 2, 200], [b'ab'], [Ping(7)], 0.5)
+        # Varints are little-endian groups of 7 bits, with the high bit set on
+        # all but the last; signed values are zigzagged (-1 -> 1, 2 -> 4, ...)
+        buffer = (
+            b'\x00\xac\x02\x03\x02hi\x03\x01\x04\x90\x03\x01\x02ab\x01\x07\x00\x00\x00?'
+        )
+        with_offset = dataclasses.replace(instance, offset_ms=-300)
+        offset_buffer = b'\x01' + buffer[1:4] + b'\xd7\x04' + buffer[4:]
+
+        for kwargs in ({}, {'fuse': False}, {'numpy': True}):
+            with self.subTest(**kwargs):
+                cache = self.cache(**kwargs)
+                serializer = engine.generate_serializer(
+                    self.PACKED, self.message_registry, cache
+                )
+                deserializer = engine.generate_deserializer(
+                    self.PACKED, self.message_registry, Packed, cache
+                )
+                self.assertEqual(serializer(instance), buffer)
+                self.assertEqual(serializer(with_offset), offset_buffer)
+
+                msg, size = deserializer(offset_buffer)
+                self.assertEqual(size, len(offset_buffer))
+                if kwargs.get('numpy'):
+                    # Packed numeric lists still decode to arrays
+                    self.assertEqual(msg.samples.dtype, np.dtype('<i2'))
+                    msg.samples = msg.samples.tolist()
+                self.assertEqual(msg, with_offset)
+
+        # Packed fields are skipped by reading their varints
+        cache = self.cache()
+        skipper = cache.skipper(schema_bh.Name(self.PACKED.name, ''))
+        self.assertNotIsInstance(skipper, int)
+        self.assertEqual(skipper(offset_buffer, 0), len(offset_buffer))  # type: ignore
+        view, _ = engine.generate_lazy_deserializer(
+            self.PACKED, self.message_registry, Packed, cache
+        )(offset_buffer)
+        self.assertEqual(view.gain, 0.5)
+        self.assertEqual(engine.materialize(view), with_offset)
+
+        # ...and have no fixed layout to batch
+        with self.assertRaises(ValueError):
+            engine.generate_batch_dtype(self.PACKED, self.message_registry, cache)
+
+    def test_rle(self):
+        instance = Compressed(0x1000, [0xFF] * 200 + [1, 2], bytes(10))
+        # Runs are split into chunks of at most 128 bytes, with a header byte
+        # of `257 - length`; literals have a header byte of `length - 1`
+        buffer = (
+            b'\x01\x00\x10\x00\x00'
+            + b'\x07\x00\x81\xff\xb9\xff\x01\x01\x02'
+            # Packed, so the encoded length is a varint
+            + b'\x02\xf7\x00'
+        )
+
+        for kwargs in ({}, {'numpy': True}):
+            with self.subTest(**kwargs):
+                cache = self.cache(**kwargs)
+                serializer = engine.generate_serializer(
+                    self.COMPRESSED, self.message_registry, cache
+                )
+                deserializer = engine.generate_deserializer(
+                    self.COMPRESSED, self.message_registry, Compressed, cache
+                )
+                self.assertEqual(serializer(instance), buffer)
+
+                msg, size = deserializer(buffer)
+                self.assertEqual(size, len(buffer))
+                if kwargs.get('numpy'):
+                    self.assertEqual(msg.data.dtype, np.dtype('uint8'))
+                    msg.data = msg.data.tolist()
+                self.assertEqual(msg, instance)
+
+        # Encoded fields are skipped by their length
+        cache = self.cache()
+        view, _ = engine.generate_lazy_deserializer(
+            self.COMPRESSED, self.message_registry, Compressed, cache
+        )(buffer)
+        self.assertEqual(view.blob, bytes(10))
+
+        no_blob = dataclasses.replace(instance, blob=None)
+        serializer = engine.generate_serializer(
+            self.COMPRESSED, self.message_registry, cache
+        )
+        self.assertEqual(serializer(no_blob), b'\x00' + buffer[1:-3])
+
+    def test_lazy_packed_rle(self):
+        instance = PackedRle([0xFF] * 10 + [1], 300)
+        # A varint length and the encoded bytes, then the next field
+        buffer = b'\x04\xf7\xff\x00\x01' + b'\xac\x02'
+
+        cache = self.cache()
+        serializer = engine.generate_serializer(
+            self.PACKED_RLE, self.message_registry, cache
+        )
+        self.assertEqual(serializer(instance), buffer)
+
+        skipper = cache.skipper(schema_bh.Name(self.PACKED_RLE.name, ''))
+        self.assertEqual(skipper(buffer, 0), len(buffer))  # type: ignore
+        view, size = engine.generate_lazy_deserializer(
+            self.PACKED_RLE, self.message_registry, PackedRle, cache
+        )(buffer)
+        self.assertEqual(size, len(buffer))
+        self.assertEqual(view.count, 300)
+        self.assertEqual(engine.materialize(view), instance)
+
+
+class TestEngineJit(TestEngine):
+    """Run every engine test against the JIT-compiled codecs."""
+
+    JIT = True
+
+    def test_jit_source(self):
+        cache = self.cache()
+        sizer = engine.generate_sizer(self.NESTED_MESSAGE, self.message_registry, cache)
+        serializer_into = engine.generate_serializer_into(
+            self.NESTED_MESSAGE, self.message_registry, cache
+        )
+        deserializer = engine.generate_deserializer(
+            self.NESTED_MESSAGE, self.message_registry, NestedMessage, cache
+        )
+
+        # Codecs are straight-line functions whose source shows up in tracebacks
+        for codec in (sizer, serializer_into, deserializer):
+            filename = codec.__code__.co_filename
+            self.assertTrue(filename.startswith('<buffham NestedMessage.'))
+            self.assertIn(f'def {codec.__name__}(', linecache.getline(filename, 1))
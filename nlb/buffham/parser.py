@@ -1,7 +1,10 @@
 import dataclasses
+import functools
+import hashlib
+import os
 import pathlib
 import re
-from typing import Callable, Generator, Protocol
+from typing import Any, Callable, Generator, Protocol
 
 from nlb.buffham import schema_bh
 from nlb.util import dataclass
@@ -11,15 +14,40 @@ COMMENT_REGEX = re.compile(r'^\s*#(.*)$')
 INLINE_COMMENT_REGEX = re.compile(r'.*#(.*)')
 CONSTANT_REGEX = re.compile(r'^constant (\w+) (\w+) = (.+);')
 IMPORT_REGEX = re.compile(r'^import ([\w|\.]+);')
-FIELD_REGEX = re.compile(r'^\s*(optional)?\s*([\w|\[|\]|\.]+)\s+(\w+);')
-MESSAGE_START_REGEX = re.compile(r'^message (\w+) {')
+FIELD_REGEX = re.compile(
+    r'^\s*(optional)?\s*(?:(packed)\s+)?(?:(rle)\s+)?([\w|\[|\]|\.]+)\s+(\w+);'
+)
+MESSAGE_START_REGEX = re.compile(r'^(packed )?message (\w+) {')
 MESSAGE_END_REGEX = re.compile(r'^}')
-TRANSACTION_REGEX = re.compile(r'^transaction (\w+)\[([\w|\.]+), ([\w|\.]+)\]')
-PUBLISH_REGEX = re.compile(r'^publish (\w+)\[([\w|\.]+)\]')
+TRANSACTION_REGEX = re.compile(
+    r'^transaction (\w+)\[([\w|\.]+), ([\w|\.]+)\](?:\s*=\s*(\d+))?'
+)
+PUBLISH_REGEX = re.compile(r'^publish (\w+)\[([\w|\.]+)\](?:\s*=\s*(\d+))?')
 SVR_METHOD_REGEX = re.compile(r'^svr_method (\w+);')
 ENUM_START_REGEX = re.compile(r'^enum (\w+) {')
 ENUM_END_REGEX = re.compile(r'^}')
 ENUM_VALUE_REGEX = re.compile(r'^\s*(\w+)\s*=\s*(\d+);')
+CONSTANT_REFERENCE_REGEX = re.compile(r'{([\w|\.]+)}')
+
+# Keywords that start a top-level definition, and whether the definition
+# spans lines up to a closing `}`
+KEYWORDS = {
+    'import': False,
+    'enum': True,
+    'message': True,
+    'transaction': False,
+    'publish': False,
+    'constant': False,
+    'svr_method': False,
+}
+
+# Request IDs that are only given explicitly (e.g. `transaction foo[A, B] = 254;`)
+# rather than numbered, so they can be appended to a schema that others import
+# without renumbering them. They stay below `0xFF`, which frame headers reserve
+EXPLICIT_REQUEST_IDS = range(0x80, 0xFF)
+
+# Modifier that may precede the `message` keyword
+PACKED_PREFIX = 'packed '
 
 # Size map for each field type
 #
@@ -61,12 +89,78 @@ FORMAT_MAP = {
     schema_bh.FieldType.BYTES: 'N/A',
 }
 
+# Integer types, which `packed` fields encode as LEB128 varints; signed types
+# are zigzag encoded first, so small negative values stay small
+UNSIGNED_TYPES = (
+    schema_bh.FieldType.UINT8_T,
+    schema_bh.FieldType.UINT16_T,
+    schema_bh.FieldType.UINT32_T,
+    schema_bh.FieldType.UINT64_T,
+)
+SIGNED_TYPES = (
+    schema_bh.FieldType.INT8_T,
+    schema_bh.FieldType.INT16_T,
+    schema_bh.FieldType.INT32_T,
+    schema_bh.FieldType.INT64_T,
+)
+
 
 class NamedEntry(dataclass.DataclassLike, Protocol):
     @property
     def name(self) -> str: ...
 
 
+@dataclasses.dataclass
+class Statement:
+    """A top-level definition, as scanned from a file."""
+
+    keyword: str
+    # Lines from the keyword through the closing `}`, if the definition has one
+    lines: list[str]
+    # Comment lines directly above the definition
+    comments: list[str]
+    # 1-based line number of the first line
+    line_number: int
+
+
+def scan(lines: list[str]) -> list[Statement]:
+    """Split a file's lines into top-level definitions in a single pass."""
+    statements = []
+    comments = []
+    numbered_lines = enumerate(lines, start=1)
+    for line_number, line in numbered_lines:
+        if match := COMMENT_REGEX.match(line):
+            comments.append(match.groups()[0])
+            continue
+
+        keyword = line.removeprefix(PACKED_PREFIX).split(' ', 1)[0]
+        if keyword not in KEYWORDS:
+            # Anything else separates comments from the next definition
+            comments = []
+            continue
+
+        statement = Statement(keyword, [line], comments, line_number)
+        if KEYWORDS[keyword]:
+            # Consume the body from the same iterator
+            for body_number, body_line in numbered_lines:
+                statement.lines.append(body_line)
+                if body_line.startswith('}'):
+                    break
+                if MESSAGE_START_REGEX.match(body_line) or ENUM_START_REGEX.match(
+                    body_line
+                ):
+                    raise ValueError(
+                        f'line {body_number}: Nested definitions are not supported'
+                    )
+            else:
+                raise ValueError(f'line {line_number}: Mismatched brackets')
+
+        statements.append(statement)
+        comments = []
+
+    return statements
+
+
 def full_name(entry_name: schema_bh.Name) -> str:
     """Get the full name of the entry."""
     if not entry_name.namespace:
@@ -81,6 +175,15 @@ def relative_name(entry_name: schema_bh.Name, cur_namespace: str) -> str:
     return full_name(entry_name)
 
 
+def numbered_request_ids(bh: schema_bh.Buffham) -> list[int]:
+    """Get the request IDs a Buffham was numbered, i.e. not given explicitly."""
+    return [
+        request.request_id
+        for request in (*bh.transactions, *bh.publishes)
+        if request.request_id not in EXPLICIT_REQUEST_IDS
+    ]
+
+
 def is_field_iterable(field: schema_bh.Field) -> bool:
     """Check if the field is iterable."""
     return field.pri_type in (
@@ -90,6 +193,88 @@ def is_field_iterable(field: schema_bh.Field) -> bool:
     )
 
 
+def is_field_numeric_list(field: schema_bh.Field) -> bool:
+    """Check if the field is a list of integers or floats."""
+    return field.pri_type is schema_bh.FieldType.LIST and field.sub_type not in (
+        schema_bh.FieldType.BOOL,
+        schema_bh.FieldType.ENUM,
+        schema_bh.FieldType.MESSAGE,
+        schema_bh.FieldType.STRING,
+        schema_bh.FieldType.BYTES,
+    )
+
+
+def is_field_packable(field: schema_bh.Field) -> bool:
+    """Check if the field has a length or integer for `packed` to encode."""
+    return is_field_iterable(field) or field.pri_type in (
+        *UNSIGNED_TYPES,
+        *SIGNED_TYPES,
+    )
+
+
+def is_field_rle_able(field: schema_bh.Field) -> bool:
+    """Check if the field holds bytes for `rle` to run-length encode."""
+    return field.pri_type is schema_bh.FieldType.BYTES or (
+        field.pri_type is schema_bh.FieldType.LIST
+        and field.sub_type is schema_bh.FieldType.UINT8_T
+    )
+
+
+def is_field_fixed(field: schema_bh.Field) -> bool:
+    """Check if the field always takes the same number of bytes on the wire."""
+    if field.is_optional or field.is_packed:
+        return False
+    return field.pri_type not in (
+        schema_bh.FieldType.LIST,
+        schema_bh.FieldType.STRING,
+        schema_bh.FieldType.BYTES,
+        schema_bh.FieldType.MESSAGE,
+    )
+
+
+def fixed_size(message: schema_bh.Message) -> int | None:
+    """Get the message's size on the wire, if every field is fixed-size."""
+    if not message.fields or not all(is_field_fixed(f) for f in message.fields):
+        return None
+    return sum(SIZE_MAP[f.pri_type] for f in message.fields)
+
+
+# Iterable fields are prefixed with a `uint16_t` length (a varint, if packed);
+# `rle` fields count their encoded bytes
+MAX_LENGTH = 0xFFFF
+
+
+def varint_size(value: int) -> int:
+    """Get the number of bytes a non-negative value takes as a LEB128 varint."""
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def _length_size_range(field: schema_bh.Field) -> tuple[int, int]:
+    """Get the size range of an iterable field's length prefix."""
+    if field.is_packed:
+        return 1, varint_size(MAX_LENGTH)
+    return 2, 2
+
+
+def framed_size(size: int, header_size: int = 1) -> int:
+    """Get the worst-case size of a message of `size` bytes framed by `BhCobs`.
+
+    Frames are the request ID (or a `header_size` byte frame header) and
+    message, COBS encoded (adding up to a byte per 254), then a null delimiter.
+    """
+    size += header_size
+    return size + 1 + size // 0xFE + 1
+
+
+@functools.cache
+def _parser_version() -> bytes:
+    """Get a digest of the parser and schema sources, to key cached schemas by."""
+    digest = hashlib.sha256()
+    for module in (__file__, schema_bh.__file__):
+        digest.update(pathlib.Path(module).read_bytes())
+    return digest.digest()
+
+
 @dataclasses.dataclass
 class Parser:
     # Maps `[parent_namespace].[name]` to Buffhams
@@ -100,6 +285,13 @@ class Parser:
     cur_namespace: schema_bh.Name = dataclasses.field(
         default_factory=lambda: schema_bh.Name('', '')
     )
+    # Directory of parsed schemas (as `.bhb` files) to reuse, if any
+    cache_dir: pathlib.Path | None = None
+    # Named entries by `Buffham` attribute, keyed by their names relative to
+    # the namespace they were indexed from (see `find`)
+    _indices: dict[str, tuple[str, dict[str, int], dict[str, Any]]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     @property
     def cur_buffham(self) -> schema_bh.Buffham:
@@ -135,6 +327,115 @@ class Parser:
             for constant in buffham.constants:
                 yield constant, schema_bh.Name(constant.name, full_name(buffham.name))
 
+    def get_message(self, name: schema_bh.Name) -> schema_bh.Message:
+        """Get a message in the context by its name."""
+        return next(
+            m for m in self.buffhams[name.namespace].messages if m.name == name.name
+        )
+
+    def size_range(self, message: schema_bh.Message) -> tuple[int, int]:
+        """Get the smallest and largest sizes a message serializes to.
+
+        The smallest has every optional field unset and every iterable empty;
+        the largest sets every optional field and fills every iterable to its
+        maximum length.
+        """
+        min_size = max_size = (sum(f.is_optional for f in message.fields) + 7) // 8
+        for field in message.fields:
+            if field.pri_type is schema_bh.FieldType.LIST:
+                assert field.sub_type is not None
+                _, item_max = self._type_size_range(field.sub_type, field)
+                field_min, field_max = _length_size_range(field)
+                field_max += MAX_LENGTH * item_max
+            else:
+                field_min, field_max = self._type_size_range(field.pri_type, field)
+            min_size += 0 if field.is_optional else field_min
+            max_size += field_max
+        return min_size, max_size
+
+    def _type_size_range(
+        self, field_type: schema_bh.FieldType, field: schema_bh.Field
+    ) -> tuple[int, int]:
+        """Get the size range of a field's type, or its list items' type."""
+        match field_type:
+            case schema_bh.FieldType.MESSAGE:
+                assert field.obj_name is not None
+                return self.size_range(self.get_message(field.obj_name))
+            case schema_bh.FieldType.STRING | schema_bh.FieldType.BYTES:
+                length_min, length_max = _length_size_range(field)
+                return length_min, length_max + MAX_LENGTH
+            case _ if field.is_packed and field_type in (
+                *UNSIGNED_TYPES,
+                *SIGNED_TYPES,
+            ):
+                # Zigzag encoding keeps signed values to the same number of bits
+                return 1, varint_size((1 << 8 * SIZE_MAP[field_type]) - 1)
+            case _:
+                return SIZE_MAP[field_type], SIZE_MAP[field_type]
+
+    def request_ids(self) -> dict[int, schema_bh.Name]:
+        """Map the context's request IDs to their transactions and publishes.
+
+        Schemas built separately (e.g. two projects on a common base) may
+        reuse request IDs, which would make them impossible to dispatch
+        together; that is caught here rather than at runtime.
+
+        Raises:
+            ValueError: If two transactions or publishes share a request ID
+        """
+        request_ids: dict[int, schema_bh.Name] = {}
+        for buffham in self.buffhams.values():
+            for request in (*buffham.transactions, *buffham.publishes):
+                name = schema_bh.Name(request.name, full_name(buffham.name))
+                other = request_ids.setdefault(request.request_id, name)
+                if other != name:
+                    raise ValueError(
+                        f'Request ID {request.request_id} is used by both '
+                        f'{full_name(other)} and {full_name(name)}'
+                    )
+        return request_ids
+
+    def _index(self, kind: str) -> dict[str, Any]:
+        """Index entries by their names relative to the current namespace.
+
+        Args:
+            kind: `Buffham` attribute to index, i.e. `messages`, `enums` or
+                `constants`
+
+        Returns:
+            `(entry, name, position)`s by relative name, in context order
+        """
+        namespace, counts, index = self._indices.get(kind, ('', {}, {}))
+        if namespace != self.cur_namespace_str:
+            namespace, counts, index = self.cur_namespace_str, {}, {}
+
+        # Entries are only ever appended, so only index the new ones
+        for key, bh in self.buffhams.items():
+            entries = getattr(bh, kind)
+            for entry in entries[counts.get(key, 0) :]:
+                entry_name = schema_bh.Name(entry.name, full_name(bh.name))
+                index.setdefault(
+                    relative_name(entry_name, namespace),
+                    (entry, entry_name, len(index)),
+                )
+            counts[key] = len(entries)
+        self._indices[kind] = (namespace, counts, index)
+        return index
+
+    def find(self, kind: str, name: str) -> tuple[Any, schema_bh.Name | None]:
+        """Find the first entry in the context with a relative name.
+
+        Args:
+            kind: `Buffham` attribute to search, i.e. `messages`, `enums` or
+                `constants`
+            name: Name of the entry, relative to the current namespace
+
+        Returns:
+            The entry and its name, or a pair of `None`s
+        """
+        entry, entry_name, _ = self._index(kind).get(name, (None, None, None))
+        return entry, entry_name
+
     def parse_message_field(self, line: str, comments: list[str]) -> schema_bh.Field:
         """Parse a field from a line.
 
@@ -142,6 +443,8 @@ class Parser:
         - `uint8_t foo;`
         - `string bar;`
         - `list[float32] baz_2;`
+        - `optional packed uint32_t qux;`
+        - `rle list[uint8_t] quux;`
         """
         match = FIELD_REGEX.match(line)
         if not match:
@@ -149,8 +452,10 @@ class Parser:
         parts = match.groups()
 
         optional = parts[0] is not None
-        pri_type = parts[1]
-        name = parts[2]
+        packed = parts[1] is not None
+        rle = parts[2] is not None
+        pri_type = parts[3]
+        name = parts[4]
 
         if (pri_type_str := pri_type.upper()) in schema_bh.FieldType._member_names_:
             sub_type = None
@@ -158,14 +463,7 @@ class Parser:
             obj_name = None
         elif pri_type.startswith('list['):
             sub_type_str = pri_type[5:-1]
-            message, message_name = next(
-                filter(
-                    lambda x: relative_name(x[1], self.cur_namespace_str)
-                    == sub_type_str,
-                    self.iter_messages(),
-                ),
-                (None, None),
-            )
+            message, message_name = self.find('messages', sub_type_str)
             if message is not None:
                 sub_type = schema_bh.FieldType.MESSAGE
                 obj_name = message_name
@@ -176,20 +474,8 @@ class Parser:
                 raise ValueError(f'Invalid sub-field type {sub_type_str}')
             pri_type = schema_bh.FieldType.LIST
         else:
-            message, message_name = next(
-                filter(
-                    lambda x: relative_name(x[1], self.cur_namespace_str) == pri_type,
-                    self.iter_messages(),
-                ),
-                (None, None),
-            )
-            enum, enum_name = next(
-                filter(
-                    lambda x: relative_name(x[1], self.cur_namespace_str) == pri_type,
-                    self.iter_enums(),
-                ),
-                (None, None),
-            )
+            message, message_name = self.find('messages', pri_type)
+            enum, enum_name = self.find('enums', pri_type)
             if message is None and enum is None:
                 raise ValueError(f'Invalid field type {pri_type}')
             if message is not None and enum is not None:
@@ -211,7 +497,7 @@ class Parser:
             inline_comment_match.groups()[0] if inline_comment_match else None
         )
 
-        return schema_bh.Field(
+        field = schema_bh.Field(
             name,
             pri_type,
             sub_type,
@@ -219,7 +505,16 @@ class Parser:
             obj_name,
             comments,
             inline_comment,
+            packed,
+            rle,
         )
+        if packed and not is_field_packable(field):
+            raise ValueError(f'Field {name} has no integers or lengths to pack')
+        if rle and not is_field_rle_able(field):
+            raise ValueError(
+                f'Field {name} is not `bytes` or `list[uint8_t]` to encode'
+            )
+        return field
 
     def parse_message(
         self,
@@ -230,26 +525,51 @@ class Parser:
 
         Messages are arranged as:
         ```
-        message [name] {
+        [packed] message [name] {
         [field] (repeated)
         }
         ```
+
+        Packed messages pack every field that can be.
         """
         match = MESSAGE_START_REGEX.match(lines[0])
         if not match:
             raise ValueError(f'Invalid message line: {lines[0]}')
 
-        name = match.groups()[0]
+        packed, name = match.groups()
         fields = []
         field_comments = []
         for line in lines[1:-1]:
             if comment_match := COMMENT_REGEX.match(line):
                 field_comments.append(comment_match.groups()[0])
             else:
-                fields.append(self.parse_message_field(line, field_comments))
+                field = self.parse_message_field(line, field_comments)
+                if packed and is_field_packable(field):
+                    field.is_packed = True
+                fields.append(field)
                 field_comments = []
         return schema_bh.Message(name, fields, comments)
 
+    def next_request_id(self, explicit_id: str | None) -> int:
+        """Check an explicit request ID, or number the next one."""
+        if explicit_id is not None:
+            request_id = int(explicit_id)
+            if request_id not in EXPLICIT_REQUEST_IDS:
+                raise ValueError(
+                    f'Explicit request ID {request_id} is not in '
+                    f'[{EXPLICIT_REQUEST_IDS.start}, {EXPLICIT_REQUEST_IDS.stop})'
+                )
+            return request_id
+
+        if self.request_id >= EXPLICIT_REQUEST_IDS.start:
+            raise ValueError(
+                f'Out of request IDs to number; {EXPLICIT_REQUEST_IDS.start} '
+                'and up are only given explicitly'
+            )
+        request_id = self.request_id
+        self.request_id += 1
+        return request_id
+
     def parse_transaction(
         self, line: str, comments: list[str]
     ) -> schema_bh.Transaction:
@@ -257,6 +577,7 @@ class Parser:
 
         Transactions are arranged as:
         - `transaction [name][[receive], [send]]`
+        - `transaction [name][[receive], [send]] = [request ID]`
 
         (Note the double brackets)
         """
@@ -265,27 +586,15 @@ class Parser:
         if not match:
             raise ValueError(f'Invalid transaction line: {line}')
 
-        name, receive, send = match.groups()
-        try:
-            receive, receive_name = next(
-                filter(
-                    lambda x: relative_name(x[1], self.cur_namespace_str) == receive,
-                    self.iter_messages(),
-                )
-            )
-            send, send_name = next(
-                filter(
-                    lambda x: relative_name(x[1], self.cur_namespace_str) == send,
-                    self.iter_messages(),
-                )
-            )
-        except StopIteration:
+        name, receive, send, explicit_id = match.groups()
+        _, receive_name = self.find('messages', receive)
+        _, send_name = self.find('messages', send)
+        if receive_name is None or send_name is None:
             raise ValueError(
                 f'Invalid message name(s) {receive=} {send=} in transaction'
             )
 
-        request_id = self.request_id
-        self.request_id += 1
+        request_id = self.next_request_id(explicit_id)
 
         inline_comment_match = INLINE_COMMENT_REGEX.match(line)
         inline_comment = (
@@ -306,6 +615,7 @@ class Parser:
 
         Publishes are arranged as:
         - `publish [name][[send]]`
+        - `publish [name][[send]] = [request ID]`
 
         (Note the double brackets)
         """
@@ -314,19 +624,12 @@ class Parser:
         if not match:
             raise ValueError(f'Invalid publish line: {line}')
 
-        name, send = match.groups()
-        try:
-            send, send_name = next(
-                filter(
-                    lambda x: relative_name(x[1], self.cur_namespace_str) == send,
-                    self.iter_messages(),
-                )
-            )
-        except StopIteration:
+        name, send, explicit_id = match.groups()
+        _, send_name = self.find('messages', send)
+        if send_name is None:
             raise ValueError(f'Invalid message name(s) {send=} in transaction')
 
-        request_id = self.request_id
-        self.request_id += 1
+        request_id = self.next_request_id(explicit_id)
 
         inline_comment_match = INLINE_COMMENT_REGEX.match(line)
         inline_comment = (
@@ -394,19 +697,21 @@ class Parser:
             inline_comment_match.groups()[0] if inline_comment_match else None
         )
 
-        # Expand references to other constants
+        # Expand references to other constants, in context order
+        index = self._index('constants')
+        references = sorted(
+            {
+                reference
+                for reference in CONSTANT_REFERENCE_REGEX.findall(value)
+                if reference in index
+            },
+            key=lambda reference: index[reference][2],
+        )
         expanded_value = value
-        references = []
-        for constant, constant_name in self.iter_constants():
-            if re.match(
-                rf'.*{{({relative_name(constant_name, self.cur_namespace_str)})}}',
-                value,
-            ):
-                references.append(relative_name(constant_name, self.cur_namespace_str))
-                expanded_value = expanded_value.replace(
-                    f'{{{relative_name(constant_name, self.cur_namespace_str)}}}',
-                    constant.expanded_value,
-                )
+        for reference in references:
+            expanded_value = expanded_value.replace(
+                f'{{{reference}}}', index[reference][0].expanded_value
+            )
 
         return schema_bh.Constant(
             name, type_, value, expanded_value, comments, inline_comment, references
@@ -457,94 +762,59 @@ class Parser:
 
         return schema_bh.Enum(name, fields, comments)
 
-    def parse_singleline_definition[T: NamedEntry](
-        self,
-        lines: list[str],
-        regex: re.Pattern,
-        parse_fn: Callable[[str, list[str]], T],
-        bh_entry: list[T],
-    ) -> None:
-        # Use regex to find all starting indices of definitions
-        # (i.e. `message [name] {`)
-        indices = [i for i, line in enumerate(lines) if regex.match(line)]
+    def parse_import(self, line: str, comments: list[str]) -> None:
+        """Check an import from a line.
 
-        comments = []
-        comment_index = 0
-        for i in indices:
-            while comment_index < i:
-                if match := COMMENT_REGEX.match(lines[comment_index]):
-                    comments.append(match.groups()[0])
-                else:
-                    comments = []
-                comment_index += 1
-
-            bh_entry.append(parse_fn(lines[i], comments))
-
-    def parse_multiline_definition[T: NamedEntry](
-        self,
-        lines: list[str],
-        start_regex: re.Pattern,
-        end_regex: re.Pattern,
-        parse_fn: Callable[[list[str], list[str]], T],
-        bh_entry: list[T],
-    ) -> None:
-        # Use regex to find all starting indices of definitions
-        # (i.e. `message [name] {`)
-        start_indices = [i for i, line in enumerate(lines) if start_regex.match(line)]
-
-        # Find the end of each definition
-        # (i.e. `}`)
-        end_indices = [i for i, line in enumerate(lines) if end_regex.match(line)]
-
-        prev_end = -1
-        comments = []
-        comment_index = 0
-        for start in start_indices:
-            if start < prev_end:
-                raise ValueError('Nested definitions are not supported')
-
-            end = next((e for e in end_indices if e > start), None)
-            if end is None:
-                raise ValueError('Mismatched brackets')
-
-            while comment_index < start:
-                if match := COMMENT_REGEX.match(lines[comment_index]):
-                    comments.append(match.groups()[0])
-                else:
-                    # Clear out comments; no longer matches with the next definition
-                    comments = []
-                comment_index += 1
-
-            bh_entry.append(parse_fn(lines[start : end + 1], comments))
-
-            prev_end = end
-
-    def parse_imports(self, lines: list[str]) -> None:
-        for line in lines:
-            if match := IMPORT_REGEX.match(line):
-                full_name = match.groups()[0]
-                if full_name not in self.buffhams:
-                    raise ValueError(f'Unknown import {full_name}')
+        Imports are arranged as:
+        - `import [namespace];`
+
+        The imported Buffham must already be in the context.
+        """
+        match = IMPORT_REGEX.match(line)
+        if not match:
+            raise ValueError(f'Invalid import line: {line}')
+
+        full_name = match.groups()[0]
+        if full_name not in self.buffhams:
+            raise ValueError(f'Unknown import {full_name}')
 
         # Do nothing with the imports, including imports in our context that are not used.
 
+    def cache_key(self, contents: bytes, parent_namespace: str) -> str:
+        """Key a schema's parsed form by everything that parsing depends on.
+
+        Besides the schema's contents, that's the parser itself, the namespace,
+        the next request ID, and the Buffhams that may be referenced.
+        """
+        digest = hashlib.sha256(_parser_version())
+        digest.update(parent_namespace.encode() + b'\0')
+        digest.update(self.request_id.to_bytes(8, 'little'))
+        for name, bh in self.buffhams.items():
+            digest.update(name.encode() + b'\0')
+            digest.update(bh.serialize())
+        digest.update(contents)
+        return digest.hexdigest()
+
+    def add_buffham(self, bh: schema_bh.Buffham) -> None:
+        """Add an already-parsed Buffham (e.g. a dependency) to the context."""
+        self.buffhams[full_name(bh.name)] = bh
+        self.cur_namespace = bh.name
+        self.request_id = (
+            max(
+                self.request_id - 1,
+                0,  # Ensure there's at least 2 elements
+                *numbered_request_ids(bh),
+            )
+            + 1
+        )
+
     def parse_file(
         self, file: pathlib.Path, parent_namespace: str | None = None
     ) -> schema_bh.Buffham:
         # Handle binary Buffham files
         if file.suffix == '.bhb':
             bh, _ = schema_bh.Buffham.deserialize(file.read_bytes())
-            self.buffhams[full_name(bh.name)] = bh
-            self.cur_namespace = bh.name
-            self.request_id = (
-                max(
-                    self.request_id - 1,
-                    0,  # Ensure there's at least 2 elements
-                    *(t.request_id for t in bh.transactions),
-                    *(p.request_id for p in bh.publishes),
-                )
-                + 1
-            )
+            self.add_buffham(bh)
             return bh
 
         # Determine the namespace
@@ -553,53 +823,62 @@ class Parser:
         name = schema_bh.Name(file.stem, parent_namespace)
         self.cur_namespace = name
 
+        if full_name(name) in self.buffhams:
+            raise ValueError(f'Duplicate Buffham namespace: {name}')
+
+        contents = file.read_bytes()
+        cached = None
+        if self.cache_dir is not None:
+            key = self.cache_key(contents, parent_namespace)
+            cached = self.cache_dir / f'{key}.bhb'
+            if cached.exists():
+                bh, _ = schema_bh.Buffham.deserialize(cached.read_bytes())
+                self.buffhams[full_name(bh.name)] = bh
+                # Pick up request IDs where parsing would have left them
+                self.request_id += len(numbered_request_ids(bh))
+                return bh
+
         # Insert a new Buffham into the context
         bh = schema_bh.Buffham(name, [], [], [], [], [], [])
-        if full_name(bh.name) in self.buffhams:
-            raise ValueError(f'Duplicate Buffham namespace: {bh.name}')
         self.buffhams[full_name(bh.name)] = bh
 
-        lines = file.read_text().splitlines()
-
-        self.parse_imports(lines)
-        # Enums must be parsed before messages
-        self.parse_multiline_definition(
-            lines,
-            ENUM_START_REGEX,
-            ENUM_END_REGEX,
-            self.parse_enum,
-            bh.enums,
-        )
-        self.parse_multiline_definition(
-            lines,
-            MESSAGE_START_REGEX,
-            MESSAGE_END_REGEX,
-            self.parse_message,
-            bh.messages,
-        )
-        self.parse_singleline_definition(
-            lines,
-            TRANSACTION_REGEX,
-            self.parse_transaction,
-            bh.transactions,
-        )
-        self.parse_singleline_definition(
-            lines,
-            PUBLISH_REGEX,
-            self.parse_publish,
-            bh.publishes,
-        )
-        self.parse_singleline_definition(
-            lines,
-            CONSTANT_REGEX,
-            self.parse_constant,
-            bh.constants,
-        )
-        self.parse_singleline_definition(
-            lines,
-            SVR_METHOD_REGEX,
-            self.parse_svr_method,
-            bh.svr_methods,
-        )
+        try:
+            statements = scan(contents.decode().splitlines())
+        except ValueError as e:
+            raise ValueError(f'{file}, {e}') from e
+
+        by_keyword: dict[str, list[Statement]] = {keyword: [] for keyword in KEYWORDS}
+        for statement in statements:
+            by_keyword[statement.keyword].append(statement)
+
+        # Definitions are parsed in an order that resolves references to
+        # them, so e.g. enums may be used by messages defined before them
+        parsers: list[tuple[str, Callable[..., Any], list | None]] = [
+            ('import', self.parse_import, None),
+            ('enum', self.parse_enum, bh.enums),
+            ('message', self.parse_message, bh.messages),
+            ('transaction', self.parse_transaction, bh.transactions),
+            ('publish', self.parse_publish, bh.publishes),
+            ('constant', self.parse_constant, bh.constants),
+            ('svr_method', self.parse_svr_method, bh.svr_methods),
+        ]
+        for keyword, parse_fn, entries in parsers:
+            for statement in by_keyword[keyword]:
+                lines = statement.lines if KEYWORDS[keyword] else statement.lines[0]
+                try:
+                    entry = parse_fn(lines, statement.comments)
+                except ValueError as e:
+                    raise ValueError(
+                        f'{file}, line {statement.line_number}: {e}'
+                    ) from e
+                if entries is not None:
+                    entries.append(entry)
+
+        if cached is not None:
+            # Write atomically, in case another process reads it meanwhile
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            partial = cached.with_suffix(f'.{os.getpid()}.partial')
+            partial.write_bytes(bh.serialize())
+            partial.replace(cached)
 
         return bh
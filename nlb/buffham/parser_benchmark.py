@@ -0,0 +1,94 @@
+"""Benchmark parsing large, generated Buffham schemas.
+
+Schemas are generated with a mix of every kind of definition, scaled by the
+number of messages, to show how parsing scales with the size of a file.
+"""
+
+import pathlib
+import tempfile
+import timeit
+
+import rich_click as click
+
+from nlb.buffham import parser
+
+
+def generate_schema(num_messages: int) -> str:
+    """Generate a schema with `num_messages` messages and similar definitions."""
+    lines = []
+    for i in range(max(num_messages // 10, 1)):
+        lines += [
+            f'# Enum {i}',
+            f'enum Enum{i} {{',
+            '    A = 0;',
+            '    # Comment on B',
+            '    B = 1;  # Inline comment on B',
+            '}',
+            '',
+        ]
+    for i in range(num_messages):
+        lines += [
+            f'# Message {i}',
+            '# spans a couple of lines',
+            f'message Message{i} {{',
+            '    # Field comment',
+            '    uint32_t address;',
+            '    optional list[uint8_t] data;  # Inline comment',
+            f'    Enum{i // 10} verbosity;',
+        ]
+        if i:
+            lines.append(f'    Message{i - 1} previous;')
+        lines += ['}', '']
+    for i in range(num_messages):
+        lines += [
+            f'# Transaction {i}',
+            f'transaction transaction_{i}[Message{i}, Message{i}];',
+            f'publish publish_{i}[Message{i}];',
+            f'constant uint32_t constant_{i} = {i};',
+            f'svr_method method_{i};',
+            '',
+        ]
+    return '\n'.join(lines)
+
+
+@click.command()
+@click.option(
+    '--num-messages',
+    '-n',
+    type=int,
+    multiple=True,
+    default=[10, 100, 1000],
+    show_default=True,
+    help='Number of messages in each schema',
+)
+@click.option(
+    '--repeat',
+    type=int,
+    default=3,
+    show_default=True,
+    help='Number of timing runs to take the best of',
+)
+def main(num_messages: list[int], repeat: int) -> None:
+    print(f'{"messages":>10}{"lines":>10}{"seconds":>12}{"lines/s":>14}')
+    with tempfile.TemporaryDirectory() as tempdir:
+        for n in num_messages:
+            schema = pathlib.Path(tempdir) / f'schema_{n}.bh'
+            schema.write_text(generate_schema(n))
+            num_lines = len(schema.read_text().splitlines())
+
+            seconds = min(
+                timeit.repeat(
+                    lambda schema=schema: parser.Parser().parse_file(
+                        schema, parent_namespace=''
+                    ),
+                    number=1,
+                    repeat=repeat,
+                )
+            )
+            print(
+                f'{n:>10}{num_lines:>10}{seconds:>12.4f}{num_lines / seconds:>14,.0f}'
+            )
+
+
+if __name__ == '__main__':
+    main(prog_name='parser_benchmark')
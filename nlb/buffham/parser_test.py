@@ -1,5 +1,8 @@
+import dataclasses
 import pathlib
+import tempfile
 import unittest
+from unittest import mock
 
 from nlb.buffham import parser
 from nlb.buffham import schema_bh
@@ -27,6 +30,8 @@ class TestParserSimple(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
         )
 
@@ -43,6 +48,8 @@ class TestParserSimple(unittest.TestCase):
                 None,
                 [],
                 ' inline comment',
+                False,
+                False,
             ),
         )
 
@@ -59,6 +66,8 @@ class TestParserSimple(unittest.TestCase):
                 None,
                 ['some other', 'read-in comments'],
                 None,
+                False,
+                False,
             ),
         )
 
@@ -75,6 +84,8 @@ class TestParserSimple(unittest.TestCase):
                 None,
                 [],
                 None,
+                False,
+                False,
             ),
         )
 
@@ -93,6 +104,8 @@ class TestParserSimple(unittest.TestCase):
                 schema_bh.Name(message.name, 'test'),
                 [],
                 None,
+                False,
+                False,
             ),
         )
 
@@ -109,6 +122,8 @@ class TestParserSimple(unittest.TestCase):
                 None,
                 [],
                 ' optional field',
+                False,
+                False,
             ),
         )
 
@@ -137,6 +152,8 @@ class TestParserSimple(unittest.TestCase):
                 schema_bh.Name(my_message.name, 'test'),
                 [],
                 None,
+                False,
+                False,
             ),
         )
 
@@ -145,6 +162,52 @@ class TestParserSimple(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.ctx.parse_message_field(field, [])
 
+        # Packed field
+        field = 'optional packed int64_t qux;'
+        parsed = self.ctx.parse_message_field(field, [])
+        self.assertEqual(
+            parsed,
+            schema_bh.Field(
+                'qux',
+                schema_bh.FieldType.INT64_T,
+                None,
+                True,
+                None,
+                [],
+                None,
+                True,
+                False,
+            ),
+        )
+
+        # Packed fields need integers or lengths to pack
+        for field in ('packed float32 qux_2;', 'packed MyMessage qux_3;'):
+            with self.assertRaises(ValueError):
+                self.ctx.parse_message_field(field, [])
+
+        # Run-length encoded field
+        field = 'packed rle list[uint8_t] quux;'
+        parsed = self.ctx.parse_message_field(field, [])
+        self.assertEqual(
+            parsed,
+            schema_bh.Field(
+                'quux',
+                schema_bh.FieldType.LIST,
+                schema_bh.FieldType.UINT8_T,
+                False,
+                None,
+                [],
+                None,
+                True,
+                True,
+            ),
+        )
+
+        # Only bytes can be run-length encoded
+        for field in ('rle list[uint16_t] quux_2;', 'rle string quux_3;'):
+            with self.assertRaises(ValueError):
+                self.ctx.parse_message_field(field, [])
+
     def test_parse_message(self):
         message = [
             'message Ping {',
@@ -165,6 +228,8 @@ class TestParserSimple(unittest.TestCase):
                         None,
                         [],
                         None,
+                        False,
+                        False,
                     )
                 ],
                 [],
@@ -193,6 +258,8 @@ class TestParserSimple(unittest.TestCase):
                         None,
                         [],
                         None,
+                        False,
+                        False,
                     ),
                     schema_bh.Field(
                         'read_size',
@@ -202,6 +269,8 @@ class TestParserSimple(unittest.TestCase):
                         None,
                         [],
                         ' inline comment',
+                        False,
+                        False,
                     ),
                     schema_bh.Field(
                         'data',
@@ -211,6 +280,8 @@ class TestParserSimple(unittest.TestCase):
                         None,
                         [' out-of-line comment'],
                         None,
+                        False,
+                        False,
                     ),
                 ],
                 [],
@@ -247,6 +318,8 @@ class TestParserSimple(unittest.TestCase):
                         schema_bh.Name(inner.name, 'test'),
                         [],
                         None,
+                        False,
+                        False,
                     )
                 ],
                 [],
@@ -261,6 +334,58 @@ class TestParserSimple(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.ctx.parse_message(message, [])
 
+        # Packed messages pack the fields that can be
+        message = [
+            'packed message Packed {',
+            '    list[float32] gains;',
+            '    float32 gain;',
+            '    Inner inner;',
+            '}',
+        ]
+        parsed = self.ctx.parse_message(message, [])
+        self.assertEqual(
+            parsed,
+            schema_bh.Message(
+                'Packed',
+                [
+                    schema_bh.Field(
+                        'gains',
+                        schema_bh.FieldType.LIST,
+                        schema_bh.FieldType.FLOAT32,
+                        False,
+                        None,
+                        [],
+                        None,
+                        True,
+                        False,
+                    ),
+                    schema_bh.Field(
+                        'gain',
+                        schema_bh.FieldType.FLOAT32,
+                        None,
+                        False,
+                        None,
+                        [],
+                        None,
+                        False,
+                        False,
+                    ),
+                    schema_bh.Field(
+                        'inner',
+                        schema_bh.FieldType.MESSAGE,
+                        None,
+                        False,
+                        schema_bh.Name(inner.name, 'test'),
+                        [],
+                        None,
+                        False,
+                        False,
+                    ),
+                ],
+                [],
+            ),
+        )
+
     def test_parse_transaction(self):
         transaction = 'transaction ping[Ping, LogMessage];'
         receive = schema_bh.Message(
@@ -274,6 +399,8 @@ class TestParserSimple(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 )
             ],
             [],
@@ -289,6 +416,8 @@ class TestParserSimple(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 )
             ],
             [],
@@ -342,6 +471,8 @@ class TestParserSimple(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 )
             ],
             [],
@@ -371,6 +502,8 @@ class TestParserSimple(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 )
             ],
             [],
@@ -496,6 +629,37 @@ class TestParserSimple(unittest.TestCase):
             self.ctx.parse_svr_method('svr_method missing_semicolon', [])
 
 
+class TestScan(unittest.TestCase):
+    def test_scan(self):
+        lines = [
+            'import foo.bar;',
+            '',
+            '# Dropped comment',
+            '',
+            '# Comment on `Foo`',
+            'message Foo {',
+            '    # Field comment',
+            '    uint8_t foo;',
+            '}',
+            'transaction foo[Foo, Foo];',
+        ]
+        self.assertEqual(
+            parser.scan(lines),
+            [
+                parser.Statement('import', ['import foo.bar;'], [], 1),
+                parser.Statement('message', lines[5:9], [' Comment on `Foo`'], 6),
+                parser.Statement('transaction', [lines[9]], [], 10),
+            ],
+        )
+
+    def test_scan_errors(self):
+        with self.assertRaisesRegex(ValueError, 'line 1: Mismatched brackets'):
+            parser.scan(['enum Foo {', '    A = 0;'])
+
+        with self.assertRaisesRegex(ValueError, 'line 3: Nested definitions'):
+            parser.scan(['message Foo {', '    uint8_t foo;', 'message Bar {', '}'])
+
+
 class TestParserSample(unittest.TestCase):
     def setUp(self) -> None:
         testdata_dir = pathlib.Path(__file__).parent / 'testdata'
@@ -538,6 +702,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [' Add some comments here'],
                     None,
+                    False,
+                    False,
                 )
             ],
             [' A message comment'],
@@ -553,6 +719,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'data',
@@ -562,6 +730,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [' Another field comment'],
                     ' What about some in-line comments for fields?',
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'read_size',
@@ -571,6 +741,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [' This comment belongs to `read_size`'],
                     ' Fields can be marked optional',
+                    False,
+                    False,
                 ),
             ],
             [
@@ -593,6 +765,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'verbosity',
@@ -602,6 +776,8 @@ class TestParserSample(unittest.TestCase):
                     schema_bh.Name(verbosity_enum.name, 'sample'),
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'my_enum',
@@ -611,6 +787,8 @@ class TestParserSample(unittest.TestCase):
                     schema_bh.Name(other.enums[0].name, 'nlb.buffham.testdata.other'),
                     [],
                     None,
+                    False,
+                    False,
                 ),
             ],
             [],
@@ -626,6 +804,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'message',
@@ -635,6 +815,8 @@ class TestParserSample(unittest.TestCase):
                     schema_bh.Name(log_message.name, 'sample'),
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'messages',
@@ -644,6 +826,8 @@ class TestParserSample(unittest.TestCase):
                     schema_bh.Name(log_message.name, 'sample'),
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'numbers',
@@ -653,6 +837,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'pong',
@@ -662,6 +848,8 @@ class TestParserSample(unittest.TestCase):
                     schema_bh.Name(ping.name, 'sample'),
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'other_pong',
@@ -673,6 +861,8 @@ class TestParserSample(unittest.TestCase):
                     ),
                     [],
                     None,
+                    False,
+                    False,
                 ),
             ],
             [],
@@ -688,6 +878,8 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 ),
                 schema_bh.Field(
                     'buffers',
@@ -697,10 +889,210 @@ class TestParserSample(unittest.TestCase):
                     None,
                     [],
                     None,
+                    False,
+                    False,
                 ),
             ],
             comments=[' Lists can be composed of variable-length strings and bytes'],
         )
+        packed_sample = schema_bh.Message(
+            'PackedSample',
+            [
+                schema_bh.Field(
+                    'counter',
+                    schema_bh.FieldType.UINT32_T,
+                    None,
+                    False,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'delta',
+                    schema_bh.FieldType.INT16_T,
+                    None,
+                    False,
+                    None,
+                    [],
+                    ' Signed integers are zigzag encoded',
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'timestamp',
+                    schema_bh.FieldType.INT64_T,
+                    None,
+                    True,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'label',
+                    schema_bh.FieldType.STRING,
+                    None,
+                    False,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'samples',
+                    schema_bh.FieldType.LIST,
+                    schema_bh.FieldType.UINT16_T,
+                    False,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'deltas',
+                    schema_bh.FieldType.LIST,
+                    schema_bh.FieldType.INT32_T,
+                    False,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'gains',
+                    schema_bh.FieldType.LIST,
+                    schema_bh.FieldType.FLOAT32,
+                    False,
+                    None,
+                    [],
+                    ' Only the length of a float list is packed',
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'tags',
+                    schema_bh.FieldType.LIST,
+                    schema_bh.FieldType.STRING,
+                    False,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'pings',
+                    schema_bh.FieldType.LIST,
+                    schema_bh.FieldType.MESSAGE,
+                    False,
+                    schema_bh.Name(ping.name, 'sample'),
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'enabled',
+                    schema_bh.FieldType.BOOL,
+                    None,
+                    False,
+                    None,
+                    [],
+                    ' Fields without integers or lengths are left as-is',
+                    False,
+                    False,
+                ),
+            ],
+            comments=[
+                ' Packed messages encode their integers and lengths as LEB128 varints'
+            ],
+        )
+        partly_packed = schema_bh.Message(
+            'PartlyPacked',
+            [
+                schema_bh.Field(
+                    'timestamp',
+                    schema_bh.FieldType.UINT64_T,
+                    None,
+                    False,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+                schema_bh.Field(
+                    'channel',
+                    schema_bh.FieldType.UINT8_T,
+                    None,
+                    False,
+                    None,
+                    [],
+                    None,
+                    False,
+                    False,
+                ),
+                schema_bh.Field(
+                    'payload',
+                    schema_bh.FieldType.BYTES,
+                    None,
+                    True,
+                    None,
+                    [],
+                    None,
+                    True,
+                    False,
+                ),
+            ],
+            comments=[' Fields can be packed one at a time, too'],
+        )
+        compressed_page = schema_bh.Message(
+            'CompressedPage',
+            [
+                schema_bh.Field(
+                    'address',
+                    schema_bh.FieldType.UINT32_T,
+                    None,
+                    False,
+                    None,
+                    [],
+                    None,
+                    False,
+                    False,
+                ),
+                schema_bh.Field(
+                    'data',
+                    schema_bh.FieldType.LIST,
+                    schema_bh.FieldType.UINT8_T,
+                    False,
+                    None,
+                    [],
+                    None,
+                    False,
+                    True,
+                ),
+                schema_bh.Field(
+                    'spare',
+                    schema_bh.FieldType.BYTES,
+                    None,
+                    True,
+                    None,
+                    [],
+                    None,
+                    True,
+                    True,
+                ),
+            ],
+            comments=[
+                ' Bytes can be run-length encoded, e.g. flash pages full of 0xFF'
+            ],
+        )
 
         parsed = self.ctx.parse_file(self.sample_file, parent_namespace='')
 
@@ -712,6 +1104,9 @@ class TestParserSample(unittest.TestCase):
                 log_message,
                 nested_message,
                 string_lists,
+                packed_sample,
+                partly_packed,
+                compressed_page,
             ],
         )
 
@@ -813,3 +1208,168 @@ class TestParserSample(unittest.TestCase):
                 ),
             ],
         )
+
+    def test_size_range(self):
+        self.ctx.parse_file(self.other_file, parent_namespace='nlb.buffham.testdata')
+        sample = self.ctx.parse_file(
+            self.sample_file, parent_namespace='nlb.buffham.testdata'
+        )
+        messages = {message.name: message for message in sample.messages}
+
+        self.assertEqual(self.ctx.size_range(messages['Ping']), (1, 1))
+        # Optional bitfield, address, data length (+ data) (+ read_size)
+        self.assertEqual(
+            self.ctx.size_range(messages['FlashPage']), (7, 1 + 4 + 2 + 0xFFFF + 4)
+        )
+        # Message length (+ message), verbosity, my_enum
+        log_message = (4, 2 + 0xFFFF + 2)
+        self.assertEqual(self.ctx.size_range(messages['LogMessage']), log_message)
+        self.assertEqual(
+            self.ctx.size_range(messages['NestedMessage']),
+            (
+                1 + log_message[0] + 2 + 2 + 1 + 1,
+                1
+                + 1
+                + log_message[1]
+                + 2
+                + 0xFFFF * log_message[1]
+                + 2
+                + 0xFFFF * 4
+                + 1
+                + 1,
+            ),
+        )
+
+        # Optional bitfield, timestamp varint, channel (+ payload length varint
+        # + payload)
+        self.assertEqual(
+            self.ctx.size_range(messages['PartlyPacked']),
+            (1 + 1 + 1, 1 + 10 + 1 + 3 + 0xFFFF),
+        )
+
+        # Run-length encoded fields are bounded by their encoded length
+        self.assertEqual(
+            self.ctx.size_range(messages['CompressedPage']),
+            (1 + 4 + 2, 1 + 4 + 2 + 0xFFFF + 3 + 0xFFFF),
+        )
+
+        # Request ID, COBS overhead and delimiter
+        self.assertEqual(parser.framed_size(1), 4)
+        self.assertEqual(parser.framed_size(252), 255)
+        self.assertEqual(parser.framed_size(253), 257)
+        # ...or a frame header in place of the request ID
+        self.assertEqual(parser.framed_size(1, header_size=7), 10)
+
+    def test_request_ids(self):
+        self.ctx.parse_file(self.other_file, parent_namespace='nlb.buffham.testdata')
+        self.ctx.parse_file(self.sample_file, parent_namespace='nlb.buffham.testdata')
+        self.assertEqual(
+            self.ctx.request_ids()[0],
+            schema_bh.Name('pong', 'nlb.buffham.testdata.other'),
+        )
+        self.assertEqual(len(self.ctx.request_ids()), 5)
+
+        # A schema built without `other` in its context reuses its request IDs
+        other = parser.Parser().parse_file(
+            self.sample_file.with_name('other.bh'), parent_namespace='elsewhere'
+        )
+        self.ctx.add_buffham(other)
+        with self.assertRaisesRegex(
+            ValueError,
+            'Request ID 0 is used by both nlb.buffham.testdata.other.pong and '
+            'elsewhere.other.pong',
+        ):
+            self.ctx.request_ids()
+
+    def test_explicit_request_ids(self):
+        # Transactions are numbered before publishes; explicit request IDs are
+        # left out of the numbering, so appending one renumbers nothing
+        with tempfile.TemporaryDirectory() as tempdir:
+            schema = pathlib.Path(tempdir) / 'appended.bh'
+            schema.write_text(
+                'message Ping {\n    uint8_t ping;\n}\n\n'
+                'transaction ping[Ping, Ping];\n'
+                'publish log[Ping];\n'
+                'transaction pong[Ping, Ping] = 254;\n'
+                'transaction pang[Ping, Ping];\n'
+            )
+            ctx = parser.Parser()
+            parsed = ctx.parse_file(schema, parent_namespace='')
+
+            self.assertEqual(
+                [(t.name, t.request_id) for t in parsed.transactions],
+                [('ping', 0), ('pong', 254), ('pang', 1)],
+            )
+            self.assertEqual(
+                [(p.name, p.request_id) for p in parsed.publishes], [('log', 2)]
+            )
+            self.assertEqual(ctx.request_id, 3)
+
+            # Dependencies pick up numbering where it left off
+            other = parser.Parser()
+            other.add_buffham(parsed)
+            self.assertEqual(other.request_id, 3)
+
+            schema.write_text(
+                'message Ping {\n    uint8_t ping;\n}\n\n'
+                'transaction ping[Ping, Ping] = 255;\n'
+            )
+            with self.assertRaisesRegex(ValueError, 'Explicit request ID 255'):
+                parser.Parser().parse_file(schema, parent_namespace='')
+
+
+class TestParserCache(unittest.TestCase):
+    def setUp(self) -> None:
+        testdata_dir = pathlib.Path(__file__).parent / 'testdata'
+
+        self.sample_file = testdata_dir / 'sample.bh'
+        self.other_file = testdata_dir / 'other.bh'
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache_dir = pathlib.Path(self.tempdir.name) / 'cache'
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def test_error_position(self):
+        schema = pathlib.Path(self.tempdir.name) / 'broken.bh'
+        schema.write_text(
+            'message Foo {\n    uint8_t foo;\n}\n\nmessage Bar {\n    Baz baz;\n}\n'
+        )
+        with self.assertRaisesRegex(
+            ValueError, r'broken.bh, line 5: Invalid field type Baz'
+        ):
+            parser.Parser().parse_file(schema, parent_namespace='')
+
+    def parse(self, cache_dir: pathlib.Path | None) -> parser.Parser:
+        ctx = parser.Parser(cache_dir=cache_dir)
+        ctx.parse_file(self.other_file, parent_namespace='nlb.buffham.testdata')
+        ctx.parse_file(self.sample_file, parent_namespace='nlb.buffham.testdata')
+        return ctx
+
+    def test_cache(self):
+        expected = self.parse(None)
+
+        # The first parse fills the cache...
+        ctx = self.parse(self.cache_dir)
+        self.assertEqual(ctx, dataclasses.replace(expected, cache_dir=self.cache_dir))
+        self.assertEqual(len(list(self.cache_dir.glob('*.bhb'))), 2)
+
+        # ...and later parses are served from it
+        with mock.patch.object(parser, 'scan') as scan:
+            ctx = self.parse(self.cache_dir)
+        scan.assert_not_called()
+        self.assertEqual(ctx, dataclasses.replace(expected, cache_dir=self.cache_dir))
+
+    def test_cache_invalidation(self):
+        self.parse(self.cache_dir)
+
+        # Changing a dependency changes the key of the files that import it
+        other_file = pathlib.Path(self.tempdir.name) / 'other.bh'
+        other_file.write_text(
+            self.other_file.read_text() + '\nconstant uint8_t new = 1;\n'
+        )
+        ctx = parser.Parser(cache_dir=self.cache_dir)
+        ctx.parse_file(other_file, parent_namespace='nlb.buffham.testdata')
+        ctx.parse_file(self.sample_file, parent_namespace='nlb.buffham.testdata')
+        self.assertEqual(len(list(self.cache_dir.glob('*.bhb'))), 4)
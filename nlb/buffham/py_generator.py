@@ -22,6 +22,42 @@ TYPE_MAP = {
     schema_bh.FieldType.BYTES: 'bytes',
 }
 
+# Helper for `numpy` mode, converting a numeric list field's value to an array
+AS_ARRAY = f"""
+
+def _as_array(value, dtype: str) -> np.ndarray:
+{T}if isinstance(value, (bytes, bytearray, memoryview)):
+{T}{T}return np.frombuffer(value, dtype)
+{T}return np.ascontiguousarray(value, dtype)
+
+"""
+
+# Helpers for `packed` fields, encoding integers and lengths as LEB128 varints
+VARINT = f"""
+
+def _varint_size(value: int) -> int:
+{T}return max(1, (value.bit_length() + 6) // 7)
+
+
+def _pack_varint_into(buffer: bytearray | memoryview, offset: int, value: int) -> int:
+{T}while value > 0x7F:
+{T}{T}buffer[offset] = value & 0x7F | 0x80
+{T}{T}value >>= 7
+{T}{T}offset += 1
+{T}buffer[offset] = value
+{T}return offset + 1
+
+
+def _unpack_varint(buffer: bytes | memoryview, offset: int) -> tuple[int, int]:
+{T}value = shift = 0
+{T}while buffer[offset] & 0x80:
+{T}{T}value |= (buffer[offset] & 0x7F) << shift
+{T}{T}offset += 1
+{T}{T}shift += 7
+{T}return value | buffer[offset] << shift, offset + 1
+
+"""
+
 
 def _get_imported_name(relative_name: str) -> str:
     """Get the imported name from a relative name.
@@ -38,7 +74,11 @@ def _get_imported_name(relative_name: str) -> str:
 
 
 def _py_type(
-    field: schema_bh.Field, primary_namespace: str, *, just_object: bool = False
+    field: schema_bh.Field,
+    primary_namespace: str,
+    *,
+    just_object: bool = False,
+    numpy: bool = False,
 ) -> str:
     """Get the Python type hint for the field."""
     if just_object and field.obj_name is not None:
@@ -46,7 +86,9 @@ def _py_type(
             parser.relative_name(field.obj_name, primary_namespace)
         )
 
-    if field.pri_type is schema_bh.FieldType.LIST:
+    if numpy and parser.is_field_numeric_list(field):
+        type_str = 'np.ndarray'
+    elif field.pri_type is schema_bh.FieldType.LIST:
         assert field.sub_type is not None
         if field.sub_type is schema_bh.FieldType.MESSAGE:
             assert field.obj_name is not None
@@ -132,14 +174,369 @@ def generate_enum(enum: schema_bh.Enum) -> str:
     return definition
 
 
-def _generate_serializer(
+def _group_fields(message: schema_bh.Message) -> list[list[schema_bh.Field]]:
+    """Group the fields into runs of fixed-size fields and lone other fields."""
+    groups: list[list[schema_bh.Field]] = []
+    for field in message.fields:
+        if (
+            groups
+            and parser.is_field_fixed(field)
+            and parser.is_field_fixed(groups[-1][-1])
+        ):
+            groups[-1].append(field)
+        else:
+            groups.append([field])
+    return groups
+
+
+def _hoist_struct(
+    message: schema_bh.Message, fields: list[schema_bh.Field], structs: dict[str, str]
+) -> str:
+    """Get the name of the module-level `struct.Struct` for fields, adding it."""
+    name = f'_{message.name}_{fields[0].name}'
+    structs[name] = '<' + ''.join(parser.FORMAT_MAP[f.pri_type] for f in fields)
+    return name
+
+
+def _pack_values(fields: list[schema_bh.Field]) -> str:
+    """Get the arguments to pack a run of fixed-size fields with."""
+    values = []
+    for field in fields:
+        value = f'self.{field.name}'
+        if field.pri_type is schema_bh.FieldType.ENUM:
+            value += '.value'
+        values.append(value)
+    return ', '.join(values)
+
+
+def _group_size(fields: list[schema_bh.Field]) -> int:
+    """Get the encoded size of a run of fixed-size fields."""
+    return sum(parser.SIZE_MAP[f.pri_type] for f in fields)
+
+
+def _is_integer(field_type: schema_bh.FieldType | None) -> bool:
+    return field_type in (*parser.UNSIGNED_TYPES, *parser.SIGNED_TYPES)
+
+
+def _zigzag(value: str, field_type: schema_bh.FieldType | None) -> str:
+    """Get the expression for an integer's varint value (zigzagged if signed)."""
+    if field_type in parser.SIGNED_TYPES:
+        return f'({value} << 1) ^ ({value} >> 63)'
+    return value
+
+
+def _packed_items(field: schema_bh.Field, numpy: bool, indent: str) -> tuple[str, str]:
+    """Get the statement binding a packed integer list's varints, and their name.
+
+    Lists of unsigned integers are used as they are.
+    """
+    value = f'self.{field.name}'
+    if numpy:
+        value = f"_as_array({value}, '<{parser.FORMAT_MAP[field.sub_type]}').tolist()"  # type: ignore
+    if field.sub_type in parser.SIGNED_TYPES:
+        value = f'[{_zigzag("item", field.sub_type)} for item in {value}]'
+    elif not numpy:
+        return '', value
+    return f'\n{indent}{field.name}_items = {value}', f'{field.name}_items'
+
+
+def _generate_packed_size(field: schema_bh.Field, numpy: bool, indent: str) -> str:
+    """Get the statements adding a packed field's size to `size`."""
+    value = f'self.{field.name}'
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if field.sub_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+            items = value
+            if field.sub_type is schema_bh.FieldType.STRING:
+                items = f'(item.encode() for item in {value})'
+            return (
+                f'\n{indent}size += _varint_size(len({value})) + sum('
+                f'[_varint_size(len(item)) + len(item) for item in {items}])'
+            )
+        if field.sub_type is schema_bh.FieldType.MESSAGE:
+            return (
+                f'\n{indent}size += _varint_size(len({value})) + '
+                f'sum(item.serialized_size() for item in {value})'
+            )
+        if _is_integer(field.sub_type):
+            definition, items = _packed_items(field, numpy, indent)
+            return (
+                definition + f'\n{indent}size += _varint_size(len({items})) + '
+                f'sum(map(_varint_size, {items}))'
+            )
+        if numpy and parser.is_field_numeric_list(field):
+            dtype = '<' + parser.FORMAT_MAP[field.sub_type]  # type: ignore
+            return (
+                f"\n{indent}{field.name}_array = _as_array({value}, '{dtype}')"
+                f'\n{indent}size += _varint_size(len({field.name}_array)) + '
+                f'{field.name}_array.nbytes'
+            )
+        field_size = parser.SIZE_MAP[field.sub_type]  # type: ignore
+        return (
+            f'\n{indent}size += _varint_size(len({value})) + '
+            f'len({value}) * {field_size}'
+        )
+    if field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        length = f'len({value}.encode())'
+        if field.pri_type is schema_bh.FieldType.BYTES:
+            length = f'len({value})'
+        return (
+            f'\n{indent}{field.name}_size = {length}'
+            f'\n{indent}size += _varint_size({field.name}_size) + {field.name}_size'
+        )
+    return f'\n{indent}size += _varint_size({_zigzag(value, field.pri_type)})'
+
+
+def _generate_packed_serialize_into(
+    field: schema_bh.Field, numpy: bool, indent: str
+) -> str:
+    """Get the statements writing a packed field at `offset`."""
+    value = f'self.{field.name}'
+    if field.pri_type is schema_bh.FieldType.LIST:
+        if _is_integer(field.sub_type):
+            definition, items = _packed_items(field, numpy, indent)
+            return (
+                definition
+                + f'\n{indent}offset = _pack_varint_into(buffer, offset, len({items}))'
+                f'\n{indent}for item in {items}:'
+                f'\n{indent}{T}offset = _pack_varint_into(buffer, offset, item)'
+            )
+        if numpy and parser.is_field_numeric_list(field):
+            dtype = '<' + parser.FORMAT_MAP[field.sub_type]  # type: ignore
+            array = f'{field.name}_array'
+            return (
+                f"\n{indent}{array} = _as_array({value}, '{dtype}')"
+                f'\n{indent}offset = _pack_varint_into(buffer, offset, len({array}))'
+                f"\n{indent}buffer[offset:offset + {array}.nbytes] = memoryview({array}).cast('B')"
+                f'\n{indent}offset += {array}.nbytes'
+            )
+
+        definition = (
+            f'\n{indent}offset = _pack_varint_into(buffer, offset, len({value}))'
+        )
+        if field.sub_type is schema_bh.FieldType.MESSAGE:
+            definition += f'\n{indent}for item in {value}:'
+            definition += f'\n{indent}{T}offset = item.serialize_into(buffer, offset)'
+        elif field.sub_type in (
+            schema_bh.FieldType.STRING,
+            schema_bh.FieldType.BYTES,
+        ):
+            items = value
+            if field.sub_type is schema_bh.FieldType.STRING:
+                items = f'(item.encode() for item in {value})'
+            definition += f'\n{indent}for item in {items}:'
+            definition += (
+                f'\n{indent}{T}offset = _pack_varint_into(buffer, offset, len(item))'
+            )
+            definition += f'\n{indent}{T}buffer[offset:offset + len(item)] = item'
+            definition += f'\n{indent}{T}offset += len(item)'
+        else:
+            field_format = parser.FORMAT_MAP[field.sub_type]  # type: ignore
+            field_size = parser.SIZE_MAP[field.sub_type]  # type: ignore
+            definition += f"\n{indent}struct.pack_into(f'<{{len({value})}}{field_format}', buffer, offset, *{value})"
+            definition += f'\n{indent}offset += len({value}) * {field_size}'
+        return definition
+    if field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        data = value
+        definition = ''
+        if field.pri_type is schema_bh.FieldType.STRING:
+            data = f'{field.name}_bytes'
+            definition += f'\n{indent}{data} = {value}.encode()'
+        definition += (
+            f'\n{indent}offset = _pack_varint_into(buffer, offset, len({data}))'
+        )
+        definition += f'\n{indent}buffer[offset:offset + len({data})] = {data}'
+        definition += f'\n{indent}offset += len({data})'
+        return definition
+    return (
+        f'\n{indent}offset = _pack_varint_into(buffer, offset, '
+        f'{_zigzag(value, field.pri_type)})'
+    )
+
+
+def _generate_packed_deserialize(
+    field: schema_bh.Field, primary_namespace: str, numpy: bool, indent: str
+) -> str:
+    """Get the statements decoding a packed field at `offset` into its name."""
+    name = field.name
+    if field.pri_type is schema_bh.FieldType.LIST:
+        definition = f'\n{indent}{name}_size, offset = _unpack_varint(buffer, offset)'
+        if _is_integer(field.sub_type):
+            item = 'item'
+            if field.sub_type in parser.SIGNED_TYPES:
+                item = '(item >> 1) ^ -(item & 1)'
+            definition += f'\n{indent}{name} = []'
+            definition += f'\n{indent}for _ in range({name}_size):'
+            definition += f'\n{indent}{T}item, offset = _unpack_varint(buffer, offset)'
+            definition += f'\n{indent}{T}{name}.append({item})'
+            if numpy:
+                dtype = '<' + parser.FORMAT_MAP[field.sub_type]  # type: ignore
+                definition += f"\n{indent}{name} = np.array({name}, '{dtype}')"
+        elif field.sub_type is schema_bh.FieldType.MESSAGE:
+            msg = _py_type(field, primary_namespace, just_object=True)
+            definition += f'\n{indent}{name} = []'
+            definition += f'\n{indent}for _ in range({name}_size):'
+            definition += (
+                f'\n{indent}{T}item, offset = {msg}.deserialize(buffer, offset)'
+            )
+            definition += f'\n{indent}{T}{name}.append(item)'
+        elif field.sub_type in (
+            schema_bh.FieldType.STRING,
+            schema_bh.FieldType.BYTES,
+        ):
+            item = 'buffer[offset:offset + item_size]'
+            if field.sub_type is schema_bh.FieldType.STRING:
+                item = f"str({item}, 'utf-8')"
+            definition += f'\n{indent}{name} = []'
+            definition += f'\n{indent}for _ in range({name}_size):'
+            definition += (
+                f'\n{indent}{T}item_size, offset = _unpack_varint(buffer, offset)'
+            )
+            definition += f'\n{indent}{T}{name}.append({item})'
+            definition += f'\n{indent}{T}offset += item_size'
+        elif numpy and parser.is_field_numeric_list(field):
+            dtype = '<' + parser.FORMAT_MAP[field.sub_type]  # type: ignore
+            definition += f"\n{indent}{name} = np.frombuffer(buffer, '{dtype}', {name}_size, offset)"
+            definition += f'\n{indent}offset += {name}.nbytes'
+        else:
+            field_format = parser.FORMAT_MAP[field.sub_type]  # type: ignore
+            field_size = parser.SIZE_MAP[field.sub_type]  # type: ignore
+            definition += f"\n{indent}{name} = list(struct.unpack_from(f'<{{{name}_size}}{field_format}', buffer, offset))"
+            definition += f'\n{indent}offset += {name}_size * {field_size}'
+        return definition
+    if field.pri_type in (schema_bh.FieldType.STRING, schema_bh.FieldType.BYTES):
+        value = f'buffer[offset:offset + {name}_size]'
+        if field.pri_type is schema_bh.FieldType.STRING:
+            value = f"str({value}, 'utf-8')"
+        return (
+            f'\n{indent}{name}_size, offset = _unpack_varint(buffer, offset)'
+            f'\n{indent}{name} = {value}'
+            f'\n{indent}offset += {name}_size'
+        )
+    definition = f'\n{indent}{name}, offset = _unpack_varint(buffer, offset)'
+    if field.pri_type in parser.SIGNED_TYPES:
+        definition += f'\n{indent}{name} = ({name} >> 1) ^ -({name} & 1)'
+    return definition
+
+
+def _rle_data(field: schema_bh.Field, numpy: bool) -> str:
+    """Get the expression for the bytes an `rle` field encodes."""
+    value = f'self.{field.name}'
+    if field.pri_type is not schema_bh.FieldType.LIST:
+        return value
+    return f"_as_array({value}, '<B')" if numpy else f'bytes({value})'
+
+
+def _generate_rle_size(field: schema_bh.Field, numpy: bool, indent: str) -> str:
+    """Get the statements adding an `rle` field's size to `size`."""
+    size = f'{field.name}_size'
+    length_size = f'_varint_size({size})' if field.is_packed else '2'
+    return (
+        f'\n{indent}{size} = rle.encoded_size({_rle_data(field, numpy)})'
+        f'\n{indent}size += {length_size} + {size}'
+    )
+
+
+def _generate_rle_serialize_into(
+    field: schema_bh.Field, numpy: bool, indent: str
+) -> str:
+    """Get the statements writing an `rle` field at `offset`."""
+    encoded = f'{field.name}_encoded'
+    definition = f'\n{indent}{encoded} = rle.encode({_rle_data(field, numpy)})'
+    if field.is_packed:
+        definition += (
+            f'\n{indent}offset = _pack_varint_into(buffer, offset, len({encoded}))'
+        )
+    else:
+        definition += f'\n{indent}_LENGTH.pack_into(buffer, offset, len({encoded}))'
+        definition += f'\n{indent}offset += 2'
+    definition += f'\n{indent}buffer[offset:offset + len({encoded})] = {encoded}'
+    definition += f'\n{indent}offset += len({encoded})'
+    return definition
+
+
+def _generate_rle_deserialize(field: schema_bh.Field, numpy: bool, indent: str) -> str:
+    """Get the statements decoding an `rle` field at `offset` into its name."""
+    name = field.name
+    if field.is_packed:
+        definition = f'\n{indent}{name}_size, offset = _unpack_varint(buffer, offset)'
+    else:
+        definition = f'\n{indent}{name}_size = _LENGTH.unpack_from(buffer, offset)[0]'
+        definition += f'\n{indent}offset += 2'
+    value = f'rle.decode(buffer[offset:offset + {name}_size])'
+    if field.pri_type is not schema_bh.FieldType.LIST:
+        value = f'bytes({value})'
+    elif numpy:
+        value = f'np.frombuffer({value}, np.uint8)'
+    else:
+        value = f'list({value})'
+    definition += f'\n{indent}{name} = {value}'
+    definition += f'\n{indent}offset += {name}_size'
+    return definition
+
+
+def _generate_serialized_size(
+    message: schema_bh.Message, num_optional_bytes: int, numpy: bool, definition: str
+) -> str:
+    # Fixed-size fields (and the optional fields bitfield) add up to a constant
+    constant = num_optional_bytes + sum(
+        parser.SIZE_MAP[field.pri_type]
+        for field in message.fields
+        if parser.is_field_fixed(field)
+    )
+    definition += f'\n{T}{T}size = {constant}'
+
+    for field in message.fields:
+        if parser.is_field_fixed(field):
+            continue
+
+        indent = f'{T}{T}'
+        if field.is_optional:
+            definition += f'\n{indent}if self.{field.name} is not None:'
+            indent += T
+
+        field_size = parser.SIZE_MAP[field.sub_type or field.pri_type]
+        if field.is_rle:
+            definition += _generate_rle_size(field, numpy, indent)
+        elif field.is_packed:
+            definition += _generate_packed_size(field, numpy, indent)
+        elif numpy and parser.is_field_numeric_list(field):
+            dtype = '<' + parser.FORMAT_MAP[field.sub_type]  # type: ignore
+            definition += (
+                f"\n{indent}size += 2 + _as_array(self.{field.name}, '{dtype}').nbytes"
+            )
+        elif field.pri_type is schema_bh.FieldType.LIST:
+            if field.sub_type is schema_bh.FieldType.STRING:
+                definition += f'\n{indent}size += 2 + 2 * len(self.{field.name}) + sum([len(item.encode()) for item in self.{field.name}])'
+            elif field.sub_type is schema_bh.FieldType.BYTES:
+                definition += f'\n{indent}size += 2 + 2 * len(self.{field.name}) + sum(map(len, self.{field.name}))'
+            elif field.sub_type is schema_bh.FieldType.MESSAGE:
+                definition += f'\n{indent}size += 2 + sum(item.serialized_size() for item in self.{field.name})'
+            else:
+                definition += (
+                    f'\n{indent}size += 2 + len(self.{field.name}) * {field_size}'
+                )
+        elif field.pri_type is schema_bh.FieldType.STRING:
+            definition += f'\n{indent}size += 2 + len(self.{field.name}.encode())'
+        elif field.pri_type is schema_bh.FieldType.BYTES:
+            definition += f'\n{indent}size += 2 + len(self.{field.name})'
+        elif field.pri_type is schema_bh.FieldType.MESSAGE:
+            definition += f'\n{indent}size += self.{field.name}.serialized_size()'
+        else:
+            definition += f'\n{indent}size += {field_size}'
+
+    definition += f'\n{T}{T}return size\n'
+
+    return definition
+
+
+def _generate_serialize_into(
     message: schema_bh.Message,
     num_optional_fields: int,
     num_optional_bytes: int,
+    numpy: bool,
+    structs: dict[str, str],
     definition: str,
 ) -> str:
-    definition += f'\n{T}{T}buffer = bytes()'
-
     # Compute optional bitfield
     if num_optional_fields > 0:
         definition += f'\n{T}{T}optional_bitfield = 0'
@@ -149,54 +546,113 @@ def _generate_serializer(
                 continue
             definition += f'\n{T}{T}optional_bitfield |= (1 << {optional_idx}) if self.{field.name} is not None else 0'
             optional_idx += 1
-        definition += f"\n{T}{T}buffer += optional_bitfield.to_bytes(length={num_optional_bytes}, byteorder='little', signed=False)"
+        definition += f"\n{T}{T}buffer[offset:offset + {num_optional_bytes}] = optional_bitfield.to_bytes(length={num_optional_bytes}, byteorder='little', signed=False)"
+        definition += f'\n{T}{T}offset += {num_optional_bytes}'
+
+    for group in _group_fields(message):
+        field = group[0]
+        if parser.is_field_fixed(field):
+            # Pack runs of fixed-size fields with a single struct
+            layout = _hoist_struct(message, group, structs)
+            definition += (
+                f'\n{T}{T}{layout}.pack_into(buffer, offset, {_pack_values(group)})'
+            )
+            definition += f'\n{T}{T}offset += {_group_size(group)}'
+            continue
 
-    for field in message.fields:
         field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
+        field_size = parser.SIZE_MAP[field.sub_type or field.pri_type]
 
-        if parser.is_field_iterable(field):
+        # Conditionally serialize optional fields
+        indent = f'{T}{T}'
+        if field.is_optional:
+            definition += f'\n{indent}if self.{field.name} is not None:'
+            indent += T
+
+        if field.is_rle:
+            definition += _generate_rle_serialize_into(field, numpy, indent)
+        elif field.is_packed:
+            definition += _generate_packed_serialize_into(field, numpy, indent)
+        elif numpy and parser.is_field_numeric_list(field):
+            # Write the array's raw bytes without boxing each item
+            array = f'{field.name}_array'
+            definition += (
+                f"\n{indent}{array} = _as_array(self.{field.name}, '<{field_format}')"
+            )
+            definition += f'\n{indent}_LENGTH.pack_into(buffer, offset, len({array}))'
+            definition += f'\n{indent}offset += 2'
+            definition += f"\n{indent}buffer[offset:offset + {array}.nbytes] = memoryview({array}).cast('B')"
+            definition += f'\n{indent}offset += {array}.nbytes'
+        elif field.pri_type is schema_bh.FieldType.LIST:
             # Write size
-            definition += f"\n{T}{T}buffer += struct.pack('<H', len(self.{field.name}))"
-            if field.is_optional:
-                definition += f' if self.{field.name} is not None else bytes()'
+            definition += (
+                f'\n{indent}_LENGTH.pack_into(buffer, offset, len(self.{field.name}))'
+            )
+            definition += f'\n{indent}offset += 2'
 
             # Write data
-            if field.pri_type is schema_bh.FieldType.LIST:
-                if field.sub_type in (
-                    schema_bh.FieldType.STRING,
-                    schema_bh.FieldType.BYTES,
-                    schema_bh.FieldType.MESSAGE,
-                ):
-                    definition += f'\n{T}{T}for item in self.{field.name}:'
-                    if field.sub_type is schema_bh.FieldType.MESSAGE:
-                        definition += f'\n{T}{T}{T}buffer += item.serialize()'
-                    else:
-                        definition += (
-                            f"\n{T}{T}{T}buffer += struct.pack('<H', len(item))"
-                        )
-                        definition += f'\n{T}{T}{T}buffer += item'
-                        if field.sub_type is schema_bh.FieldType.STRING:
-                            definition += '.encode()'
-                else:
-                    definition += f"\n{T}{T}buffer += struct.pack(f'<{{len(self.{field.name})}}{field_format}', *self.{field.name})"
+            if field.sub_type is schema_bh.FieldType.MESSAGE:
+                definition += f'\n{indent}for item in self.{field.name}:'
+                definition += (
+                    f'\n{indent}{T}offset = item.serialize_into(buffer, offset)'
+                )
+            elif field.sub_type in (
+                schema_bh.FieldType.STRING,
+                schema_bh.FieldType.BYTES,
+            ):
+                # Joining the items is cheaper than writing each in place
+                items = f'self.{field.name}'
+                if field.sub_type is schema_bh.FieldType.STRING:
+                    items = f'(item.encode() for item in self.{field.name})'
+                definition += f"\n{indent}{field.name}_data = b''.join([_LENGTH.pack(len(item)) + item for item in {items}])"
+                definition += f'\n{indent}buffer[offset:offset + len({field.name}_data)] = {field.name}_data'
+                definition += f'\n{indent}offset += len({field.name}_data)'
             else:
-                definition += f'\n{T}{T}buffer += self.{field.name}'
-                if field.pri_type is schema_bh.FieldType.STRING:
-                    definition += '.encode()'
+                definition += f"\n{indent}struct.pack_into(f'<{{len(self.{field.name})}}{field_format}', buffer, offset, *self.{field.name})"
+                definition += (
+                    f'\n{indent}offset += len(self.{field.name}) * {field_size}'
+                )
+        elif field.pri_type in (
+            schema_bh.FieldType.STRING,
+            schema_bh.FieldType.BYTES,
+        ):
+            value = f'self.{field.name}'
+            if field.pri_type is schema_bh.FieldType.STRING:
+                value = f'{field.name}_bytes'
+                definition += f'\n{indent}{value} = self.{field.name}.encode()'
+            definition += f'\n{indent}_LENGTH.pack_into(buffer, offset, len({value}))'
+            definition += f'\n{indent}offset += 2'
+            definition += f'\n{indent}buffer[offset:offset + len({value})] = {value}'
+            definition += f'\n{indent}offset += len({value})'
         elif field.pri_type is schema_bh.FieldType.MESSAGE:
-            definition += f'\n{T}{T}buffer += self.{field.name}.serialize()'
-        elif field.pri_type is schema_bh.FieldType.ENUM:
-            definition += f"\n{T}{T}buffer += struct.pack('<{field_format}', self.{field.name}.value)"
-        else:
             definition += (
-                f"\n{T}{T}buffer += struct.pack('<{field_format}', self.{field.name})"
+                f'\n{indent}offset = self.{field.name}.serialize_into(buffer, offset)'
             )
+        else:
+            value = f'self.{field.name}'
+            if field.pri_type is schema_bh.FieldType.ENUM:
+                value += '.value'
+            layout = _hoist_struct(message, group, structs)
+            definition += f'\n{indent}{layout}.pack_into(buffer, offset, {value})'
+            definition += f'\n{indent}offset += {field_size}'
+
+    definition += f'\n{T}{T}return offset\n'
+
+    return definition
 
-        # Conditionally serialize optional fields
-        if field.is_optional:
-            definition += f' if self.{field.name} is not None else bytes()'
 
-    definition += f'\n{T}{T}return buffer\n'
+def _generate_serializer(
+    message: schema_bh.Message, structs: dict[str, str], definition: str
+) -> str:
+    if parser.fixed_size(message) is not None:
+        # The whole message is a single struct
+        layout = _hoist_struct(message, message.fields, structs)
+        definition += f'\n{T}{T}return {layout}.pack({_pack_values(message.fields)})\n'
+        return definition
+
+    definition += f'\n{T}{T}buffer = bytearray(self.serialized_size())'
+    definition += f'\n{T}{T}self.serialize_into(buffer)'
+    definition += f'\n{T}{T}return bytes(buffer)\n'
 
     return definition
 
@@ -206,21 +662,58 @@ def _generate_deserializer(
     num_optional_fields: int,
     num_optional_bytes: int,
     primary_namespace: str,
+    numpy: bool,
+    structs: dict[str, str],
     definition: str,
 ) -> str:
-    definition += f'\n{T}{T}offset = 0'
-
     if num_optional_fields > 0:
-        definition += f"\n{T}{T}optional_bitfield = int.from_bytes(buffer[:{num_optional_bytes}], byteorder='little', signed=False)"
+        definition += f"\n{T}{T}optional_bitfield = int.from_bytes(buffer[offset:offset + {num_optional_bytes}], byteorder='little', signed=False)"
         definition += f'\n{T}{T}offset += {num_optional_bytes}'
 
     optional_idx = 0
-    for field in message.fields:
+    for group in _group_fields(message):
+        field = group[0]
+        if parser.is_field_fixed(field):
+            # Unpack runs of fixed-size fields with a single struct
+            layout = _hoist_struct(message, group, structs)
+            if len(group) == 1:
+                value = f'{layout}.unpack_from(buffer, offset)[0]'
+                if field.pri_type is schema_bh.FieldType.ENUM:
+                    enum_type = _py_type(field, primary_namespace, just_object=True)
+                    value = f'{enum_type}({value})'
+                definition += f'\n{T}{T}{field.name} = {value}'
+            else:
+                names = ', '.join(f.name for f in group)
+                definition += f'\n{T}{T}{names} = {layout}.unpack_from(buffer, offset)'
+                for f in group:
+                    if f.pri_type is schema_bh.FieldType.ENUM:
+                        enum_type = _py_type(f, primary_namespace, just_object=True)
+                        definition += f'\n{T}{T}{f.name} = {enum_type}({f.name})'
+            definition += f'\n{T}{T}offset += {_group_size(group)}'
+            continue
+
         field_format = parser.FORMAT_MAP[field.sub_type or field.pri_type]
         field_size = parser.SIZE_MAP[field.sub_type or field.pri_type]
 
-        if field.pri_type is schema_bh.FieldType.LIST:
-            definition += f"\n{T}{T}{field.name}_size = struct.unpack_from('<H', buffer, offset)[0]"
+        if field.is_rle or field.is_packed:
+            indent = f'{T}{T}{T}' if field.is_optional else f'{T}{T}'
+            if field.is_rle:
+                statements = _generate_rle_deserialize(field, numpy, indent)
+            else:
+                statements = _generate_packed_deserialize(
+                    field, primary_namespace, numpy, indent
+                )
+            if field.is_optional:
+                definition += f'\n{T}{T}if (optional_bitfield >> {optional_idx}) & 1:'
+                definition += statements
+                definition += f'\n{T}{T}else:'
+                definition += f'\n{T}{T}{T}{field.name} = None'
+            else:
+                definition += statements
+        elif field.pri_type is schema_bh.FieldType.LIST:
+            definition += (
+                f'\n{T}{T}{field.name}_size = _LENGTH.unpack_from(buffer, offset)[0]'
+            )
             if field.sub_type in (
                 schema_bh.FieldType.STRING,
                 schema_bh.FieldType.BYTES,
@@ -231,17 +724,25 @@ def _generate_deserializer(
                 definition += f'\n{T}{T}for _ in range({field.name}_size):'
                 if field.sub_type is schema_bh.FieldType.MESSAGE:
                     msg = _py_type(field, primary_namespace, just_object=True)
-                    definition += f'\n{T}{T}{T}item, item_size = {msg}.deserialize(buffer[offset:])'
+                    definition += (
+                        f'\n{T}{T}{T}item, offset = {msg}.deserialize(buffer, offset)'
+                    )
                     definition += f'\n{T}{T}{T}{field.name}.append(item)'
-                    definition += f'\n{T}{T}{T}offset += item_size'
                 else:
-                    definition += f"\n{T}{T}{T}item_size = struct.unpack_from('<H', buffer, offset)[0]"
+                    definition += (
+                        f'\n{T}{T}{T}item_size = _LENGTH.unpack_from(buffer, offset)[0]'
+                    )
                     definition += f'\n{T}{T}{T}offset += 2'
-                    definition += f'\n{T}{T}{T}{field.name}.append(buffer[offset:offset + item_size]'
+                    item = 'buffer[offset:offset + item_size]'
                     if field.sub_type is schema_bh.FieldType.STRING:
-                        definition += '.decode()'
-                    definition += ')'
+                        item = f"str({item}, 'utf-8')"
+                    definition += f'\n{T}{T}{T}{field.name}.append({item})'
                     definition += f'\n{T}{T}{T}offset += item_size'
+            elif numpy and parser.is_field_numeric_list(field):
+                # View the items in place rather than boxing each one
+                definition += f'\n{T}{T}offset += 2'
+                definition += f"\n{T}{T}{field.name} = np.frombuffer(buffer, '<{field_format}', {field.name}_size, offset)"
+                definition += f'\n{T}{T}offset += {field.name}.nbytes'
             else:
                 definition += f'\n{T}{T}offset += 2'
                 definition += f"\n{T}{T}{field.name} = list(struct.unpack_from(f'<{{{field.name}_size}}{field_format}', buffer, offset))"
@@ -251,7 +752,9 @@ def _generate_deserializer(
             schema_bh.FieldType.BYTES,
         ):
             # Read size
-            definition += f"\n{T}{T}{field.name}_size = struct.unpack_from('<H', buffer, offset)[0]"
+            definition += (
+                f'\n{T}{T}{field.name}_size = _LENGTH.unpack_from(buffer, offset)[0]'
+            )
             if field.is_optional:
                 definition += f' if (optional_bitfield >> {optional_idx}) & 1 else 0'
                 definition += (
@@ -261,25 +764,26 @@ def _generate_deserializer(
                 definition += f'\n{T}{T}offset += 2'
 
             # Read data
-            definition += (
-                f'\n{T}{T}{field.name} = buffer[offset:offset + {field.name}_size]'
-            )
+            value = f'buffer[offset:offset + {field.name}_size]'
             if field.pri_type is schema_bh.FieldType.STRING:
-                definition += '.decode()'
+                value = f"str({value}, 'utf-8')"
+            definition += f'\n{T}{T}{field.name} = {value}'
             if field.is_optional:
                 definition += f' if (optional_bitfield >> {optional_idx}) & 1 else None'
             definition += f'\n{T}{T}offset += {field.name}_size'
         elif field.pri_type is schema_bh.FieldType.MESSAGE:
             msg = _py_type(field, primary_namespace, just_object=True)
-            definition += f'\n{T}{T}{field.name}, {field.name}_size = {msg}.deserialize(buffer[offset:])'
+            definition += (
+                f'\n{T}{T}{field.name}, offset = {msg}.deserialize(buffer, offset)'
+            )
             if field.is_optional:
                 definition += (
-                    f' if (optional_bitfield >> {optional_idx}) & 1 else (None, 0)'
+                    f' if (optional_bitfield >> {optional_idx}) & 1 else (None, offset)'
                 )
-            definition += f'\n{T}{T}offset += {field.name}_size'
         elif field.pri_type is schema_bh.FieldType.ENUM:
             enum_type = _py_type(field, primary_namespace, just_object=True)
-            definition += f"\n{T}{T}{field.name} = {enum_type}(struct.unpack_from('<{field_format}', buffer, offset)[0])"
+            layout = _hoist_struct(message, group, structs)
+            definition += f'\n{T}{T}{field.name} = {enum_type}({layout}.unpack_from(buffer, offset)[0])'
             if field.is_optional:
                 definition += f' if (optional_bitfield >> {optional_idx}) & 1 else None'
                 definition += (
@@ -288,7 +792,10 @@ def _generate_deserializer(
             else:
                 definition += f'\n{T}{T}offset += {field_size}'
         else:
-            definition += f"\n{T}{T}{field.name} = struct.unpack_from('<{field_format}', buffer, offset)[0]"
+            layout = _hoist_struct(message, group, structs)
+            definition += (
+                f'\n{T}{T}{field.name} = {layout}.unpack_from(buffer, offset)[0]'
+            )
             if field.is_optional:
                 definition += f' if (optional_bitfield >> {optional_idx}) & 1 else None'
                 definition += (
@@ -309,11 +816,24 @@ def _generate_deserializer(
 
 
 def generate_message(
-    message: schema_bh.Message, stub: bool, primary_namespace: str
+    message: schema_bh.Message,
+    stub: bool,
+    primary_namespace: str,
+    numpy: bool = False,
+    slots: bool = False,
+    size_range: tuple[int, int] | None = None,
 ) -> str:
-    """Generate a Python dataclass definition from a Message."""
+    """Generate a Python dataclass definition from a Message.
 
-    definition = ('\n@dataclasses.dataclass\nclass {name}:').format(name=message.name)
+    Fixed formats are packed with module-level `struct.Struct`s, which are
+    defined ahead of the class. With a `size_range` (see
+    `parser.Parser.size_range`), the class advertises its framed sizes.
+    """
+
+    decorator = (
+        '@dataclasses.dataclass(slots=True)' if slots else '@dataclasses.dataclass'
+    )
+    definition = f'\n{decorator}\nclass {message.name}:'
 
     # Create a docstring
     if message.comments:
@@ -332,27 +852,75 @@ def generate_message(
         if field.comments:
             for comment in field.comments:
                 definition += f'\n{T}#{comment}'
-        definition += f'\n{T}{field.name}: {_py_type(field, primary_namespace)}'
+        definition += (
+            f'\n{T}{field.name}: {_py_type(field, primary_namespace, numpy=numpy)}'
+        )
         if field.inline_comment:
             definition += f'  #{field.inline_comment}'
 
+    # Fixed-size messages advertise their size up front
+    size = parser.fixed_size(message)
+    if size is not None:
+        definition += f'\n\n{T}SIZE: ClassVar[int] = {size}'
+    if size_range is not None:
+        definition += (
+            f'\n\n{T}# Worst-case sizes when framed by `BhCobs`'
+            f'\n{T}MIN_ENCODED_SIZE: ClassVar[int] = {parser.framed_size(size_range[0])}'
+            f'\n{T}MAX_ENCODED_SIZE: ClassVar[int] = {parser.framed_size(size_range[1])}'
+        )
+
     num_optional_fields = sum(1 for f in message.fields if f.is_optional)
     num_optional_bytes = (num_optional_fields + 7) // 8
+    # Module-level structs the methods use, by name
+    structs: dict[str, str] = {}
 
-    # Add serializer method
-    definition += f'\n\n{T}def serialize(self) -> bytes:'
+    # Add serialized size method
+    definition += f'\n\n{T}def serialized_size(self) -> int:'
+    if stub:
+        definition += ' ...\n'
+    elif size is not None:
+        definition += f'\n{T}{T}return {size}\n'
+    else:
+        definition = _generate_serialized_size(
+            message, num_optional_bytes, numpy, definition
+        )
+
+    # Add in-place serializer method
+    if not stub:
+        definition += '\n'
+    definition += (
+        f'{T}def serialize_into(self, buffer: bytearray | memoryview, '
+        'offset: int = 0) -> int:'
+    )
     if stub:
         definition += ' ...\n'
     else:
-        definition = _generate_serializer(
-            message, num_optional_fields, num_optional_bytes, definition
+        definition = _generate_serialize_into(
+            message,
+            num_optional_fields,
+            num_optional_bytes,
+            numpy,
+            structs,
+            definition,
         )
 
+    # Add serializer method
+    if not stub:
+        definition += '\n'
+    definition += f'{T}def serialize(self) -> bytes:'
+    if stub:
+        definition += ' ...\n'
+    else:
+        definition = _generate_serializer(message, structs, definition)
+
     # Add deserializer method
     if not stub:
         definition += '\n'
     definition += f'{T}@classmethod'
-    definition += f'\n{T}def deserialize(cls, buffer: bytes) -> tuple[Self, int]:'
+    definition += (
+        f'\n{T}def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) '
+        '-> tuple[Self, int]:'
+    )
     if stub:
         definition += ' ...\n'
     else:
@@ -361,9 +929,17 @@ def generate_message(
             num_optional_fields,
             num_optional_bytes,
             primary_namespace,
+            numpy,
+            structs,
             definition,
         )
 
+    if structs:
+        layouts = ''.join(
+            f"\n{name} = struct.Struct('{fmt}')" for name, fmt in structs.items()
+        )
+        definition = f'{layouts}\n{definition}'
+
     return definition
 
 
@@ -403,16 +979,13 @@ def generate_serializer(
     if stub:
         definition += ' ...\n\n'
     else:
-        definition += f'\n{T}{T}registry = (registry or {{}}) | REGISTRY'
-
-        if len(ctx.buffhams) == 1:
-            definition += '\n'
-        else:
-            for bh in ctx.buffhams.values():
-                if parser.full_name(bh.name) == primary_namespace:
-                    continue
-                definition += f' | {bh.name.name}_bh.REGISTRY'
-            definition += '\n'
+        registries = ['registry or {}', 'REGISTRY']
+        for bh in ctx.buffhams.values():
+            if parser.full_name(bh.name) != primary_namespace:
+                registries.append(f'{bh.name.name}_bh.REGISTRY')
+        definition += (
+            f'\n{T}{T}registry = bh_cobs.merge_registries({", ".join(registries)})\n'
+        )
 
         definition += f'{T}{T}super().__init__(registry)\n\n'
 
@@ -500,9 +1073,20 @@ def generate_publishes(publishes: list[schema_bh.Publish]) -> str:
 
 
 def generate_python(
-    ctx: parser.Parser, primary_namespace: str, outfile: pathlib.Path, stub: bool
+    ctx: parser.Parser,
+    primary_namespace: str,
+    outfile: pathlib.Path,
+    stub: bool,
+    numpy: bool = False,
+    slots: bool = False,
 ) -> None:
     bh = ctx.buffhams[primary_namespace]
+    # Only pull in NumPy when a message has a field to use it for
+    numpy = numpy and any(
+        parser.is_field_numeric_list(field)
+        for message in bh.messages
+        for field in message.fields
+    )
 
     with outfile.open('w') as fp:
         fp.write('# @generated by Buffham')
@@ -515,8 +1099,10 @@ def generate_python(
                 sys_imports.append('import enum')
             if not stub:
                 sys_imports.append('import struct')
-            import_type = ', Type' if len(bh.transactions) or len(bh.publishes) else ''
-            sys_imports.append(f'from typing import Self{import_type}')
+            typing_imports = ['ClassVar', 'Self']
+            if len(bh.transactions) or len(bh.publishes):
+                typing_imports.append('Type')
+            sys_imports.append(f'from typing import {", ".join(typing_imports)}')
         if len(bh.enums):
             if 'import enum' not in sys_imports:
                 sys_imports.append('import enum')
@@ -525,13 +1111,23 @@ def generate_python(
             for imp in sys_imports:
                 fp.write(f'{imp}\n')
 
+        if numpy:
+            fp.write('\nimport numpy as np\n')
+
+        lib_imports: list[str] = []
         if len(bh.transactions):
+            lib_imports += [
+                'from emb.network.serialize import bh_cobs',
+                'from emb.network.transport import transporter',
+                'from nlb.buffham import bh',
+            ]
+        if not stub and any(
+            field.is_rle for message in bh.messages for field in message.fields
+        ):
+            lib_imports.append('from nlb.buffham import rle')
+        if lib_imports:
             # Add imports
-            fp.write(
-                '\nfrom emb.network.serialize import bh_cobs\n'
-                'from emb.network.transport import transporter\n'
-                'from nlb.buffham import bh\n'
-            )
+            fp.write('\n' + ''.join(f'{imp}\n' for imp in lib_imports))
 
         if len(ctx.buffhams) > 1:
             fp.write('\n')
@@ -542,6 +1138,19 @@ def generate_python(
                 package, module = namespace.rsplit('.', 1)
                 fp.write(f'from {package} import {module}_bh\n')
 
+        if not stub and any(
+            parser.is_field_iterable(field) and not field.is_packed
+            for message in bh.messages
+            for field in message.fields
+        ):
+            fp.write("\n_LENGTH = struct.Struct('<H')\n")
+        if numpy and not stub:
+            fp.write(AS_ARRAY)
+        if not stub and any(
+            field.is_packed for message in bh.messages for field in message.fields
+        ):
+            fp.write(VARINT)
+
         # Generate constant definitions
         if bh.constants:
             fp.write('\n')
@@ -554,10 +1163,21 @@ def generate_python(
 
         # Generate message definitions
         for message in bh.messages:
-            fp.write(generate_message(message, stub, primary_namespace))
+            fp.write(
+                generate_message(
+                    message,
+                    stub,
+                    primary_namespace,
+                    numpy,
+                    slots,
+                    ctx.size_range(message),
+                )
+            )
 
         # Generate registry
         if len(bh.transactions) or len(bh.publishes):
+            # Checks that imported schemas don't reuse each other's request IDs
+            ctx.request_ids()
             fp.write(
                 generate_registry(
                     bh.transactions, bh.publishes, primary_namespace, stub
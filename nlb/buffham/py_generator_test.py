@@ -3,6 +3,8 @@ import tempfile
 import unittest
 from importlib import util
 
+import numpy as np
+
 from nlb.buffham import bh
 from nlb.buffham import engine
 from nlb.buffham import parser
@@ -65,6 +67,11 @@ class TestPyGenerator(unittest.TestCase):
             ping = sample_bh.Ping(42)
             self.assertEqual(ping.ping, 42)
 
+            # Fixed-size messages advertise their size
+            self.assertEqual(sample_bh.Ping.SIZE, 1)
+            self.assertEqual(len(ping.serialize()), sample_bh.Ping.SIZE)
+            self.assertFalse(hasattr(sample_bh.FlashPage, 'SIZE'))
+
             # Test serialization & deserialization of `Ping`
             ping_message = next(filter(lambda m: m.name == 'Ping', buffham.messages))
             serializer = engine.generate_serializer(ping_message, message_registry)
@@ -125,6 +132,13 @@ class TestPyGenerator(unittest.TestCase):
             self.assertEqual(msg, nested_message)
             self.assertEqual(size, len(buffer))
 
+            # Test serializing `NestedMessage` in place, after a header
+            self.assertEqual(nested_message.serialized_size(), len(buffer))
+            into_buffer = bytearray(2 + len(buffer))
+            offset = nested_message.serialize_into(memoryview(into_buffer), 2)
+            self.assertEqual(offset, len(into_buffer))
+            self.assertEqual(into_buffer[2:], buffer)
+
             # Test serialization & deserialization of `StringLists`
             string_lists = sample_bh.StringLists(
                 ['hello', 'world'], [b'\x01\x02\x03', b'\x04\x05']
@@ -141,6 +155,66 @@ class TestPyGenerator(unittest.TestCase):
             self.assertEqual(msg, string_lists)
             self.assertEqual(size, len(buffer))
 
+            # Test deserializing in place, from a view after a header
+            view = memoryview(b'\xaa' + buffer)
+            msg, offset = sample_bh.StringLists.deserialize(view, 1)
+            self.assertEqual(msg, string_lists)
+            self.assertEqual(offset, len(view))
+            self.assertIsInstance(msg.buffers[0], memoryview)
+
+            # Test serialization & deserialization of `PackedSample`, with the
+            # same bytes as `cpp_generator_test.cc`
+            packed_sample = sample_bh.PackedSample(
+                300, -3, -300, 'hi', [1, 400], [-1, 2], [0.5], ['ab'], [ping], True
+            )
+            packed_sample_message = next(
+                filter(lambda m: m.name == 'PackedSample', buffham.messages)
+            )
+            serializer = engine.generate_serializer(
+                packed_sample_message, message_registry
+            )
+            buffer = packed_sample.serialize()
+            msg, size = sample_bh.PackedSample.deserialize(buffer)
+            self.assertEqual(
+                buffer,
+                b'\x01\xac\x02\x05\xd7\x04\x02hi\x02\x01\x90\x03\x02\x01\x04'
+                b'\x01\x00\x00\x00?\x01\x02ab\x01\x2a\x01',
+            )
+            self.assertEqual(buffer, serializer(packed_sample))
+            self.assertEqual(msg, packed_sample)
+            self.assertEqual(size, len(buffer))
+            self.assertEqual(packed_sample.serialized_size(), len(buffer))
+
+            # Test serialization & deserialization of `PartlyPacked`
+            partly_packed = sample_bh.PartlyPacked(1 << 40, 3, b'\x01\x02')
+            buffer = partly_packed.serialize()
+            msg, size = sample_bh.PartlyPacked.deserialize(buffer)
+            self.assertEqual(buffer, b'\x01\x80\x80\x80\x80\x80\x20\x03\x02\x01\x02')
+            self.assertEqual(msg, partly_packed)
+            self.assertEqual(size, len(buffer))
+
+            # Test serialization & deserialization of `CompressedPage`, with the
+            # same bytes as `cpp_generator_test.cc`
+            compressed_page = sample_bh.CompressedPage(
+                0x1000, [0xFF] * 200 + [0x01, 0x02], bytes(10)
+            )
+            compressed_page_message = next(
+                filter(lambda m: m.name == 'CompressedPage', buffham.messages)
+            )
+            serializer = engine.generate_serializer(
+                compressed_page_message, message_registry
+            )
+            buffer = compressed_page.serialize()
+            msg, size = sample_bh.CompressedPage.deserialize(buffer)
+            self.assertEqual(
+                buffer,
+                b'\x01\x00\x10\x00\x00\x07\x00\x81\xff\xb9\xff\x01\x01\x02\x02\xf7\x00',
+            )
+            self.assertEqual(buffer, serializer(compressed_page))
+            self.assertEqual(msg, compressed_page)
+            self.assertEqual(size, len(buffer))
+            self.assertEqual(compressed_page.serialized_size(), len(buffer))
+
             # Test that our transactions are generated
             self.assertEqual(
                 sample_bh.PING,
@@ -172,6 +246,121 @@ class TestPyGenerator(unittest.TestCase):
             generated = outfile.read_text()
             test_utils.assertTextEqual(self, generated, golden)
 
+    def test_generate_python_numpy(self):
+        buffham = self.sample_bh
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            message_registry = {
+                ('nlb.buffham.testdata.sample', m.name): m for m in buffham.messages
+            }
+            for m in self.other_bh.messages:
+                message_registry[('nlb.buffham.testdata.other', m.name)] = m
+            cache = engine.CodecCache(message_registry, numpy=True)
+
+            outfile = pathlib.Path(tempdir) / 'sample_bh.py'
+            py_generator.generate_python(
+                self.ctx,
+                parser.full_name(buffham.name),
+                outfile,
+                stub=False,
+                numpy=True,
+            )
+
+            spec = util.spec_from_file_location('sample_bh', outfile)
+            assert spec is not None
+            sample_bh = util.module_from_spec(spec)
+            assert spec.loader is not None
+            spec.loader.exec_module(sample_bh)
+
+            # Numeric lists encode from bytes and decode to array views
+            flash_page = sample_bh.FlashPage(0x1234, b'\x9a\xbc', 0x5678)
+            flash_page_message = next(
+                filter(lambda m: m.name == 'FlashPage', buffham.messages)
+            )
+            serializer = engine.generate_serializer(
+                flash_page_message, message_registry, cache
+            )
+            buffer = flash_page.serialize()
+            msg, size = sample_bh.FlashPage.deserialize(buffer)
+            self.assertEqual(buffer, serializer(flash_page))
+            self.assertIsInstance(msg.data, np.ndarray)
+            self.assertEqual(msg.data.dtype, np.dtype('<u1'))
+            self.assertIs(msg.data.base, buffer)
+            self.assertEqual(msg.data.tolist(), [0x9A, 0xBC])
+            self.assertEqual(size, len(buffer))
+
+            # Wider items are little-endian regardless of the input's type
+            ping = sample_bh.Ping(42)
+            log_message = sample_bh.LogMessage(
+                'Hello, world!', sample_bh.Verbosity.MEDIUM, other_bh.MyEnum.B
+            )
+            nested_message = sample_bh.NestedMessage(
+                False,
+                log_message,
+                [log_message],
+                [-0x1, -0x2],
+                ping,
+                other_bh.Pong(0x43),
+            )
+            nested_message_message = next(
+                filter(lambda m: m.name == 'NestedMessage', buffham.messages)
+            )
+            serializer = engine.generate_serializer(
+                nested_message_message, message_registry, cache
+            )
+            buffer = nested_message.serialize()
+            self.assertEqual(buffer, serializer(nested_message))
+            nested_message.numbers = np.array([-0x1, -0x2], dtype='>i4')
+            self.assertEqual(nested_message.serialize(), buffer)
+            msg, size = sample_bh.NestedMessage.deserialize(buffer)
+            self.assertEqual(msg.numbers.tolist(), [-0x1, -0x2])
+            self.assertEqual(size, len(buffer))
+
+    def test_generate_python_slots(self):
+        buffham = self.sample_bh
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            message_registry = {
+                ('nlb.buffham.testdata.sample', m.name): m for m in buffham.messages
+            }
+            for m in self.other_bh.messages:
+                message_registry[('nlb.buffham.testdata.other', m.name)] = m
+
+            outfile = pathlib.Path(tempdir) / 'sample_bh.py'
+            py_generator.generate_python(
+                self.ctx,
+                parser.full_name(buffham.name),
+                outfile,
+                stub=False,
+                slots=True,
+            )
+
+            spec = util.spec_from_file_location('sample_bh', outfile)
+            assert spec is not None
+            sample_bh = util.module_from_spec(spec)
+            assert spec.loader is not None
+            spec.loader.exec_module(sample_bh)
+
+            # Instances have slots instead of a `__dict__`
+            flash_page = sample_bh.FlashPage(0x1234, [0x9A, 0xBC], None)
+            self.assertEqual(
+                sample_bh.FlashPage.__slots__, ('address', 'data', 'read_size')
+            )
+            self.assertFalse(hasattr(flash_page, '__dict__'))
+
+            # ...and encode the same
+            flash_page_message = next(
+                filter(lambda m: m.name == 'FlashPage', buffham.messages)
+            )
+            serializer = engine.generate_serializer(
+                flash_page_message, message_registry
+            )
+            buffer = flash_page.serialize()
+            msg, size = sample_bh.FlashPage.deserialize(buffer)
+            self.assertEqual(buffer, serializer(flash_page))
+            self.assertEqual(msg, flash_page)
+            self.assertEqual(size, len(buffer))
+
     def test_generate_python_stub(self):
         buffham = self.sample_bh
 
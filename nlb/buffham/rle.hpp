@@ -0,0 +1,110 @@
+#pragma once
+
+#include <cinttypes>
+#include <cstddef>
+#include <cstring>
+#include <span>
+#include <vector>
+
+namespace nlb {
+namespace buffham {
+
+// PackBits run-length encoding for `rle` byte fields; see `rle.py`
+
+constexpr size_t kRleMaxChunk = 128;
+
+// Get the length of the run of equal bytes starting at `data[start]`
+inline size_t rleRunLength(std::span<const uint8_t> data, size_t start) {
+    size_t end = start + 1;
+    while (end < data.size() && data[end] == data[start]) {
+        end++;
+    }
+    return end - start;
+}
+
+// Get the size of `data` once run-length encoded
+inline size_t rleSize(std::span<const uint8_t> data) {
+    size_t size = 0;
+    size_t literals = 0;
+    for (size_t i = 0; i < data.size();) {
+        size_t run = rleRunLength(data, i);
+        if (run < 3) {
+            literals += run;
+        } else {
+            size += literals + (literals + kRleMaxChunk - 1) / kRleMaxChunk;
+            size += 2 * ((run + kRleMaxChunk - 1) / kRleMaxChunk);
+            literals = 0;
+        }
+        i += run;
+    }
+    return size + literals + (literals + kRleMaxChunk - 1) / kRleMaxChunk;
+}
+
+// Run-length encode `data` into `buffer`, returning the number of bytes written
+inline size_t rleEncode(std::span<const uint8_t> data, uint8_t *buffer) {
+    size_t size = 0;
+    size_t literals_start = 0;
+
+    auto copy = [&](size_t end) {
+        while (literals_start < end) {
+            size_t chunk = end - literals_start;
+            chunk = chunk < kRleMaxChunk ? chunk : kRleMaxChunk;
+            buffer[size++] = static_cast<uint8_t>(chunk - 1);
+            memcpy(buffer + size, data.data() + literals_start, chunk);
+            size += chunk;
+            literals_start += chunk;
+        }
+    };
+
+    for (size_t i = 0; i < data.size();) {
+        size_t run = rleRunLength(data, i);
+        if (run >= 3) {
+            copy(i);
+            for (size_t left = run; left > 0;) {
+                // Never leave a lone byte at the end of a run
+                size_t chunk = left < kRleMaxChunk ? left : kRleMaxChunk;
+                if (left - chunk == 1) {
+                    chunk--;
+                }
+                buffer[size++] = static_cast<uint8_t>(257 - chunk);
+                buffer[size++] = data[i];
+                left -= chunk;
+            }
+            literals_start = i + run;
+        }
+        i += run;
+    }
+    copy(data.size());
+    return size;
+}
+
+// Decode run-length encoded `data`, appending to `out`
+//
+// Returns false if a chunk runs past the end of `data`
+inline bool rleDecode(std::span<const uint8_t> data, std::vector<uint8_t> &out) {
+    size_t offset = 0;
+    while (offset < data.size()) {
+        uint8_t header = data[offset];
+        if (header < 128) {
+            size_t chunk = header + 1;
+            if (offset + 1 + chunk > data.size()) {
+                return false;
+            }
+            out.insert(out.end(), data.begin() + offset + 1,
+                       data.begin() + offset + 1 + chunk);
+            offset += 1 + chunk;
+        } else if (header > 128) {
+            if (offset + 1 >= data.size()) {
+                return false;
+            }
+            out.insert(out.end(), 257 - header, data[offset + 1]);
+            offset += 2;
+        } else {
+            offset++;
+        }
+    }
+    return true;
+}
+
+}  // namespace buffham
+}  // namespace nlb
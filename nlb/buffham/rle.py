@@ -0,0 +1,97 @@
+"""PackBits run-length encoding for `rle` byte fields.
+
+Encoded data is a series of chunks, each a header byte and its data:
+- `0 <= header < 128`: the next `header + 1` bytes are copied as-is
+- `128 < header`: the next byte is repeated `257 - header` times
+- `header == 128`: no data (never written, skipped when read)
+
+Runs of three or more equal bytes are repeated; anything else is copied. This
+matches `nlb/buffham/rle.hpp` byte for byte, so either side can decode what
+the other encodes.
+"""
+
+import re
+from typing import Iterator
+
+# Longest literal or run a single chunk holds
+MAX_CHUNK = 128
+
+# Runs of three or more equal bytes; shorter runs are no cheaper to repeat
+_RUN = re.compile(rb'(.)\1{2,}', re.DOTALL)
+
+type Buffer = bytes | bytearray | memoryview
+
+
+def _num_chunks(length: int) -> int:
+    """Get the number of chunks a literal or run of `length` bytes takes."""
+    return (length + MAX_CHUNK - 1) // MAX_CHUNK
+
+
+def _run_chunks(length: int) -> Iterator[int]:
+    """Split a run into chunk lengths, never leaving a lone byte at the end."""
+    while length:
+        chunk = min(length, MAX_CHUNK)
+        if length - chunk == 1:
+            chunk -= 1
+        yield chunk
+        length -= chunk
+
+
+def encoded_size(data: Buffer) -> int:
+    """Get the size of `data` once encoded, without encoding it."""
+    data = memoryview(data).cast('B')
+    size = start = 0
+    for match in _RUN.finditer(data):
+        run_start, run_end = match.span()
+        literals = run_start - start
+        size += literals + _num_chunks(literals) + 2 * _num_chunks(run_end - run_start)
+        start = run_end
+    literals = len(data) - start
+    return size + literals + _num_chunks(literals)
+
+
+def encode(data: Buffer) -> bytes:
+    """Run-length encode `data`."""
+    data = memoryview(data).cast('B')
+    chunks: list[bytes] = []
+
+    def copy(literals: memoryview) -> None:
+        for i in range(0, len(literals), MAX_CHUNK):
+            chunk = literals[i : i + MAX_CHUNK]
+            chunks.append(bytes((len(chunk) - 1,)) + chunk)
+
+    start = 0
+    for match in _RUN.finditer(data):
+        run_start, run_end = match.span()
+        copy(data[start:run_start])
+        for length in _run_chunks(run_end - run_start):
+            chunks.append(bytes((257 - length, data[run_start])))
+        start = run_end
+    copy(data[start:])
+    return b''.join(chunks)
+
+
+def decode(data: Buffer) -> bytearray:
+    """Decode run-length encoded `data`.
+
+    Raises:
+        ValueError: If a chunk runs past the end of `data`
+    """
+    decoded = bytearray()
+    offset = 0
+    while offset < len(data):
+        header = data[offset]
+        if header < 128:
+            end = offset + 2 + header
+            if end > len(data):
+                raise ValueError(f'Literal chunk at {offset} runs past the data')
+            decoded += data[offset + 1 : end]
+            offset = end
+        elif header > 128:
+            if offset + 1 >= len(data):
+                raise ValueError(f'Run chunk at {offset} runs past the data')
+            decoded += bytes((data[offset + 1],)) * (257 - header)
+            offset += 2
+        else:
+            offset += 1
+    return decoded
@@ -0,0 +1,51 @@
+import random
+import unittest
+
+import numpy as np
+
+from nlb.buffham import rle
+
+
+class TestRle(unittest.TestCase):
+    def test_encode(self):
+        # Runs of three or more are repeated; shorter runs are copied
+        self.assertEqual(rle.encode(b''), b'')
+        self.assertEqual(rle.encode(b'aab'), b'\x02aab')
+        self.assertEqual(rle.encode(b'abbbc'), b'\x00a\xfeb\x00c')
+
+        # Long runs and literals are split into chunks of 128
+        self.assertEqual(rle.encode(bytes(300)), b'\x81\x00\x81\x00\xd5\x00')
+        literals = bytes(range(200))
+        self.assertEqual(
+            rle.encode(literals), b'\x7f' + literals[:128] + b'\x47' + literals[128:]
+        )
+
+        # ...without leaving a lone byte at the end of a run
+        self.assertEqual(rle.encode(bytes(129)), b'\x82\x00\xff\x00')
+
+    def test_round_trip(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            # Mostly erased flash, with some data
+            data = bytes(
+                rng.choice((0xFF, 0x00, rng.randrange(256)))
+                for _ in range(rng.randrange(1024))
+            )
+            encoded = rle.encode(data)
+            self.assertEqual(rle.encoded_size(data), len(encoded))
+            self.assertEqual(rle.decode(encoded), data)
+            self.assertEqual(rle.decode(memoryview(encoded)), data)
+            self.assertEqual(rle.encode(np.frombuffer(data, np.uint8)), encoded)
+
+    def test_decode(self):
+        # No-op headers are skipped
+        self.assertEqual(rle.decode(b'\x80\x00a\x80'), b'a')
+
+        # Chunks can't run past the end of the data
+        for encoded in (b'\x02ab', b'\xfe'):
+            with self.assertRaises(ValueError):
+                rle.decode(encoded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,9 @@
 import dataclasses
 import enum
 import struct
-from typing import Self
+from typing import ClassVar, Self
+
+_LENGTH = struct.Struct('<H')
 
 class FieldType(enum.Enum):
     BOOL = 0
@@ -30,30 +32,54 @@ class Name:
     name: str
     namespace: str
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 7
+    MAX_ENCODED_SIZE: ClassVar[int] = 131593
+
+    def serialized_size(self) -> int:
+        size = 0
+        size += 2 + len(self.name.encode())
+        size += 2 + len(self.namespace.encode())
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        namespace_bytes = self.namespace.encode()
+        _LENGTH.pack_into(buffer, offset, len(namespace_bytes))
+        offset += 2
+        buffer[offset:offset + len(namespace_bytes)] = namespace_bytes
+        offset += len(namespace_bytes)
+        return offset
+
     def serialize(self) -> bytes:
-        buffer = bytes()
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<H', len(self.namespace))
-        buffer += self.namespace.encode()
-        return buffer
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        namespace_size = struct.unpack_from('<H', buffer, offset)[0]
+        namespace_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        namespace = buffer[offset:offset + namespace_size].decode()
+        namespace = str(buffer[offset:offset + namespace_size], 'utf-8')
         offset += namespace_size
         return cls(
             name=name,
             namespace=namespace,
         ), offset
 
+_Field_pri_type = struct.Struct('<B')
+_Field_sub_type = struct.Struct('<B')
+_Field_is_optional = struct.Struct('<B')
+_Field_is_packed = struct.Struct('<BB')
+
 @dataclasses.dataclass
 class Field:
     name: str
@@ -65,57 +91,97 @@ class Field:
     obj_name: Name | None
     comments: list[str]
     inline_comment: str | None
-
-    def serialize(self) -> bytes:
-        buffer = bytes()
+    # Encode integers and lengths as varints
+    is_packed: bool
+    # Run-length encode bytes
+    is_rle: bool
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 12
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312139806
+
+    def serialized_size(self) -> int:
+        size = 5
+        size += 2 + len(self.name.encode())
+        if self.sub_type is not None:
+            size += 1
+        if self.obj_name is not None:
+            size += self.obj_name.serialized_size()
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        if self.inline_comment is not None:
+            size += 2 + len(self.inline_comment.encode())
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
         optional_bitfield = 0
         optional_bitfield |= (1 << 0) if self.sub_type is not None else 0
         optional_bitfield |= (1 << 1) if self.obj_name is not None else 0
         optional_bitfield |= (1 << 2) if self.inline_comment is not None else 0
-        buffer += optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<B', self.pri_type.value)
-        buffer += struct.pack('<B', self.sub_type.value) if self.sub_type is not None else bytes()
-        buffer += struct.pack('<B', self.is_optional)
-        buffer += self.obj_name.serialize() if self.obj_name is not None else bytes()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        buffer += struct.pack('<H', len(self.inline_comment)) if self.inline_comment is not None else bytes()
-        buffer += self.inline_comment.encode() if self.inline_comment is not None else bytes()
-        return buffer
+        buffer[offset:offset + 1] = optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
+        offset += 1
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _Field_pri_type.pack_into(buffer, offset, self.pri_type.value)
+        offset += 1
+        if self.sub_type is not None:
+            _Field_sub_type.pack_into(buffer, offset, self.sub_type.value)
+            offset += 1
+        _Field_is_optional.pack_into(buffer, offset, self.is_optional)
+        offset += 1
+        if self.obj_name is not None:
+            offset = self.obj_name.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        if self.inline_comment is not None:
+            inline_comment_bytes = self.inline_comment.encode()
+            _LENGTH.pack_into(buffer, offset, len(inline_comment_bytes))
+            offset += 2
+            buffer[offset:offset + len(inline_comment_bytes)] = inline_comment_bytes
+            offset += len(inline_comment_bytes)
+        _Field_is_packed.pack_into(buffer, offset, self.is_packed, self.is_rle)
+        offset += 2
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        optional_bitfield = int.from_bytes(buffer[:1], byteorder='little', signed=False)
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        optional_bitfield = int.from_bytes(buffer[offset:offset + 1], byteorder='little', signed=False)
         offset += 1
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        pri_type = FieldType(struct.unpack_from('<B', buffer, offset)[0])
+        pri_type = FieldType(_Field_pri_type.unpack_from(buffer, offset)[0])
         offset += 1
-        sub_type = FieldType(struct.unpack_from('<B', buffer, offset)[0]) if (optional_bitfield >> 0) & 1 else None
+        sub_type = FieldType(_Field_sub_type.unpack_from(buffer, offset)[0]) if (optional_bitfield >> 0) & 1 else None
         offset += 1 * (sub_type is not None)
-        is_optional = struct.unpack_from('<B', buffer, offset)[0]
+        is_optional = _Field_is_optional.unpack_from(buffer, offset)[0]
         offset += 1
-        obj_name, obj_name_size = Name.deserialize(buffer[offset:]) if (optional_bitfield >> 1) & 1 else (None, 0)
-        offset += obj_name_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        obj_name, offset = Name.deserialize(buffer, offset) if (optional_bitfield >> 1) & 1 else (None, offset)
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
-        inline_comment_size = struct.unpack_from('<H', buffer, offset)[0] if (optional_bitfield >> 2) & 1 else 0
+        inline_comment_size = _LENGTH.unpack_from(buffer, offset)[0] if (optional_bitfield >> 2) & 1 else 0
         offset += 2 * ((optional_bitfield >> 2) & 1)
-        inline_comment = buffer[offset:offset + inline_comment_size].decode() if (optional_bitfield >> 2) & 1 else None
+        inline_comment = str(buffer[offset:offset + inline_comment_size], 'utf-8') if (optional_bitfield >> 2) & 1 else None
         offset += inline_comment_size
+        is_packed, is_rle = _Field_is_packed.unpack_from(buffer, offset)
+        offset += 2
         return cls(
             name=name,
             pri_type=pri_type,
@@ -124,6 +190,8 @@ class Field:
             obj_name=obj_name,
             comments=comments,
             inline_comment=inline_comment,
+            is_packed=is_packed,
+            is_rle=is_rle,
         ), offset
 
 @dataclasses.dataclass
@@ -132,40 +200,58 @@ class Message:
     fields: list[Field]
     comments: list[str]
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<H', len(self.fields))
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 9
+    MAX_ENCODED_SIZE: ClassVar[int] = 282600393943116
+
+    def serialized_size(self) -> int:
+        size = 0
+        size += 2 + len(self.name.encode())
+        size += 2 + sum(item.serialized_size() for item in self.fields)
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _LENGTH.pack_into(buffer, offset, len(self.fields))
+        offset += 2
         for item in self.fields:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        return buffer
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        fields_size = struct.unpack_from('<H', buffer, offset)[0]
+        fields_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         fields = []
         for _ in range(fields_size):
-            item, item_size = Field.deserialize(buffer[offset:])
+            item, offset = Field.deserialize(buffer, offset)
             fields.append(item)
-            offset += item_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
         return cls(
             name=name,
@@ -173,6 +259,8 @@ class Message:
             comments=comments,
         ), offset
 
+_EnumField_value = struct.Struct('<B')
+
 @dataclasses.dataclass
 class EnumField:
     name: str
@@ -181,44 +269,69 @@ class EnumField:
     comments: list[str]
     inline_comment: str | None
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 9
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312008212
+
+    def serialized_size(self) -> int:
+        size = 2
+        size += 2 + len(self.name.encode())
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        if self.inline_comment is not None:
+            size += 2 + len(self.inline_comment.encode())
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
         optional_bitfield = 0
         optional_bitfield |= (1 << 0) if self.inline_comment is not None else 0
-        buffer += optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<B', self.value)
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        buffer += struct.pack('<H', len(self.inline_comment)) if self.inline_comment is not None else bytes()
-        buffer += self.inline_comment.encode() if self.inline_comment is not None else bytes()
-        return buffer
+        buffer[offset:offset + 1] = optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
+        offset += 1
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _EnumField_value.pack_into(buffer, offset, self.value)
+        offset += 1
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        if self.inline_comment is not None:
+            inline_comment_bytes = self.inline_comment.encode()
+            _LENGTH.pack_into(buffer, offset, len(inline_comment_bytes))
+            offset += 2
+            buffer[offset:offset + len(inline_comment_bytes)] = inline_comment_bytes
+            offset += len(inline_comment_bytes)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        optional_bitfield = int.from_bytes(buffer[:1], byteorder='little', signed=False)
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        optional_bitfield = int.from_bytes(buffer[offset:offset + 1], byteorder='little', signed=False)
         offset += 1
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        value = struct.unpack_from('<B', buffer, offset)[0]
+        value = _EnumField_value.unpack_from(buffer, offset)[0]
         offset += 1
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
-        inline_comment_size = struct.unpack_from('<H', buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
+        inline_comment_size = _LENGTH.unpack_from(buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
         offset += 2 * ((optional_bitfield >> 0) & 1)
-        inline_comment = buffer[offset:offset + inline_comment_size].decode() if (optional_bitfield >> 0) & 1 else None
+        inline_comment = str(buffer[offset:offset + inline_comment_size], 'utf-8') if (optional_bitfield >> 0) & 1 else None
         offset += inline_comment_size
         return cls(
             name=name,
@@ -233,40 +346,58 @@ class Enum:
     fields: list[EnumField]
     comments: list[str]
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<H', len(self.fields))
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 9
+    MAX_ENCODED_SIZE: ClassVar[int] = 282591769926714
+
+    def serialized_size(self) -> int:
+        size = 0
+        size += 2 + len(self.name.encode())
+        size += 2 + sum(item.serialized_size() for item in self.fields)
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _LENGTH.pack_into(buffer, offset, len(self.fields))
+        offset += 2
         for item in self.fields:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        return buffer
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        fields_size = struct.unpack_from('<H', buffer, offset)[0]
+        fields_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         fields = []
         for _ in range(fields_size):
-            item, item_size = EnumField.deserialize(buffer[offset:])
+            item, offset = EnumField.deserialize(buffer, offset)
             fields.append(item)
-            offset += item_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
         return cls(
             name=name,
@@ -274,6 +405,8 @@ class Enum:
             comments=comments,
         ), offset
 
+_Transaction_request_id = struct.Struct('<H')
+
 @dataclasses.dataclass
 class Transaction:
     name: str
@@ -284,50 +417,75 @@ class Transaction:
     comments: list[str]
     inline_comment: str | None
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 18
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312271393
+
+    def serialized_size(self) -> int:
+        size = 3
+        size += 2 + len(self.name.encode())
+        size += self.receive_name.serialized_size()
+        size += self.send_name.serialized_size()
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        if self.inline_comment is not None:
+            size += 2 + len(self.inline_comment.encode())
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
         optional_bitfield = 0
         optional_bitfield |= (1 << 0) if self.inline_comment is not None else 0
-        buffer += optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<H', self.request_id)
-        buffer += self.receive_name.serialize()
-        buffer += self.send_name.serialize()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        buffer += struct.pack('<H', len(self.inline_comment)) if self.inline_comment is not None else bytes()
-        buffer += self.inline_comment.encode() if self.inline_comment is not None else bytes()
-        return buffer
+        buffer[offset:offset + 1] = optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
+        offset += 1
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _Transaction_request_id.pack_into(buffer, offset, self.request_id)
+        offset += 2
+        offset = self.receive_name.serialize_into(buffer, offset)
+        offset = self.send_name.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        if self.inline_comment is not None:
+            inline_comment_bytes = self.inline_comment.encode()
+            _LENGTH.pack_into(buffer, offset, len(inline_comment_bytes))
+            offset += 2
+            buffer[offset:offset + len(inline_comment_bytes)] = inline_comment_bytes
+            offset += len(inline_comment_bytes)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        optional_bitfield = int.from_bytes(buffer[:1], byteorder='little', signed=False)
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        optional_bitfield = int.from_bytes(buffer[offset:offset + 1], byteorder='little', signed=False)
         offset += 1
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        request_id = struct.unpack_from('<H', buffer, offset)[0]
+        request_id = _Transaction_request_id.unpack_from(buffer, offset)[0]
         offset += 2
-        receive_name, receive_name_size = Name.deserialize(buffer[offset:])
-        offset += receive_name_size
-        send_name, send_name_size = Name.deserialize(buffer[offset:])
-        offset += send_name_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        receive_name, offset = Name.deserialize(buffer, offset)
+        send_name, offset = Name.deserialize(buffer, offset)
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
-        inline_comment_size = struct.unpack_from('<H', buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
+        inline_comment_size = _LENGTH.unpack_from(buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
         offset += 2 * ((optional_bitfield >> 0) & 1)
-        inline_comment = buffer[offset:offset + inline_comment_size].decode() if (optional_bitfield >> 0) & 1 else None
+        inline_comment = str(buffer[offset:offset + inline_comment_size], 'utf-8') if (optional_bitfield >> 0) & 1 else None
         offset += inline_comment_size
         return cls(
             name=name,
@@ -338,6 +496,8 @@ class Transaction:
             inline_comment=inline_comment,
         ), offset
 
+_Publish_request_id = struct.Struct('<H')
+
 @dataclasses.dataclass
 class Publish:
     name: str
@@ -347,47 +507,72 @@ class Publish:
     comments: list[str]
     inline_comment: str | None
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 14
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312139803
+
+    def serialized_size(self) -> int:
+        size = 3
+        size += 2 + len(self.name.encode())
+        size += self.send_name.serialized_size()
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        if self.inline_comment is not None:
+            size += 2 + len(self.inline_comment.encode())
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
         optional_bitfield = 0
         optional_bitfield |= (1 << 0) if self.inline_comment is not None else 0
-        buffer += optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<H', self.request_id)
-        buffer += self.send_name.serialize()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        buffer += struct.pack('<H', len(self.inline_comment)) if self.inline_comment is not None else bytes()
-        buffer += self.inline_comment.encode() if self.inline_comment is not None else bytes()
-        return buffer
+        buffer[offset:offset + 1] = optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
+        offset += 1
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _Publish_request_id.pack_into(buffer, offset, self.request_id)
+        offset += 2
+        offset = self.send_name.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        if self.inline_comment is not None:
+            inline_comment_bytes = self.inline_comment.encode()
+            _LENGTH.pack_into(buffer, offset, len(inline_comment_bytes))
+            offset += 2
+            buffer[offset:offset + len(inline_comment_bytes)] = inline_comment_bytes
+            offset += len(inline_comment_bytes)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        optional_bitfield = int.from_bytes(buffer[:1], byteorder='little', signed=False)
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        optional_bitfield = int.from_bytes(buffer[offset:offset + 1], byteorder='little', signed=False)
         offset += 1
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        request_id = struct.unpack_from('<H', buffer, offset)[0]
+        request_id = _Publish_request_id.unpack_from(buffer, offset)[0]
         offset += 2
-        send_name, send_name_size = Name.deserialize(buffer[offset:])
-        offset += send_name_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        send_name, offset = Name.deserialize(buffer, offset)
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
-        inline_comment_size = struct.unpack_from('<H', buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
+        inline_comment_size = _LENGTH.unpack_from(buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
         offset += 2 * ((optional_bitfield >> 0) & 1)
-        inline_comment = buffer[offset:offset + inline_comment_size].decode() if (optional_bitfield >> 0) & 1 else None
+        inline_comment = str(buffer[offset:offset + inline_comment_size], 'utf-8') if (optional_bitfield >> 0) & 1 else None
         offset += inline_comment_size
         return cls(
             name=name,
@@ -403,41 +588,65 @@ class SvrMethod:
     comments: list[str]
     inline_comment: str | None
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 8
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312008211
+
+    def serialized_size(self) -> int:
+        size = 1
+        size += 2 + len(self.name.encode())
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        if self.inline_comment is not None:
+            size += 2 + len(self.inline_comment.encode())
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
         optional_bitfield = 0
         optional_bitfield |= (1 << 0) if self.inline_comment is not None else 0
-        buffer += optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        buffer += struct.pack('<H', len(self.inline_comment)) if self.inline_comment is not None else bytes()
-        buffer += self.inline_comment.encode() if self.inline_comment is not None else bytes()
-        return buffer
+        buffer[offset:offset + 1] = optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
+        offset += 1
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        if self.inline_comment is not None:
+            inline_comment_bytes = self.inline_comment.encode()
+            _LENGTH.pack_into(buffer, offset, len(inline_comment_bytes))
+            offset += 2
+            buffer[offset:offset + len(inline_comment_bytes)] = inline_comment_bytes
+            offset += len(inline_comment_bytes)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        optional_bitfield = int.from_bytes(buffer[:1], byteorder='little', signed=False)
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        optional_bitfield = int.from_bytes(buffer[offset:offset + 1], byteorder='little', signed=False)
         offset += 1
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
-        inline_comment_size = struct.unpack_from('<H', buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
+        inline_comment_size = _LENGTH.unpack_from(buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
         offset += 2 * ((optional_bitfield >> 0) & 1)
-        inline_comment = buffer[offset:offset + inline_comment_size].decode() if (optional_bitfield >> 0) & 1 else None
+        inline_comment = str(buffer[offset:offset + inline_comment_size], 'utf-8') if (optional_bitfield >> 0) & 1 else None
         offset += inline_comment_size
         return cls(
             name=name,
@@ -445,6 +654,8 @@ class SvrMethod:
             inline_comment=inline_comment,
         ), offset
 
+_Constant_type = struct.Struct('<B')
+
 @dataclasses.dataclass
 class Constant:
     name: str
@@ -455,68 +666,103 @@ class Constant:
     inline_comment: str | None
     references: list[str]
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 15
+    MAX_ENCODED_SIZE: ClassVar[int] = 8624016419
+
+    def serialized_size(self) -> int:
+        size = 2
+        size += 2 + len(self.name.encode())
+        size += 2 + len(self.value.encode())
+        size += 2 + len(self.expanded_value.encode())
+        size += 2 + 2 * len(self.comments) + sum([len(item.encode()) for item in self.comments])
+        if self.inline_comment is not None:
+            size += 2 + len(self.inline_comment.encode())
+        size += 2 + 2 * len(self.references) + sum([len(item.encode()) for item in self.references])
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
         optional_bitfield = 0
         optional_bitfield |= (1 << 0) if self.inline_comment is not None else 0
-        buffer += optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
-        buffer += struct.pack('<H', len(self.name))
-        buffer += self.name.encode()
-        buffer += struct.pack('<B', self.type.value)
-        buffer += struct.pack('<H', len(self.value))
-        buffer += self.value.encode()
-        buffer += struct.pack('<H', len(self.expanded_value))
-        buffer += self.expanded_value.encode()
-        buffer += struct.pack('<H', len(self.comments))
-        for item in self.comments:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        buffer += struct.pack('<H', len(self.inline_comment)) if self.inline_comment is not None else bytes()
-        buffer += self.inline_comment.encode() if self.inline_comment is not None else bytes()
-        buffer += struct.pack('<H', len(self.references))
-        for item in self.references:
-            buffer += struct.pack('<H', len(item))
-            buffer += item.encode()
-        return buffer
+        buffer[offset:offset + 1] = optional_bitfield.to_bytes(length=1, byteorder='little', signed=False)
+        offset += 1
+        name_bytes = self.name.encode()
+        _LENGTH.pack_into(buffer, offset, len(name_bytes))
+        offset += 2
+        buffer[offset:offset + len(name_bytes)] = name_bytes
+        offset += len(name_bytes)
+        _Constant_type.pack_into(buffer, offset, self.type.value)
+        offset += 1
+        value_bytes = self.value.encode()
+        _LENGTH.pack_into(buffer, offset, len(value_bytes))
+        offset += 2
+        buffer[offset:offset + len(value_bytes)] = value_bytes
+        offset += len(value_bytes)
+        expanded_value_bytes = self.expanded_value.encode()
+        _LENGTH.pack_into(buffer, offset, len(expanded_value_bytes))
+        offset += 2
+        buffer[offset:offset + len(expanded_value_bytes)] = expanded_value_bytes
+        offset += len(expanded_value_bytes)
+        _LENGTH.pack_into(buffer, offset, len(self.comments))
+        offset += 2
+        comments_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.comments)])
+        buffer[offset:offset + len(comments_data)] = comments_data
+        offset += len(comments_data)
+        if self.inline_comment is not None:
+            inline_comment_bytes = self.inline_comment.encode()
+            _LENGTH.pack_into(buffer, offset, len(inline_comment_bytes))
+            offset += 2
+            buffer[offset:offset + len(inline_comment_bytes)] = inline_comment_bytes
+            offset += len(inline_comment_bytes)
+        _LENGTH.pack_into(buffer, offset, len(self.references))
+        offset += 2
+        references_data = b''.join([_LENGTH.pack(len(item)) + item for item in (item.encode() for item in self.references)])
+        buffer[offset:offset + len(references_data)] = references_data
+        offset += len(references_data)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        optional_bitfield = int.from_bytes(buffer[:1], byteorder='little', signed=False)
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        optional_bitfield = int.from_bytes(buffer[offset:offset + 1], byteorder='little', signed=False)
         offset += 1
-        name_size = struct.unpack_from('<H', buffer, offset)[0]
+        name_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        name = buffer[offset:offset + name_size].decode()
+        name = str(buffer[offset:offset + name_size], 'utf-8')
         offset += name_size
-        type = FieldType(struct.unpack_from('<B', buffer, offset)[0])
+        type = FieldType(_Constant_type.unpack_from(buffer, offset)[0])
         offset += 1
-        value_size = struct.unpack_from('<H', buffer, offset)[0]
+        value_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        value = buffer[offset:offset + value_size].decode()
+        value = str(buffer[offset:offset + value_size], 'utf-8')
         offset += value_size
-        expanded_value_size = struct.unpack_from('<H', buffer, offset)[0]
+        expanded_value_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
-        expanded_value = buffer[offset:offset + expanded_value_size].decode()
+        expanded_value = str(buffer[offset:offset + expanded_value_size], 'utf-8')
         offset += expanded_value_size
-        comments_size = struct.unpack_from('<H', buffer, offset)[0]
+        comments_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         comments = []
         for _ in range(comments_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            comments.append(buffer[offset:offset + item_size].decode())
+            comments.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
-        inline_comment_size = struct.unpack_from('<H', buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
+        inline_comment_size = _LENGTH.unpack_from(buffer, offset)[0] if (optional_bitfield >> 0) & 1 else 0
         offset += 2 * ((optional_bitfield >> 0) & 1)
-        inline_comment = buffer[offset:offset + inline_comment_size].decode() if (optional_bitfield >> 0) & 1 else None
+        inline_comment = str(buffer[offset:offset + inline_comment_size], 'utf-8') if (optional_bitfield >> 0) & 1 else None
         offset += inline_comment_size
-        references_size = struct.unpack_from('<H', buffer, offset)[0]
+        references_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         references = []
         for _ in range(references_size):
-            item_size = struct.unpack_from('<H', buffer, offset)[0]
+            item_size = _LENGTH.unpack_from(buffer, offset)[0]
             offset += 2
-            references.append(buffer[offset:offset + item_size].decode())
+            references.append(str(buffer[offset:offset + item_size], 'utf-8'))
             offset += item_size
         return cls(
             name=name,
@@ -538,76 +784,93 @@ class Buffham:
     enums: list[Enum]
     svr_methods: list[SvrMethod]
 
-    def serialize(self) -> bytes:
-        buffer = bytes()
-        buffer += self.name.serialize()
-        buffer += struct.pack('<H', len(self.messages))
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 19
+    MAX_ENCODED_SIZE: ClassVar[int] = 37041281422370230944
+
+    def serialized_size(self) -> int:
+        size = 0
+        size += self.name.serialized_size()
+        size += 2 + sum(item.serialized_size() for item in self.messages)
+        size += 2 + sum(item.serialized_size() for item in self.transactions)
+        size += 2 + sum(item.serialized_size() for item in self.publishes)
+        size += 2 + sum(item.serialized_size() for item in self.constants)
+        size += 2 + sum(item.serialized_size() for item in self.enums)
+        size += 2 + sum(item.serialized_size() for item in self.svr_methods)
+        return size
+
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        offset = self.name.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.messages))
+        offset += 2
         for item in self.messages:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.transactions))
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.transactions))
+        offset += 2
         for item in self.transactions:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.publishes))
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.publishes))
+        offset += 2
         for item in self.publishes:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.constants))
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.constants))
+        offset += 2
         for item in self.constants:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.enums))
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.enums))
+        offset += 2
         for item in self.enums:
-            buffer += item.serialize()
-        buffer += struct.pack('<H', len(self.svr_methods))
+            offset = item.serialize_into(buffer, offset)
+        _LENGTH.pack_into(buffer, offset, len(self.svr_methods))
+        offset += 2
         for item in self.svr_methods:
-            buffer += item.serialize()
-        return buffer
+            offset = item.serialize_into(buffer, offset)
+        return offset
+
+    def serialize(self) -> bytes:
+        buffer = bytearray(self.serialized_size())
+        self.serialize_into(buffer)
+        return bytes(buffer)
 
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]:
-        offset = 0
-        name, name_size = Name.deserialize(buffer[offset:])
-        offset += name_size
-        messages_size = struct.unpack_from('<H', buffer, offset)[0]
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]:
+        name, offset = Name.deserialize(buffer, offset)
+        messages_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         messages = []
         for _ in range(messages_size):
-            item, item_size = Message.deserialize(buffer[offset:])
+            item, offset = Message.deserialize(buffer, offset)
             messages.append(item)
-            offset += item_size
-        transactions_size = struct.unpack_from('<H', buffer, offset)[0]
+        transactions_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         transactions = []
         for _ in range(transactions_size):
-            item, item_size = Transaction.deserialize(buffer[offset:])
+            item, offset = Transaction.deserialize(buffer, offset)
             transactions.append(item)
-            offset += item_size
-        publishes_size = struct.unpack_from('<H', buffer, offset)[0]
+        publishes_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         publishes = []
         for _ in range(publishes_size):
-            item, item_size = Publish.deserialize(buffer[offset:])
+            item, offset = Publish.deserialize(buffer, offset)
             publishes.append(item)
-            offset += item_size
-        constants_size = struct.unpack_from('<H', buffer, offset)[0]
+        constants_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         constants = []
         for _ in range(constants_size):
-            item, item_size = Constant.deserialize(buffer[offset:])
+            item, offset = Constant.deserialize(buffer, offset)
             constants.append(item)
-            offset += item_size
-        enums_size = struct.unpack_from('<H', buffer, offset)[0]
+        enums_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         enums = []
         for _ in range(enums_size):
-            item, item_size = Enum.deserialize(buffer[offset:])
+            item, offset = Enum.deserialize(buffer, offset)
             enums.append(item)
-            offset += item_size
-        svr_methods_size = struct.unpack_from('<H', buffer, offset)[0]
+        svr_methods_size = _LENGTH.unpack_from(buffer, offset)[0]
         offset += 2
         svr_methods = []
         for _ in range(svr_methods_size):
-            item, item_size = SvrMethod.deserialize(buffer[offset:])
+            item, offset = SvrMethod.deserialize(buffer, offset)
             svr_methods.append(item)
-            offset += item_size
         return cls(
             name=name,
             messages=messages,
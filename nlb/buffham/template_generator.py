@@ -2,10 +2,28 @@ import pathlib
 import re
 
 from nlb.buffham import parser
+from nlb.buffham import schema_bh
 
 TEMPLATE_PATTERN = re.compile(r'\{\{ ([\w|\.]+) \}\}')
 
 
+def constant_index(
+    ctx: parser.Parser, primary_namespace: str
+) -> dict[str, schema_bh.Constant]:
+    """Index the context's constants by the names templates may use.
+
+    Constants are indexed by their name relative to the primary namespace, and
+    by their full name, so constants in the primary namespace may be
+    referenced either way. The first constant with a name wins.
+    """
+    index: dict[str, schema_bh.Constant] = {}
+    for constant, name in ctx.iter_constants():
+        index.setdefault(parser.relative_name(name, primary_namespace), constant)
+    for constant, name in ctx.iter_constants():
+        index.setdefault(parser.full_name(name), constant)
+    return index
+
+
 def generate_template(
     ctx: parser.Parser,
     primary_namespace: str,
@@ -13,29 +31,16 @@ def generate_template(
     template_file: pathlib.Path,
 ) -> None:
     """Generate a template file."""
-    lines = template_file.read_text().splitlines()
-
-    # Search through the lines of the template file for template patterns
-    with outfile.open('w') as fp:
-        for line in lines:
-            match = TEMPLATE_PATTERN.findall(line)
-            if not match:
-                fp.write(line + '\n')
-                continue
-
-            for m in match:
-                # Find the value in the Buffham constants
-                constant, _ = next(
-                    filter(
-                        lambda x: parser.relative_name(x[1], primary_namespace) == m,
-                        ctx.iter_constants(),
-                    ),
-                    (None, None),
-                )
-
-                if constant is None:
-                    raise ValueError(f'Constant {m} not found')
-
-                line = line.replace(f'{{{{ {m} }}}}', constant.expanded_value)
-
-            fp.write(line + '\n')
+    constants = constant_index(ctx, primary_namespace)
+
+    def substitute(match: re.Match[str]) -> str:
+        # Find the value in the Buffham constants
+        constant = constants.get(match.group(1))
+        if constant is None:
+            raise ValueError(f'Constant {match.group(1)} not found')
+        return constant.expanded_value
+
+    # Render the template a line at a time, substituting every pattern at once
+    with template_file.open() as template, outfile.open('w') as fp:
+        for line in template:
+            fp.write(TEMPLATE_PATTERN.sub(substitute, line.removesuffix('\n')) + '\n')
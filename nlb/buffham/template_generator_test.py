@@ -1,7 +1,11 @@
 import os
 import pathlib
+import tempfile
 import unittest
 
+from nlb.buffham import parser
+from nlb.buffham import template_generator
+
 
 class TestTemplateGenerator(unittest.TestCase):
     def setUp(self) -> None:
@@ -16,3 +20,38 @@ class TestTemplateGenerator(unittest.TestCase):
         golden = self.golden_file.read_text()
         generated = self.test_file.read_text()
         self.assertEqual(generated, golden)
+
+
+class TestConstantLookup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = parser.Parser()
+        self.ctx.parse_file(pathlib.Path('nlb/buffham/testdata/other.bh'))
+        self.ctx.parse_file(pathlib.Path('nlb/buffham/testdata/sample.bh'))
+        self.namespace = 'nlb.buffham.testdata.sample'
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.template_file = pathlib.Path(self.tempdir.name) / 'template.txt'
+        self.outfile = pathlib.Path(self.tempdir.name) / 'output.txt'
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def render(self, template: str) -> str:
+        self.template_file.write_text(template)
+        template_generator.generate_template(
+            self.ctx, self.namespace, self.outfile, self.template_file
+        )
+        return self.outfile.read_text()
+
+    def test_aliases(self):
+        self.assertEqual(
+            self.render(
+                '{{ my_constant }} {{ nlb.buffham.testdata.sample.my_constant }}\n'
+                '{{ nlb.buffham.testdata.other.other_constant }}'
+            ),
+            '4 4\n2\n',
+        )
+
+    def test_missing_constant(self):
+        with self.assertRaisesRegex(ValueError, 'Constant other_constant not found'):
+            self.render('{{ other_constant }}\n')
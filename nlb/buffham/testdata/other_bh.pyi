@@ -1,7 +1,7 @@
 # @generated by Buffham
 import dataclasses
 import enum
-from typing import Self, Type
+from typing import ClassVar, Self, Type
 
 from emb.network.serialize import bh_cobs
 from emb.network.transport import transporter
@@ -18,9 +18,17 @@ class MyEnum(enum.Enum):
 class Pong:
     pong: int
 
+    SIZE: ClassVar[int] = 1
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 4
+    MAX_ENCODED_SIZE: ClassVar[int] = 4
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 REGISTRY: dict[int, Type[bh.BuffhamLike]] = ...
 
@@ -1,7 +1,7 @@
 # @generated by Buffham
 import dataclasses
 import enum
-from typing import Self, Type
+from typing import ClassVar, Self, Type
 
 from emb.network.serialize import bh_cobs
 from emb.network.transport import transporter
@@ -31,9 +31,17 @@ class Ping:
     # Add some comments here
     ping: int
 
+    SIZE: ClassVar[int] = 1
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 4
+    MAX_ENCODED_SIZE: ClassVar[int] = 4
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class FlashPage:
@@ -51,9 +59,15 @@ class FlashPage:
     # This comment belongs to `read_size`
     read_size: int | None  # Fields can be marked optional
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 10
+    MAX_ENCODED_SIZE: ClassVar[int] = 65807
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class LogMessage:
@@ -61,9 +75,15 @@ class LogMessage:
     verbosity: Verbosity
     my_enum: other_bh.MyEnum
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 7
+    MAX_ENCODED_SIZE: ClassVar[int] = 65800
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class NestedMessage:
@@ -74,9 +94,15 @@ class NestedMessage:
     pong: Ping
     other_pong: other_bh.Pong
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 14
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312337181
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 @dataclasses.dataclass
 class StringLists:
@@ -85,9 +111,76 @@ class StringLists:
     messages: list[str]
     buffers: list[bytes]
 
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 7
+    MAX_ENCODED_SIZE: ClassVar[int] = 8623753237
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class PackedSample:
+    """Packed messages encode their integers and lengths as LEB128 varints"""
+
+    counter: int
+    delta: int  # Signed integers are zigzag encoded
+    timestamp: int | None
+    label: str
+    samples: list[int]
+    deltas: list[int]
+    gains: list[float]  # Only the length of a float list is packed
+    tags: list[str]
+    pings: list[Ping]
+    enabled: bool  # Fields without integers or lengths are left as-is
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 13
+    MAX_ENCODED_SIZE: ClassVar[int] = 4312863551
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class PartlyPacked:
+    """Fields can be packed one at a time, too"""
+
+    timestamp: int
+    channel: int
+    payload: bytes | None
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 6
+    MAX_ENCODED_SIZE: ClassVar[int] = 65811
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class CompressedPage:
+    """Bytes can be run-length encoded, e.g. flash pages full of 0xFF"""
+
+    address: int
+    data: list[int]
+    spare: bytes | None
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 10
+    MAX_ENCODED_SIZE: ClassVar[int] = 131599
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
     def serialize(self) -> bytes: ...
     @classmethod
-    def deserialize(cls, buffer: bytes) -> tuple[Self, int]: ...
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
 
 REGISTRY: dict[int, Type[bh.BuffhamLike]] = ...
 
@@ -0,0 +1,126 @@
+# @generated by Buffham
+import dataclasses
+from typing import ClassVar, Self
+
+@dataclasses.dataclass
+class Leaf:
+    id: int
+    value: float
+
+    SIZE: ClassVar[int] = 8
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 11
+    MAX_ENCODED_SIZE: ClassVar[int] = 11
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class Branch:
+    leaf: Leaf
+    depth: int
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 12
+    MAX_ENCODED_SIZE: ClassVar[int] = 12
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class Trunk:
+    branch: Branch
+    depth: int
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 13
+    MAX_ENCODED_SIZE: ClassVar[int] = 13
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class DeepNesting:
+    """Messages nested a few levels deep, alone and in a list"""
+
+    trunk: Trunk
+    branches: list[Branch]
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 15
+    MAX_ENCODED_SIZE: ClassVar[int] = 592152
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class WideOptionals:
+    """Many optional fields, spanning a multi-byte bitfield"""
+
+    a: int | None
+    b: int | None
+    c: int | None
+    d: int | None
+    e: int | None
+    f: int | None
+    g: int | None
+    h: int | None
+    i: float | None
+    j: float | None
+    k: bool | None
+    l: str | None
+    m: bytes | None
+    n: Leaf | None
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 5
+    MAX_ENCODED_SIZE: ClassVar[int] = 131646
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class LargeBytes:
+    address: int
+    data: list[int]
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 9
+    MAX_ENCODED_SIZE: ClassVar[int] = 65802
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
+
+@dataclasses.dataclass
+class ManyStrings:
+    name: str
+    strings: list[str]
+
+    # Worst-case sizes when framed by `BhCobs`
+    MIN_ENCODED_SIZE: ClassVar[int] = 7
+    MAX_ENCODED_SIZE: ClassVar[int] = 4311942415
+
+    def serialized_size(self) -> int: ...
+    def serialize_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int: ...
+    def serialize(self) -> bytes: ...
+    @classmethod
+    def deserialize(cls, buffer: bytes | memoryview, offset: int = 0) -> tuple[Self, int]: ...
@@ -0,0 +1,48 @@
+#pragma once
+
+#include <cinttypes>
+#include <cstddef>
+
+namespace nlb {
+namespace buffham {
+
+// Write `value` as a LEB128 varint, returning the number of bytes written
+inline size_t writeVarint(uint8_t *buffer, uint64_t value) {
+    size_t size = 0;
+    while (value > 0x7F) {
+        buffer[size++] = static_cast<uint8_t>(value & 0x7F) | 0x80;
+        value >>= 7;
+    }
+    buffer[size++] = static_cast<uint8_t>(value);
+    return size;
+}
+
+// Longest LEB128 varint of a `uint64_t`
+constexpr size_t kMaxVarintSize = 10;
+
+// Read a LEB128 varint from the `size` bytes at `buffer` into `value`,
+// returning the number of bytes read, or 0 if it's malformed (i.e. it runs
+// past `size` or `kMaxVarintSize` bytes)
+inline size_t readVarint(const uint8_t *buffer, size_t size, uint64_t *value) {
+    *value = 0;
+    for (size_t i = 0; i < size && i < kMaxVarintSize; i++) {
+        *value |= static_cast<uint64_t>(buffer[i] & 0x7F) << (7 * i);
+        if (!(buffer[i] & 0x80)) {
+            return i + 1;
+        }
+    }
+    return 0;
+}
+
+// Map signed values to unsigned ones so that small magnitudes stay small
+constexpr uint64_t zigzag(int64_t value) {
+    return (static_cast<uint64_t>(value) << 1) ^
+           static_cast<uint64_t>(value >> 63);
+}
+
+constexpr int64_t unzigzag(uint64_t value) {
+    return static_cast<int64_t>(value >> 1) ^ -static_cast<int64_t>(value & 1);
+}
+
+}  // namespace buffham
+}  // namespace nlb
@@ -9,7 +9,12 @@ from nlb.util import dataclass
 def dataframe_from_type(
     clz: Type[dataclass.DataclassLike], *args, **kwargs
 ) -> pd.DataFrame:
-    """Initialize a DataFrame from a dataclass type."""
+    """Initialize a DataFrame from a dataclass type.
+
+    The data may be anything `pd.DataFrame` takes, including a structured array
+    of flat records (e.g. from `nlb.buffham.engine.decode_batch`), whose fields
+    become the columns without building a Python object per record.
+    """
     if 'columns' in kwargs:
         raise ValueError('columns must not be provided')
     kwargs['columns'] = [f.name for f in dataclasses.fields(clz)]